@@ -0,0 +1,96 @@
+"""
+Weekly and monthly histograms, longest streaks and 30 day velocity of every
+category for many users, computed with nested Python loops over the
+``get_user_statistics_solves`` responses against ``SolveTimelines``.
+
+    python benchmarks/bench_analytics.py [-u 500] [-s 400]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from balderich.analytics import SolveTimelines
+
+CATEGORIES = ['WEB', 'PWN', 'REVERSE', 'CRYPTO', 'MISC', 'MOBILE', 'ETH', 'IOT', 'AI', '实战']
+NOW = 1700000000
+
+
+def generate(users: int, solves: int) -> dict:
+    rng = random.Random(0)
+    statistics = {}
+    for uid in range(1, users + 1):
+        statistics[uid] = [
+            {'type': t, 'name': name, 'data': sorted(rng.randrange(NOW - 3 * 365 * 86400, NOW) for _ in range(rng.randrange(solves // 5)))}
+            for t, name in enumerate(CATEGORIES)
+        ]
+    return statistics
+
+
+def python(statistics: dict) -> None:
+    for categories in statistics.values():
+        for category in categories:
+            weeks, months, days = {}, {}, set()
+            recent = 0
+            for ts in category['data']:
+                week = (ts + 3 * 86400) // (7 * 86400)
+                weeks[week] = weeks.get(week, 0) + 1
+                date = datetime.fromtimestamp(ts, timezone.utc)
+                months[(date.year, date.month)] = months.get((date.year, date.month), 0) + 1
+                days.add(ts // 86400)
+                if ts > NOW - 30 * 86400:
+                    recent += 1
+
+            longest = run = 0
+            previous = None
+            for day in sorted(days):
+                run = run + 1 if previous is not None and day == previous + 1 else 1
+                longest = max(longest, run)
+                previous = day
+
+
+def vectorized(statistics: dict) -> None:
+    analyse(SolveTimelines(statistics))
+
+
+def analyse(timelines: SolveTimelines) -> None:
+    for name in timelines.categories:
+        timelines.histogram('week', name)
+        timelines.histogram('month', name)
+        timelines.streaks(NOW, name)
+        timelines.velocity(30, NOW, name)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-u', '--users', type=int, default=500)
+    parser.add_argument('-s', '--solves', type=int, default=400)
+    args = parser.parse_args()
+
+    statistics = generate(args.users, args.solves)
+    count = sum(len(category['data']) for categories in statistics.values() for category in categories)
+
+    results = {}
+    for name, fn in (('python', python), ('numpy', vectorized)):
+        start = time.perf_counter()
+        fn(statistics)
+        results[name] = time.perf_counter() - start
+
+    # the arrays are usually built once and analysed repeatedly
+    timelines = SolveTimelines(statistics)
+    start = time.perf_counter()
+    analyse(timelines)
+    results['loaded'] = time.perf_counter() - start
+
+    print(f'{args.users} users, {count} solves')
+    for name, seconds in results.items():
+        print(f'{name:>8}: {seconds * 1000:9.1f} ms')
+    print(f' speedup: {results["python"] / results["numpy"]:9.1f}x, {results["python"] / results["loaded"]:.1f}x once loaded')
+
+
+if __name__ == '__main__':
+    main()
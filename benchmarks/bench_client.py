@@ -0,0 +1,177 @@
+"""
+Throughput, p50/p99 latency, CPU time and peak RSS of the client for single
+calls, pagination walks, bulk lookups and picturebed transfers, measured
+against ``balderich.mock`` running in its own process. Every scenario runs in
+a fresh process. ``--transport inprocess`` answers from a mock in the
+benchmark process instead, measuring the client without the network.
+
+Results are written to ``benchmarks/results/`` (or ``-o``), pass an earlier
+result file to ``--compare`` to print the change against it.
+
+    python benchmarks/bench_client.py [-n 1000] [--latency 0.005] [--transport requests|http2|inprocess]
+        [--only user_info,download] [--compare benchmarks/results/old.json]
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import subprocess
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+from balderich import NSSClient, __version__
+from balderich.mock import MockServer
+from balderich.transport import InProcessTransport
+
+TOTAL = 1000
+PICTURE_SIZE = 1 << 20
+UPLOAD = b'\x89PNG' + bytes(256 << 10)
+
+# name: (requests per operation, operation)
+SCENARIOS = {
+    'user_info': (1, lambda client, i: client.user.get_user_info(i % TOTAL + 1)),
+    'rank_list': (1, lambda client, i: client.contest.get_contest_rank_list(1, i % (TOTAL // 10) + 1)),
+    'iter_problems': (TOTAL // 50, lambda client, i: sum(1 for _ in client.problem.iter_problems(size=50))),
+    'problem_info_many': (100, lambda client, i: list(client.problem.get_problem_info_many(range(1, 101), workers=8))),
+    'statistics_day': (10, lambda client, i: client.team.get_team_statistics_day(list(range(1, 1001)), chunk_size=100)),
+    'upload': (1, lambda client, i: client.user.post_user_picturebed_upload('bench.png', io.BytesIO(UPLOAD))),
+    'download': (1, lambda client, i: client.user.download_user_picturebed(i % TOTAL + 1, io.BytesIO(), resume=False)),
+}
+
+
+def percentile(values: list, share: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * share), len(values) - 1)]
+
+
+def run(name: str, url: str, ops: int, transport: str, latency: float) -> dict:
+    requests, op = SCENARIOS[name]
+    latencies = []
+
+    if transport == 'inprocess':
+        transport = InProcessTransport(MockServer(total=TOTAL, picture_size=PICTURE_SIZE, latency=latency))
+
+    with NSSClient(key='key', secret='secret', url=url, pool_maxsize=8, transport=transport) as client:
+        op(client, 0)
+
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        cpu = usage.ru_utime + usage.ru_stime
+        start = time.perf_counter()
+        for i in range(ops):
+            begin = time.perf_counter()
+            op(client, i)
+            latencies.append(time.perf_counter() - begin)
+        seconds = time.perf_counter() - start
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+
+    return {
+        'ops': ops,
+        'requests': ops * requests,
+        'seconds': seconds,
+        'ops_per_second': ops / seconds,
+        'requests_per_second': ops * requests / seconds,
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'cpu_ms_per_request': (usage.ru_utime + usage.ru_stime - cpu) / (ops * requests) * 1000,
+        # kilobytes on Linux
+        'peak_rss_mb': usage.ru_maxrss / 1024
+    }
+
+
+def serve(args) -> tuple:
+    env = dict(os.environ, PYTHONPATH=SRC)
+    command = [
+        sys.executable, '-m', 'balderich.mock', '--port', '0', '--total', str(TOTAL),
+        '--picture-size', str(PICTURE_SIZE), '--latency', str(args.latency)
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, env=env, text=True)
+    return process, process.stdout.readline().strip()
+
+
+def compare(results: dict, path: str) -> None:
+    with open(path) as file:
+        old = json.load(file)['results']
+
+    print(f'\nchange against {path}')
+    for name, result in results.items():
+        if name not in old:
+            continue
+        changes = []
+        for key in ('requests_per_second', 'p50_ms', 'p99_ms', 'cpu_ms_per_request', 'peak_rss_mb'):
+            before = old[name][key]
+            changes.append(f'{key} {(result[key] - before) / before * 100:+6.1f}%' if before else f'{key}      -')
+        print(f'{name:>18}: ' + '  '.join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=1000, help='requests per scenario')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds the mock server waits per request')
+    parser.add_argument('--transport', choices=('requests', 'http2', 'inprocess'), default='requests')
+    parser.add_argument('--only', help='comma separated scenarios')
+    parser.add_argument('-o', '--output', help='result file, by default benchmarks/results/<time>.json')
+    parser.add_argument('--compare', help='an earlier result file')
+    parser.add_argument('--scenario', help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run(args.scenario, args.url, args.n, args.transport, args.latency)))
+        return
+
+    names = args.only.split(',') if args.only else list(SCENARIOS)
+    server, url = serve(args) if args.transport != 'inprocess' else (None, 'http://mock/v2/api/')
+    results = {}
+    try:
+        for name in names:
+            ops = max(args.n // SCENARIOS[name][0], 5)
+            output = subprocess.run(
+                [sys.executable, __file__, '--scenario', name, '--url', url, '-n', str(ops),
+                 '--transport', args.transport, '--latency', str(args.latency)],
+                stdout=subprocess.PIPE, check=True, text=True
+            ).stdout
+            result = results[name] = json.loads(output)
+            print(
+                f'{name:>18}: {result["requests_per_second"]:8.0f} req/s  p50 {result["p50_ms"]:8.2f} ms  '
+                f'p99 {result["p99_ms"]:8.2f} ms  cpu {result["cpu_ms_per_request"]:6.3f} ms/req  peak {result["peak_rss_mb"]:6.1f} MB'
+            )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    output = args.output
+    if output is None:
+        directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+        os.makedirs(directory, exist_ok=True)
+        output = os.path.join(directory, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    with open(output, 'w') as file:
+        json.dump({
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'version': __version__,
+            'commit': commit,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'latency': args.latency,
+            'transport': args.transport,
+            'results': results
+        }, file, indent=2)
+    print(f'results written to {output}')
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
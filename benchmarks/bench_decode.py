@@ -0,0 +1,67 @@
+"""
+Time to decode a full problem list page and a large rank list page with every
+installed decoder, raw and typed, and with msgspec decoding into structs.
+
+    python benchmarks/bench_decode.py [-n 200] [-r 2000]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from balderich.models.typed import ProblemPage, RankList
+from balderich.utils.decoder import DECODERS
+
+
+def bodies(rows: int) -> dict:
+    problems = [{
+        'id': i, 'title': f'problem {i}', 'point': 100, 'tags': ['WEB', 'SQL'], 'level': 2.5,
+        'author': {'uid': i % 97, 'name': f'author{i % 97}', 'rating': 1500}
+    } for i in range(rows)]
+    solves = [{
+        'uid': i, 'username': f'user{i}', 'rating': 1500, 'solved': '1,2,3,5,8,13',
+        'solved_time': ','.join(['1700000000'] * 6), 'score': 1000 - i
+    } for i in range(rows)]
+    rank = {
+        'category': ['1', '2'], 'point': {str(i): 100 for i in range(40)},
+        'problems': [[i, 10, f'p{i}'] for i in range(40)], 'top3': {}, 'solves': solves, 'team': False, 'total': rows
+    }
+
+    return {
+        ProblemPage: json.dumps({'code': 10000, 'data': {'problems': problems, 'total': rows}}).encode(),
+        RankList: json.dumps({'code': 10000, 'data': rank}).encode()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=200)
+    parser.add_argument('-r', '--rows', type=int, default=2000)
+    args = parser.parse_args()
+
+    for model, body in bodies(args.rows).items():
+        print(f'{model.__name__} ({len(body)} bytes)')
+        decoders = [(name, cls, {}) for name, cls in DECODERS.items()] + [('structs', DECODERS['msgspec'], {'structs': True})]
+        for name, cls, kwargs in decoders:
+            try:
+                decoder = cls(**kwargs)
+            except ImportError:
+                print(f'{name:>8}: not installed')
+                continue
+
+            for typed in (False, True):
+                start = time.perf_counter()
+                for _ in range(args.n):
+                    code, data = decoder.decode(body, model if typed else None)
+                    if typed and isinstance(data, dict):
+                        data = model(data)
+                        data[model._nested[0]]
+                seconds = (time.perf_counter() - start) / args.n
+                print(f'{name:>8} {"typed" if typed else "raw  "}: {seconds * 1000:8.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Peak RSS of buffered picturebed downloads (``post_user_picturebed_download``)
+against the streaming mode (``download_user_picturebed``), measured on a local
+stub server. Every mode runs in a fresh process.
+
+    python benchmarks/bench_download.py [--size-mb 32] [-c 4]
+"""
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from balderich import NSSClient
+
+
+def serve(size: int) -> ThreadingHTTPServer:
+    chunk = os.urandom(1 << 20)
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(size))
+            self.end_headers()
+            for offset in range(0, size, len(chunk)):
+                self.wfile.write(chunk[:size - offset])
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def worker(mode: str, url: str, concurrency: int) -> None:
+    client = NSSClient(key='key', secret='secret', url=url)
+    directory = tempfile.mkdtemp()
+
+    def download(i):
+        if mode == 'buffered':
+            return len(client.user.post_user_picturebed_download(i).getbuffer())
+        return client.user.download_user_picturebed(i, os.path.join(directory, str(i)), resume=False)
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        total = sum(pool.map(download, range(concurrency)))
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f'{mode:<10} {total / elapsed / 2**20:8.1f} MiB/s  peak RSS {peak / 1024:8.1f} MiB  (+{(peak - before) / 1024:.1f} MiB)')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size-mb', type=int, default=32)
+    parser.add_argument('-c', '--concurrency', type=int, default=4)
+    parser.add_argument('--worker', choices=['buffered', 'stream'])
+    parser.add_argument('--url')
+    args = parser.parse_args()
+
+    if args.worker:
+        return worker(args.worker, args.url, args.concurrency)
+
+    server = serve(args.size_mb << 20)
+    url = f'http://127.0.0.1:{server.server_port}/v2/api/'
+    for mode in ('buffered', 'stream'):
+        subprocess.run([sys.executable, __file__, '--worker', mode, '--url', url, '-c', str(args.concurrency)], check=True)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
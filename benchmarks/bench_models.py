@@ -0,0 +1,77 @@
+"""
+Memory held by a problem catalog and a contest scoreboard decoded as raw
+dicts against the ``__slots__`` records of ``typed=True``.
+
+    python benchmarks/bench_models.py [-n 100000]
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from balderich.models.typed import Problem, RankRow
+
+TAGS = ['WEB', 'PWN', 'REVERSE', 'CRYPTO', 'MISC', 'SQL', 'RCE', 'XSS', 'RSA', 'ROP']
+
+
+def problem(rng: random.Random, pid: int) -> bytes:
+    return json.dumps({'code': 10000, 'data': {
+        'id': pid,
+        'title': f'[SWPUCTF 2021]problem {pid}',
+        'desc': 'x' * rng.randrange(20, 60),
+        'point': rng.choice([100, 200, 300, 500]),
+        'tags': rng.sample(TAGS, rng.randrange(1, 4)),
+        'hint': rng.random() < 0.3,
+        'level': rng.randrange(10) / 2,
+        'annex': rng.random() < 0.5,
+        'docker': rng.random() < 0.5,
+        'price': 0,
+        'likes': rng.randrange(100),
+        'date': 1600000000 + pid,
+        'info': {'solved': rng.randrange(1000), 'wa': rng.randrange(1000)},
+        'author': {'uid': rng.randrange(1, 5000), 'name': f'author{rng.randrange(500)}', 'rating': rng.randrange(3000)}
+    }}).encode()
+
+
+def rank_row(rng: random.Random, uid: int) -> bytes:
+    solved = rng.sample(range(1, 41), rng.randrange(1, 20))
+    return json.dumps({'code': 10000, 'data': {
+        'uid': uid,
+        'username': f'user{uid}',
+        'rating': rng.randrange(3000),
+        'solved': ','.join(map(str, solved)),
+        'solved_time': ','.join(str(1700000000 + rng.randrange(86400)) for _ in solved),
+        'score': rng.randrange(10000)
+    }}).encode()
+
+
+def measure(make, model, n: int) -> int:
+    rng = random.Random(0)
+    tracemalloc.start()
+    items = []
+    for i in range(1, n + 1):
+        data = json.loads(make(rng, i))['data']
+        items.append(model(data) if model is not None else data)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=100000)
+    args = parser.parse_args()
+
+    for name, make, model in (('problems', problem, Problem), ('rank rows', rank_row, RankRow)):
+        raw = measure(make, None, args.n)
+        typed = measure(make, model, args.n)
+        print(f'{args.n} {name}: raw {raw / 2 ** 20:7.1f} MiB, typed {typed / 2 ** 20:7.1f} MiB ({typed / raw:.0%})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Requests per second of one-shot ``requests.get`` calls against the pooled
+keep-alive sessions of ``NSSClient``, measured on a local stub server.
+
+    python benchmarks/bench_session.py [-n 2000] [-t 4]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from balderich import NSSClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    body = json.dumps({'code': 10000, 'data': {}}).encode()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(fn, n: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda _: fn(), range(n)))
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=2000)
+    parser.add_argument('-t', '--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/v2/api/'
+
+    before = run(lambda: requests.get(url + 'user/1/info/').json(), args.n, args.threads)
+
+    # every call has to reach the server like the requests.get ones: no coalescing, retries or metrics
+    with NSSClient(key='key', secret='secret', url=url, pool_maxsize=args.threads,
+                   retry=False, single_flight=False, metrics=False) as client:
+        after = run(lambda: client._get('user/1/info/'), args.n, args.threads)
+
+    server.shutdown()
+    print(f'requests.get     {before:10.1f} req/s')
+    print(f'NSSClient pooled {after:10.1f} req/s  ({after / before:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
 __version__ = '1.3'
 
-from .client import NSSClient
\ No newline at end of file
+from .client import AuthConfig, NSSClient
+from .async_client import AsyncNSSClient
@@ -0,0 +1,242 @@
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+class SolveTimelines:
+    """
+    Solve timestamps of many users from ``get_user_statistics_solves`` as NumPy arrays
+
+    Every category is stored as two flat arrays: the sorted solve timestamps
+    and the row of the user each one belongs to. Histograms, rolling windows,
+    streaks and cohort comparisons are computed for all users at once.
+
+    Example:
+
+        >>> timelines = SolveTimelines.fetch(client, [1, 2, 3])
+        >>> edges, counts = timelines.histogram('week', category='WEB')
+        >>> longest, current = timelines.streaks()
+
+    ``counts`` has one row per UID in ``timelines.uids``. Periods are
+    ``'day'``, ``'week'`` (starting on Monday), ``'month'`` or a length in
+    seconds; day boundaries are shifted by ``utcoffset`` seconds.
+    """
+    def __init__(self, statistics: Mapping[int, List[Dict[str, Any]]], utcoffset: int=0) -> None:
+        if np is None:
+            raise ImportError('SolveTimelines requires numpy, install it with `pip install balderich[analytics]`')
+
+        self.utcoffset = utcoffset
+        self.uids = np.fromiter(statistics.keys(), dtype=np.int64, count=len(statistics))
+        self.categories: List[str] = []
+        self.times: Dict[str, Any] = {}
+        self.rows: Dict[str, Any] = {}
+
+        # one flat list and the per-user lengths per category, converted once
+        parts = {}
+        for row, categories in enumerate(statistics.values()):
+            for category in sorted(categories or (), key=lambda category: category.get('type', 0)):
+                name = category['name']
+                if name not in parts:
+                    self.categories.append(name)
+                    parts[name] = ([], [], [])
+                data = category.get('data') or ()
+                parts[name][0].extend(data)
+                parts[name][1].append(row)
+                parts[name][2].append(len(data))
+
+        for name, (times, owners, lengths) in parts.items():
+            times = np.array(times, dtype=np.int64)
+            rows = np.repeat(np.array(owners, dtype=np.int64), lengths)
+            order = np.lexsort((times, rows))
+            self.times[name], self.rows[name] = times[order], rows[order]
+
+    def __len__(self) -> int:
+        return len(self.uids)
+
+    @classmethod
+    def fetch(cls, client, uids: Iterable[int], workers: int=8, utcoffset: int=0) -> 'SolveTimelines':
+        """
+        Request the solve statistics of every UID concurrently, failed requests raise.
+        """
+        statistics = {}
+        for uid, data in client._fetch_many(client.user.get_user_statistics_solves, uids, workers):
+            if isinstance(data, Exception):
+                raise data
+            statistics[uid] = data
+
+        return cls(statistics, utcoffset)
+
+    def _select(self, category: Union[str, Iterable[str], None]) -> Tuple[Any, Any]:
+        if category is None:
+            names = self.categories
+        elif isinstance(category, str):
+            names = [category]
+        else:
+            names = list(category)
+
+        names = [name for name in names if name in self.times]
+        if not names:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        if len(names) == 1:
+            return self.times[names[0]], self.rows[names[0]]
+
+        return np.concatenate([self.times[name] for name in names]), np.concatenate([self.rows[name] for name in names])
+
+    def _bins(self, times, period: Union[str, int]):
+        local = times + self.utcoffset
+        if period == 'day':
+            return local // DAY
+        if period == 'week':
+            # the epoch was a Thursday
+            return (local + 3 * DAY) // WEEK
+        if period == 'month':
+            return local.astype('datetime64[s]').astype('datetime64[M]').astype(np.int64)
+
+        return local // int(period)
+
+    def _edges(self, first: int, count: int, period: Union[str, int]):
+        ids = np.arange(first, first + count + 1, dtype=np.int64)
+        if period == 'day':
+            edges = ids * DAY
+        elif period == 'week':
+            edges = ids * WEEK - 3 * DAY
+        elif period == 'month':
+            edges = ids.astype('datetime64[M]').astype('datetime64[s]').astype(np.int64)
+        else:
+            edges = ids * int(period)
+
+        return edges - self.utcoffset
+
+    def histogram(self,
+        period: Union[str, int]='week',
+        category: Union[str, Iterable[str]]=None,
+        start: int=None,
+        end: int=None
+    ) -> Tuple[Any, Any]:
+        """
+        Solves per user and period.
+
+        Returns ``(edges, counts)``: the ``n + 1`` period boundaries as
+        timestamps and a ``(users, n)`` matrix of solve counts. Without
+        ``start`` and ``end`` the periods span every solve of the selection.
+        """
+        times, rows = self._select(category)
+        if start is not None or end is not None:
+            keep = np.ones(len(times), dtype=bool)
+            if start is not None:
+                keep &= times >= start
+            if end is not None:
+                keep &= times < end
+            times, rows = times[keep], rows[keep]
+
+        bins = self._bins(times, period)
+        first = self._bins(np.array([start]), period)[0] if start is not None else (bins.min() if len(bins) else 0)
+        last = self._bins(np.array([end - 1]), period)[0] if end is not None else (bins.max() if len(bins) else first - 1)
+        count = int(last - first + 1)
+
+        counts = np.bincount(rows * count + (bins - first), minlength=len(self.uids) * count)
+        return self._edges(int(first), count, period), counts.reshape(len(self.uids), count)
+
+    def rolling(self,
+        window: int,
+        period: Union[str, int]='day',
+        category: Union[str, Iterable[str]]=None,
+        start: int=None,
+        end: int=None
+    ) -> Tuple[Any, Any]:
+        """
+        Solves per user within the trailing ``window`` periods, ending at each period.
+        """
+        if window < 1:
+            raise ValueError(f'window must be at least 1 period, got {window}')
+
+        edges, counts = self.histogram(period, category, start, end)
+        total = np.cumsum(counts, axis=1)
+        total[:, window:] -= total[:, :-window].copy()
+
+        return edges, total
+
+    def totals(self) -> Any:
+        """
+        A ``(users, categories)`` matrix of solve counts, columns ordered as ``categories``.
+        """
+        totals = np.zeros((len(self.uids), len(self.categories)), dtype=np.int64)
+        for column, name in enumerate(self.categories):
+            totals[:, column] = np.bincount(self.rows[name], minlength=len(self.uids))
+
+        return totals
+
+    def velocity(self, days: float=30, now: float=None, category: Union[str, Iterable[str]]=None) -> Any:
+        """
+        Solves per day of every user over the last ``days`` days.
+        """
+        now = time.time() if now is None else now
+        times, rows = self._select(category)
+        recent = (times > now - days * DAY) & (times <= now)
+
+        return np.bincount(rows[recent], minlength=len(self.uids)) / days
+
+    def streaks(self, now: float=None, category: Union[str, Iterable[str]]=None) -> Tuple[Any, Any]:
+        """
+        Longest and current runs of consecutive days with a solve, per user.
+
+        A current streak counts as long as its last solve was today or yesterday.
+        """
+        now = time.time() if now is None else now
+        times, rows = self._select(category)
+        longest = np.zeros(len(self.uids), dtype=np.int64)
+        current = np.zeros(len(self.uids), dtype=np.int64)
+        if not len(times):
+            return longest, current
+
+        days = self._bins(times, 'day')
+        first = days.min()
+        span = int(days.max() - first + 2)
+        keys = rows * span + (days - first)
+        if len(keys) > 1 and (keys[1:] < keys[:-1]).any():
+            keys = np.sort(keys)
+        keys = keys[np.append(True, keys[1:] != keys[:-1])]
+        rows, days = keys // span, keys % span
+
+        # a run starts at every row change or gap of more than one day
+        starts = np.ones(len(keys), dtype=bool)
+        starts[1:] = (rows[1:] != rows[:-1]) | (days[1:] != days[:-1] + 1)
+        runs = np.cumsum(starts) - 1
+        lengths = np.bincount(runs)
+        owners = rows[starts]
+        np.maximum.at(longest, owners, lengths)
+
+        ends = np.append(np.flatnonzero(starts)[1:], len(keys)) - 1
+        today = self._bins(np.array([int(now)]), 'day')[0] - first
+        alive = days[ends] >= today - 1
+        current[owners[alive]] = lengths[alive]
+
+        return longest, current
+
+    def compare(self,
+        groups: Mapping[str, Iterable[int]],
+        period: Union[str, int]='month',
+        category: Union[str, Iterable[str]]=None,
+        start: int=None,
+        end: int=None
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Mean solves per period of each cohort of UIDs, on shared period boundaries.
+        """
+        edges, counts = self.histogram(period, category, start, end)
+        index = {uid: row for row, uid in enumerate(self.uids.tolist())}
+
+        means = {}
+        for name, uids in groups.items():
+            members = [index[uid] for uid in uids if uid in index]
+            means[name] = counts[members].mean(axis=0) if members else np.zeros(counts.shape[1])
+
+        return edges, means
@@ -0,0 +1,319 @@
+import io
+import time
+import asyncio
+from typing import IO, Any, AsyncIterator, Callable, Optional, Tuple, Union
+from balderich.client import AuthConfig, BaseClient
+from balderich.utils.cache import BaseCache
+from balderich.utils.code import SUCCESS
+from balderich.utils.decoder import Decoder
+from balderich.utils.exceptions import get_exception, is_retryable
+from balderich.utils.metrics import MetricsRegistry
+from balderich.utils.profile import Profiler, RequestProfile, trace_config, _current as _profile
+from balderich.utils.multipart import MultipartEncoder, UploadProgress
+from balderich.utils.bulk import afan_out, afetch_many
+from balderich.utils.pagination import aiter_pages
+from balderich.utils.ratelimit import RateLimiter
+from balderich.utils.retry import RetryPolicy
+
+
+class AsyncNSSClient(BaseClient):
+    """
+    An asyncio client for communication with Balderich, requires ``aiohttp``
+
+    It exposes the same collections as ``NSSClient``, every collection method
+    returns an awaitable.
+
+    Example:
+
+        >>> async with balderich.AsyncNSSClient(key='****', secret='*****') as client:
+        ...     data = await client.user.get_user_info(1)
+
+    ``limit`` bounds the number of connections opened at once (``0`` for no
+    bound) and ``limit_per_host`` the connections to a single host, so one
+    event loop can keep thousands of requests in flight.
+    """
+    def __init__(self,
+        auth_cofig: AuthConfig=None,
+        key: str=None,
+        secret: str=None,
+        url: str=None,
+        limit: int=100,
+        limit_per_host: int=0,
+        timeout: float=None,
+        cache: Union[bool, BaseCache]=None,
+        rate_limit: Union[bool, RateLimiter]=None,
+        retry: Union[bool, RetryPolicy]=True,
+        sync_clock: bool=True,
+        clock_refresh: float=60.0,
+        typed: bool=False,
+        decoder: Union[str, Decoder]=None,
+        single_flight: bool=True,
+        metrics: Union[bool, MetricsRegistry]=True,
+        profiler: Union[Profiler, Callable[[RequestProfile], None]]=None
+    ) -> None:
+        super().__init__(auth_cofig, key, secret, url, cache, rate_limit, retry, sync_clock, clock_refresh, typed, decoder, single_flight, metrics, profiler)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self._session = None
+
+    async def __aenter__(self) -> 'AsyncNSSClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def session(self):
+        """
+        The ``aiohttp.ClientSession``, opened on first use.
+        """
+        if self._session is None or self._session.closed:
+            try:
+                import aiohttp
+            except ImportError:
+                raise ImportError('AsyncNSSClient requires aiohttp, install it with `pip install balderich[async]`')
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                trace_configs=[trace_config()] if self.profiler is not None else None
+            )
+
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @staticmethod
+    def _form(data: dict=None, files: dict=None):
+        if files:
+            import aiohttp
+
+            form = aiohttp.FormData()
+            for name, value in (data or {}).items():
+                for item in (value if isinstance(value, (list, tuple)) else [value]):
+                    form.add_field(name, str(item))
+            for name, (filename, content) in files.items():
+                form.add_field(name, content, filename=filename)
+            return form
+
+        if data:
+            # repeat list values the way requests encodes them
+            return [
+                (name, str(item))
+                for name, value in data.items()
+                for item in (value if isinstance(value, (list, tuple)) else [value])
+            ]
+
+        return None
+
+    _paginate = staticmethod(aiter_pages)
+    _fetch_many = staticmethod(afetch_many)
+    _fan_out = staticmethod(afan_out)
+
+    async def _call(self, method: str, path: str, data: dict=None, files: dict=None, model: Callable[[Any], Any]=None) -> Any:
+        with self._profiled(method, path):
+            code, data = await self._request(method, path, data=data, files=files, model=model)
+
+            return self._result(code, data, model)
+
+    @staticmethod
+    async def _stream(encoder: MultipartEncoder) -> AsyncIterator[bytes]:
+        while True:
+            chunk = encoder.read(65536)
+            if not chunk:
+                return
+            yield chunk
+
+    async def _download(self, path: str) -> io.BytesIO:
+        with self._profiled('POST', path):
+            res, body, code, _ = await self._exchange('POST', path)
+
+            if res.headers.get('Content-Type') != 'application/octet-stream':
+                raise get_exception(code)
+
+            return io.BytesIO(body)
+
+    async def _upload(self, path: str, files: dict, progress: Callable[[UploadProgress], None]=None) -> Union[int, str, float, bool, list, dict]:
+        encoder = MultipartEncoder(files=files, callback=progress)
+        headers = {'Content-Type': encoder.content_type}
+        if encoder.len is not None:
+            headers['Content-Length'] = str(encoder.len)
+
+        with self._profiled('POST', path):
+            _, _, code, data = await self._exchange('POST', path, data=encoder, headers=headers)
+
+            return self._result(code, data)
+
+    async def _open_download(self, path: str, offset: int=0):
+        headers = {'Range': f'bytes={offset}-'} if offset else None
+        res, _, code, _ = await self._exchange('POST', path, headers=headers, stream=True)
+
+        if res.status == 416:
+            return res
+        if res.headers.get('Content-Type') != 'application/octet-stream':
+            raise get_exception(code)
+
+        return res
+
+    async def _download_chunks(self, path: str, chunk_size: int=65536) -> AsyncIterator[bytes]:
+        async with await self._open_download(path) as res:
+            async for chunk in res.content.iter_chunked(chunk_size):
+                yield chunk
+
+    async def _download_to(self, path: str, dest: Union[str, IO], chunk_size: int=65536, resume: bool=True) -> int:
+        offset = self._resume_offset(dest, resume)
+        file = None
+        try:
+            with self._profiled('POST', path) as profile:
+                async with await self._open_download(path, offset) as res:
+                    # the range starts past the end, the file is complete
+                    if res.status == 416:
+                        return offset
+                    partial = res.status == 206
+                    file = self._open_dest(dest, offset, partial)
+                    if not partial:
+                        offset = 0
+
+                    start = time.perf_counter()
+                    async for chunk in res.content.iter_chunked(chunk_size):
+                        file.write(chunk)
+                        offset += len(chunk)
+                    if profile is not None:
+                        profile.download += time.perf_counter() - start
+        finally:
+            if file is not None and file is not dest:
+                file.close()
+
+        return offset
+
+    async def _request(self, method: str, path: str, data: dict=None, files: dict=None, model: type=None) -> Tuple[int, Any]:
+        if method != 'GET':
+            _, _, code, result = await self._exchange(method, path, data, files, model)
+            return code, result
+
+        body = self._cache_get(path)
+        if body is not None:
+            profile = _profile.get()
+            if profile is not None:
+                profile.cached = True
+            return self._parse(body, method, path, model)
+
+        if self.single_flight is None:
+            _, _, code, result = await self._exchange(method, path, data, files, model)
+            return code, result
+
+        sent = []
+
+        async def send():
+            sent.append(True)
+            return await self._exchange(method, path, data, files, model)
+
+        _, body, code, result = await self.single_flight.do_async(f'{self.key}:{self.url}{path}', send)
+        if not sent:
+            # every waiting caller gets its own copy of the data
+            return self._parse(body, method, path, model)
+
+        return code, result
+
+    async def _exchange(self,
+        method: str,
+        path: str,
+        data: Union[dict, MultipartEncoder]=None,
+        files: dict=None,
+        model: type=None,
+        headers: dict=None,
+        stream: bool=False
+    ) -> Tuple[Any, Optional[bytes], Optional[int], Any]:
+        """
+        Send a request with the rate limiting, retries, clock sync, metrics
+        and profiling of the client and return ``(response, body, code, data)``.
+
+        With ``stream`` the body of a file response is left unread for the
+        caller, who has to release the response; other bodies are read.
+        """
+        import aiohttp
+
+        if self.retry is not None:
+            self.retry.on_request()
+
+        attempt = 0
+        resigned = False
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+
+            if isinstance(data, MultipartEncoder):
+                # a streamed body has to be rewound before it is sent again
+                data.reset()
+                payload = self._stream(data)
+            else:
+                payload = self._form(data, files)
+
+            params = self._params(path)
+            profile = _profile.get()
+            if profile is not None:
+                profile.attempts += 1
+                connect = profile.connect
+
+            start = time.perf_counter()
+            try:
+                res = await self.session.request(method, self.url+path, params=params, data=payload, headers=headers)
+                try:
+                    if profile is not None:
+                        received = time.perf_counter()
+                        profile.ttfb += max(received - start - (profile.connect - connect), 0.0)
+                    if res.status >= 500:
+                        res.raise_for_status()
+
+                    parsed = res.status != 416 and res.headers.get('Content-Type') != 'application/octet-stream'
+                    body = await res.read() if parsed or not stream else None
+                    if profile is not None:
+                        profile.download += time.perf_counter() - received
+                except BaseException:
+                    res.release()
+                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._observe(method, path, time.perf_counter() - start, error=e)
+                delay = self._retry_delay(method, path, attempt)
+                if delay is None:
+                    raise
+            else:
+                seconds = time.perf_counter() - start
+                code = result = None
+                if parsed:
+                    code, result = self._parse(body, method, path, model)
+
+                # a streamed body is not read yet
+                size = len(body) if body is not None else int(res.headers.get('Content-Length') or 0)
+                self._observe(method, path, seconds, size, code)
+                # the server did not act on a request it could not authorize
+                if self._observe_clock(res.headers.get('Date'), code) and not resigned:
+                    resigned = True
+                    continue
+                if self._throttle(code):
+                    continue
+
+                delay = self._retry_delay(method, path, attempt) if is_retryable(code) else None
+                if delay is None:
+                    break
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        if method == 'GET' and code == SUCCESS:
+            self._cache_set(path, body)
+
+        return res, body, code, result
+
+    async def _get(self, path: str) -> Tuple[int, Union[int, str, float, bool, list, dict]]:
+        return await self._request('GET', path)
+
+    async def _post(self, path: str, data: dict=None, files: dict=None) -> Tuple[int, Union[int, str, float, bool, list, dict]]:
+        return await self._request('POST', path, data=data, files=files)
+
+    async def _put(self, path: str, data: dict=None) -> Tuple[int, Union[int, str, float, bool, list, dict]]:
+        return await self._request('PUT', path, data=data)
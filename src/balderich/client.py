@@ -1,12 +1,34 @@
+import io
+import os
 import time
 import json
 import hashlib
+import email.utils
 import requests
-from typing import Tuple, Union, IO
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional, Tuple, Union, IO
 from balderich.models.user import UserCollection
 from balderich.models.contest import ContestCollection
 from balderich.models.problem import ProblemCollection
 from balderich.models.team import TeamCollection
+from balderich.transport import TRANSPORTS, RequestsTransport, Transport
+from balderich.utils.cache import BaseCache, TTLCache
+from balderich.utils.code import AUTH_ERROR_SIGN, AUTH_REQUEST_FAST, AUTH_TIMEOUT, SUCCESS
+from balderich.utils.decoder import Decoder, get_decoder
+from balderich.utils.endpoint import match_endpoint
+from balderich.utils.metrics import MetricsRegistry
+from balderich.utils.profile import Profiler, RequestProfile, _current as _profile
+from balderich.utils.exceptions import get_exception, is_retryable
+from balderich.utils.multipart import MultipartEncoder, UploadProgress
+from balderich.utils.bulk import fan_out, fetch_many
+from balderich.utils.pagination import iter_pages
+from balderich.utils.ratelimit import RateLimiter
+from balderich.utils.retry import RetryPolicy
+from balderich.utils.singleflight import SingleFlight
+
+_bypass_cache = ContextVar('balderich_bypass_cache', default=False)
+_untyped = ContextVar('balderich_untyped', default=False)
 
 class AuthConfig:
     """
@@ -20,10 +42,16 @@ class AuthConfig:
 
         >>> config = AuthConfig.load_config_file('config.json')
         >>> config = AuthConfig.load_config_file(open('config.json', 'rb'))
+
+    ``offset`` is the number of seconds the server clock is ahead of the local
+    one, it is added to the signing time. The clients keep it up to date from
+    the ``Date`` header of the responses.
     """
     def __init__(self, key: str, secret: str) -> None:
         self.key = key
         self.secret = secret
+        self.offset = 0.0
+        self._signs = (None, {})
     
     @staticmethod
     def load_config_file(filepath: Union[str, IO]):
@@ -39,42 +67,132 @@ class AuthConfig:
 
     def sign(self, path: str, timestamp: int = None, prefix: str='/v2/api/') -> Tuple[str, int]:
         if timestamp is None:
-            timestamp = int(time.time())
-        
-        res = hashlib.sha256(f'{prefix}{path}#{self.key}#{timestamp}#{self.secret}'.encode()).hexdigest()
+            timestamp = int(time.time() + self.offset)
+
+        # signatures only change once a second, remember those of the current one
+        second, signs = self._signs
+        if second != timestamp:
+            second, signs = self._signs = (timestamp, {})
+
+        res = signs.get(prefix+path)
+        if res is None:
+            res = signs[prefix+path] = hashlib.sha256(f'{prefix}{path}#{self.key}#{timestamp}#{self.secret}'.encode()).hexdigest()
 
         return res, timestamp
 
+    def update_offset(self, server_time: float, local_time: float = None) -> bool:
+        """
+        Correct ``offset`` from a server time read at ``local_time``, return whether it changed.
 
-class NSSClient:
+        Server times come from ``Date`` headers with a resolution of one
+        second, so the offset is only changed when it is off by more than that.
+        """
+        if local_time is None:
+            local_time = time.time()
+
+        sample = server_time + 0.5 - local_time
+        if abs(sample - self.offset) <= 1:
+            return False
+
+        self.offset = sample
+        return True
+
+
+class BaseClient:
     """
-    A client for communication with Balderich
+    Parts shared by the synchronous and the asynchronous client
 
-    Example:
-        
-        >>> import balderich
+    ``cache`` enables a client side cache of GET responses, pass ``True`` for a
+    default ``TTLCache`` or a cache instance. Responses are kept as long as the
+    server caches the endpoint, see ``balderich.utils.endpoint.ENDPOINTS``.
 
-        then 
-        
-        >>> client = balerich.NSSClient(key='****', secret='*****')
+    ``rate_limit`` enables an adaptive ``RateLimiter``, pass ``True`` for the
+    default one or a limiter instance. Requests answered with
+    ``AUTH_REQUEST_FAST`` slow the limiter down and are queued again.
 
-        or
+    With ``sync_clock`` the signing time follows the server clock, read from
+    the ``Date`` header every ``clock_refresh`` seconds and after every
+    ``AUTH_TIMEOUT`` or ``AUTH_ERROR_SIGN`` response. A request rejected
+    because of a wrong clock is signed again and sent once more when the
+    ``Date`` header corrected the offset.
 
-        >>> client = balderich.NSSClient(balderich.AuthConfig.load_config_file('key.json'))
+    ``retry`` is the ``RetryPolicy`` for network errors, 5xx responses and the
+    error codes marked retryable in ``balderich.utils.exceptions.ERRORS``,
+    ``True`` for the default policy. Requests which are not idempotent are
+    never retried.
+
+    With ``typed`` the endpoints with a documented response shape return the
+    ``__slots__`` records of ``balderich.models.typed`` instead of dicts.
+
+    ``decoder`` is the ``balderich.utils.decoder.Decoder`` of the response
+    bodies or its name (``'json'``, ``'orjson'``, ``'msgspec'``), by default
+    the fastest one installed.
+
+    With ``single_flight`` a GET sent while the same path is already in flight
+    waits for that request instead, ``client.single_flight.saved`` counts the
+    requests saved this way.
+
+    ``metrics`` is the ``MetricsRegistry`` recording the latency, bytes and
+    API codes of every request per endpoint, ``True`` for a registry of
+    this client. A registry can be shared by several clients.
+
+    ``profiler`` is the ``balderich.utils.profile.Profiler`` timing the
+    phases of a sample of the API calls, or a callback receiving the
+    ``RequestProfile`` of every call. Calls which are not sampled only pay
+    for a context variable lookup per phase.
     """
     def __init__(self,
         auth_cofig: AuthConfig=None,
         key: str=None,
         secret: str=None,
-        url: str=None
+        url: str=None,
+        cache: Union[bool, BaseCache]=None,
+        rate_limit: Union[bool, RateLimiter]=None,
+        retry: Union[bool, RetryPolicy]=True,
+        sync_clock: bool=True,
+        clock_refresh: float=60.0,
+        typed: bool=False,
+        decoder: Union[str, Decoder]=None,
+        single_flight: bool=True,
+        metrics: Union[bool, MetricsRegistry]=True,
+        profiler: Union[Profiler, Callable[[RequestProfile], None]]=None
     ) -> None:
         if url is None:
             url = 'https://www.ctfer.vip/v2/api/'
         if auth_cofig is None:
             auth_cofig = AuthConfig(key, secret)
-        
+        if cache is True:
+            cache = TTLCache()
+        elif cache is False:
+            cache = None
+        if rate_limit is True:
+            rate_limit = RateLimiter()
+        elif rate_limit is False:
+            rate_limit = None
+        if retry is True:
+            retry = RetryPolicy()
+        elif retry is False:
+            retry = None
+        if metrics is True:
+            metrics = MetricsRegistry()
+        elif metrics is False:
+            metrics = None
+        if profiler is not None and not isinstance(profiler, Profiler):
+            profiler = Profiler(profiler)
+
         self.url = url
         self.auth_config = auth_cofig
+        self.cache = cache
+        self.rate_limiter = rate_limit
+        self.retry = retry
+        self.sync_clock = sync_clock
+        self.clock_refresh = clock_refresh
+        self.typed = typed
+        self.decoder = get_decoder(decoder)
+        self.single_flight = SingleFlight() if single_flight else None
+        self.metrics = metrics
+        self.profiler = profiler
+        self._clock_checked = 0.0
 
     @property
     def user(self):
@@ -91,61 +209,469 @@ class NSSClient:
     @property
     def team(self):
         return TeamCollection(client=self)
-    
+
     @property
     def key(self):
         return self.auth_config.key
 
-    def _get(self, path: str) -> Tuple[int, Union[int, str, float, bool, list, dict]]:
-        sign, timestamp = self.auth_config.sign(path)
-        res = requests.get(self.url+path, params={
+    def _params(self, path: str) -> dict:
+        profile = _profile.get()
+        if profile is None:
+            sign, timestamp = self.auth_config.sign(path)
+        else:
+            start = time.perf_counter()
+            sign, timestamp = self.auth_config.sign(path)
+            profile.sign += time.perf_counter() - start
+
+        return {
             'key': self.key,
             'time': timestamp,
             'sign': sign
-        })
+        }
+
+    @contextmanager
+    def no_cache(self) -> Iterator[None]:
+        """
+        Skip the cache lookup for the requests sent inside the block, the fresh
+        responses still replace the cached ones.
+
+            >>> with client.no_cache():
+            ...     client.contest.get_contest_rank_list(1, 1)
+        """
+        token = _bypass_cache.set(True)
+        try:
+            yield
+        finally:
+            _bypass_cache.reset(token)
+
+    @contextmanager
+    def untyped(self) -> Iterator[None]:
+        """
+        Return the raw response data inside the block even with ``typed`` set.
+        """
+        token = _untyped.set(True)
+        try:
+            yield
+        finally:
+            _untyped.reset(token)
+
+    @contextmanager
+    def _profiled(self, method: str, path: str) -> Iterator[Optional[RequestProfile]]:
+        """
+        Profile the API call made inside the block if the profiler samples it.
+        """
+        profile = self.profiler.start(method, path) if self.profiler is not None else None
+        if profile is None:
+            yield None
+            return
+
+        token = _profile.set(profile)
+        start = time.perf_counter()
+        try:
+            yield profile
+        finally:
+            _profile.reset(token)
+            self.profiler.finish(profile, start)
+
+    def _cache_get(self, path: str) -> Optional[bytes]:
+        if self.cache is None or _bypass_cache.get():
+            return None
+
+        return self.cache.get(f'{self.key}:{self.url}{path}')
+
+    def _cache_set(self, path: str, body: bytes) -> None:
+        if self.cache is None:
+            return
 
-        res = res.json()
-        code = res['code']
-        data = res['data']
+        endpoint = match_endpoint('GET', path)
+        if endpoint is not None and endpoint.ttl:
+            self.cache.set(f'{self.key}:{self.url}{path}', body, endpoint.ttl)
+
+    def _throttle(self, code: Optional[int]) -> bool:
+        """
+        Feed a response code to the rate limiter, true if the request has to be queued again.
+        """
+        if self.rate_limiter is None:
+            return False
+
+        if code == AUTH_REQUEST_FAST:
+            self.rate_limiter.on_throttled()
+            return True
+
+        self.rate_limiter.on_success()
+        return False
+
+    def _observe_clock(self, date: Optional[str], code: Optional[int]) -> bool:
+        """
+        Follow the server clock, return whether a request rejected for its
+        signing time can be sent again with the corrected one.
+        """
+        if not self.sync_clock or not date:
+            return False
+
+        rejected = code in (AUTH_TIMEOUT, AUTH_ERROR_SIGN)
+        now = time.time()
+        if not rejected and now - self._clock_checked < self.clock_refresh:
+            return False
+        self._clock_checked = now
+
+        try:
+            server_time = email.utils.parsedate_to_datetime(date).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+        return self.auth_config.update_offset(server_time, now) and rejected
+
+    def _retry_delay(self, method: str, path: str, attempt: int) -> Optional[float]:
+        if self.retry is None:
+            return None
+
+        endpoint = match_endpoint(method, path)
+        if not (endpoint.idempotent if endpoint is not None else method != 'POST'):
+            return None
+
+        return self.retry.delay(attempt)
+
+    def _observe(self, method: str, path: str, seconds: float, size: int=0, code: int=None, error: BaseException=None) -> None:
+        if self.metrics is None:
+            return
+
+        endpoint = match_endpoint(method, path)
+        template = endpoint.template if endpoint is not None else None
+        if error is not None:
+            self.metrics.observe_error(method, template, seconds, error)
+        else:
+            self.metrics.observe(method, template, seconds, size, code)
+
+    def _parse(self, body: bytes, method: str='GET', path: str=None, model: type=None) -> Tuple[int, Any]:
+        if not self.typed or _untyped.get():
+            model = None
+
+        endpoint = match_endpoint(method, path) if path is not None else None
+        start = time.perf_counter()
+        code, data = self.decoder.decode(body, model)
+        seconds = time.perf_counter() - start
+        self.decoder.record(endpoint.template if endpoint is not None else None, seconds, len(body))
+
+        profile = _profile.get()
+        if profile is not None:
+            profile.decode += seconds
+            profile.code = code
 
         return code, data
 
-    def _post(self, path: str, data: dict=None, files: dict=None, parse: bool=True) -> Union[requests.Response, Tuple[int, Union[int, str, float, bool, list, dict]]]:
-        if data is None:
-            dict = {}
+    @staticmethod
+    def _check(code: int, data: Union[int, str, float, bool, list, dict]) -> Union[int, str, float, bool, list, dict]:
+        if code != SUCCESS:
+            raise get_exception(code)
+
+        return data
+
+    def _result(self, code: int, data: Union[int, str, float, bool, list, dict], model: Callable[[Any], Any]=None) -> Any:
+        profile = _profile.get()
+        if profile is not None:
+            start = time.perf_counter()
+            try:
+                return self._typed(code, data, model)
+            finally:
+                profile.check += time.perf_counter() - start
+
+        return self._typed(code, data, model)
+
+    def _typed(self, code: int, data: Union[int, str, float, bool, list, dict], model: Callable[[Any], Any]=None) -> Any:
+        data = self._check(code, data)
+        # decoders supporting it already return the typed data
+        if model is None or not isinstance(data, dict) or not self.typed or _untyped.get():
+            return data
+
+        return model(data)
+
+    @staticmethod
+    def _resume_offset(dest: Union[str, IO], resume: bool) -> int:
+        if isinstance(dest, str):
+            return os.path.getsize(dest) if resume and os.path.exists(dest) else 0
+
+        return dest.tell() if resume else 0
+
+    @staticmethod
+    def _open_dest(dest: Union[str, IO], offset: int, partial: bool) -> IO:
+        """
+        Open the destination of a download once the server answered with the
+        content, so an error response leaves an existing file untouched.
+        """
+        if isinstance(dest, str):
+            return open(dest, 'ab' if offset and partial else 'wb')
+        if offset and not partial:
+            dest.seek(0)
+            dest.truncate()
+
+        return dest
+
+
+class NSSClient(BaseClient):
+    """
+    A client for communication with Balderich
+
+    Example:
         
-        if files is None:
-            files = files or {}
+        >>> import balderich
+
+        then 
         
-        sign, timestamp = self.auth_config.sign(path)
-        res = requests.post(self.url+path, params={
-            'key': self.key,
-            'time': timestamp,
-            'sign': sign
-        }, data=data, files=files)
-        print(res)
-        if not parse:
+        >>> client = balerich.NSSClient(key='****', secret='*****')
+
+        or
+
+        >>> client = balderich.NSSClient(balderich.AuthConfig.load_config_file('key.json'))
+
+    The client keeps a pool of keep-alive connections which is shared by all
+    threads, each thread getting its own ``requests.Session`` on top of it.
+    ``pool_connections`` is the number of hosts to keep pools for and
+    ``pool_maxsize`` the number of connections kept per host; with
+    ``pool_block`` set, no more than ``pool_maxsize`` connections are opened
+    to a host at once. Release the connections with ``close()`` or use the
+    client as a context manager:
+
+        >>> with balderich.NSSClient(key='****', secret='*****') as client:
+        ...     client.user.get_user_info(1)
+
+    ``transport`` is the ``balderich.transport.Transport`` sending the
+    requests, ``'requests'`` (the default) or ``'http2'`` to multiplex them
+    over HTTP/2, with ``pool_maxsize`` connections at most. The pool
+    arguments only apply to the transports created by name.
+    """
+    def __init__(self,
+        auth_cofig: AuthConfig=None,
+        key: str=None,
+        secret: str=None,
+        url: str=None,
+        pool_connections: int=10,
+        pool_maxsize: int=10,
+        pool_block: bool=False,
+        timeout: Union[float, Tuple[float, float]]=None,
+        cache: Union[bool, BaseCache]=None,
+        rate_limit: Union[bool, RateLimiter]=None,
+        retry: Union[bool, RetryPolicy]=True,
+        sync_clock: bool=True,
+        clock_refresh: float=60.0,
+        typed: bool=False,
+        decoder: Union[str, Decoder]=None,
+        single_flight: bool=True,
+        metrics: Union[bool, MetricsRegistry]=True,
+        profiler: Union[Profiler, Callable[[RequestProfile], None]]=None,
+        transport: Union[str, Transport]=None
+    ) -> None:
+        super().__init__(auth_cofig, key, secret, url, cache, rate_limit, retry, sync_clock, clock_refresh, typed, decoder, single_flight, metrics, profiler)
+        self.timeout = timeout
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+
+        if transport is None or transport == 'requests':
+            transport = RequestsTransport(pool_connections, pool_maxsize, pool_block, profiled=self.profiler is not None)
+        elif isinstance(transport, str):
+            transport = TRANSPORTS[transport](pool_maxsize)
+        self.transport = transport
+
+    def __enter__(self) -> 'NSSClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        The ``requests.Session`` of the calling thread.
+
+        Only the default ``RequestsTransport`` sends through sessions, with
+        other transports this raises ``TypeError``.
+        """
+        session = getattr(self.transport, 'session', None)
+        if session is None:
+            raise TypeError(f'client.session requires the requests transport, this client uses {type(self.transport).__name__}')
+
+        return session
+
+    def close(self) -> None:
+        """
+        Close the connections of the transport.
+
+        The client stays usable, new connections are opened on the next request.
+        """
+        self.transport.close()
+
+    _paginate = staticmethod(iter_pages)
+    _fetch_many = staticmethod(fetch_many)
+    _fan_out = staticmethod(fan_out)
+
+    def _call(self, method: str, path: str, data: dict=None, files: dict=None, model: Callable[[Any], Any]=None) -> Any:
+        with self._profiled(method, path):
+            if method == 'GET':
+                code, data = self._get(path, model)
+            elif method == 'POST':
+                code, data = self._post(path, data=data, files=files)
+            else:
+                code, data = self._put(path, data=data)
+
+            return self._result(code, data, model)
+
+    def _download(self, path: str) -> io.BytesIO:
+        with self._profiled('POST', path):
+            res = self._post(path, parse=False)
+
+            if res.headers['Content-Type'] != 'application/octet-stream':
+                raise get_exception(res.json()['code'])
+
+            return io.BytesIO(res.content)
+
+    def _upload(self, path: str, files: dict, progress: Callable[[UploadProgress], None]=None) -> Union[int, str, float, bool, list, dict]:
+        encoder = MultipartEncoder(files=files, callback=progress)
+        with self._profiled('POST', path):
+            res, code, data = self._send('POST', path, data=encoder, headers={'Content-Type': encoder.content_type})
+
+            return self._result(code, data)
+
+    def _open_download(self, path: str, offset: int=0) -> requests.Response:
+        headers = {'Range': f'bytes={offset}-'} if offset else None
+        res, code, _ = self._send('POST', path, headers=headers, stream=True)
+
+        if res.status_code == 416:
             return res
-        
-        res = res.json()
+        if res.headers.get('Content-Type') != 'application/octet-stream':
+            raise get_exception(code)
+
+        return res
+
+    def _download_chunks(self, path: str, chunk_size: int=65536) -> Iterator[bytes]:
+        res = self._open_download(path)
+
+        def chunks():
+            with res:
+                yield from res.iter_content(chunk_size)
+
+        return chunks()
+
+    def _download_to(self, path: str, dest: Union[str, IO], chunk_size: int=65536, resume: bool=True) -> int:
+        offset = self._resume_offset(dest, resume)
+        file = None
+        try:
+            with self._profiled('POST', path) as profile, self._open_download(path, offset) as res:
+                # the range starts past the end, the file is complete
+                if res.status_code == 416:
+                    return offset
+                partial = res.status_code == 206
+                file = self._open_dest(dest, offset, partial)
+                if not partial:
+                    offset = 0
+
+                start = time.perf_counter()
+                for chunk in res.iter_content(chunk_size):
+                    file.write(chunk)
+                    offset += len(chunk)
+                if profile is not None:
+                    profile.download += time.perf_counter() - start
+        finally:
+            if file is not None and file is not dest:
+                file.close()
+
+        return offset
+
+    def _send(self, method: str, path: str, model: type=None, **kwargs) -> Tuple[requests.Response, Optional[int], Any]:
+        if self.retry is not None:
+            self.retry.on_request()
+
+        attempt = 0
+        resigned = False
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            # a streamed body has to be rewound before it is sent again
+            if isinstance(kwargs.get('data'), MultipartEncoder):
+                kwargs['data'].reset()
+
+            params = self._params(path)
+            profile = _profile.get()
+            if profile is not None:
+                profile.attempts += 1
+                connect = profile.connect
+
+            start = time.perf_counter()
+            try:
+                res = self.transport.request(method, self.url+path, params=params, timeout=self.timeout, **kwargs)
+                if profile is not None:
+                    # elapsed stops at the response headers and includes the connect phase
+                    seconds, elapsed = time.perf_counter() - start, res.elapsed.total_seconds()
+                    profile.ttfb += max(elapsed - (profile.connect - connect), 0.0)
+                    profile.download += max(seconds - elapsed, 0.0)
+                if res.status_code >= 500:
+                    res.raise_for_status()
+            except self.transport.errors as e:
+                self._observe(method, path, time.perf_counter() - start, error=e)
+                delay = self._retry_delay(method, path, attempt)
+                if delay is None:
+                    raise
+            else:
+                seconds = time.perf_counter() - start
+                code = data = None
+                if res.status_code != 416 and res.headers.get('Content-Type') != 'application/octet-stream':
+                    code, data = self._parse(res.content, method, path, model)
+
+                # a streamed body is not read yet
+                size = int(res.headers.get('Content-Length') or 0) if kwargs.get('stream') else len(res.content)
+                self._observe(method, path, seconds, size, code)
+
+                # the server did not act on a request it could not authorize
+                if self._observe_clock(res.headers.get('Date'), code) and not resigned:
+                    resigned = True
+                    continue
+                if self._throttle(code):
+                    continue
 
-        code = res['code']
-        data = res['data']
+                delay = self._retry_delay(method, path, attempt) if is_retryable(code) else None
+                if delay is None:
+                    return res, code, data
+
+            attempt += 1
+            time.sleep(delay)
+
+    def _get(self, path: str, model: type=None) -> Tuple[int, Any]:
+        body = self._cache_get(path)
+        if body is not None:
+            profile = _profile.get()
+            if profile is not None:
+                profile.cached = True
+            return self._parse(body, 'GET', path, model)
+
+        if self.single_flight is None:
+            res, code, data = self._send('GET', path, model=model)
+        else:
+            sent = []
+
+            def send():
+                sent.append(True)
+                return self._send('GET', path, model=model)
+
+            res, code, data = self.single_flight.do(f'{self.key}:{self.url}{path}', send)
+            if not sent:
+                # every waiting caller gets its own copy of the data
+                return self._parse(res.content, 'GET', path, model)
+
+        if code == SUCCESS:
+            self._cache_set(path, res.content)
 
         return code, data
-    
-    def _put(self, path: str, data: dict=None) -> Tuple[int, Union[int, str, float, bool, list, dict]]:
-        if data is None:
-            dict = {}
 
-        sign, timestamp = self.auth_config.sign(path)
-        res = requests.put(self.url+path, params={
-            'key': self.key,
-            'time': timestamp,
-            'sign': sign
-        }, data=data).json()
+    def _post(self, path: str, data: dict=None, files: dict=None, parse: bool=True) -> Union[requests.Response, Tuple[int, Union[int, str, float, bool, list, dict]]]:
+        res, code, data = self._send('POST', path, data=data, files=files)
+        if not parse:
+            return res
+
+        return code, data
 
-        code = res['code']
-        data = res['data']
+    def _put(self, path: str, data: dict=None) -> Tuple[int, Union[int, str, float, bool, list, dict]]:
+        res, code, data = self._send('PUT', path, data=data)
 
         return code, data
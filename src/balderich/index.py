@@ -0,0 +1,167 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from balderich.mirror import ProblemMirror
+
+
+class _SortedIndex:
+    """
+    (value, pid) pairs kept sorted, for range lookups.
+    """
+    def __init__(self) -> None:
+        self.keys: List[Tuple[float, int]] = []
+
+    def add(self, value: float, pid: int) -> None:
+        insort(self.keys, (value, pid))
+
+    def remove(self, value: float, pid: int) -> None:
+        i = bisect_left(self.keys, (value, pid))
+        if i < len(self.keys) and self.keys[i] == (value, pid):
+            del self.keys[i]
+
+    def bounds(self, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        start = 0 if low is None else bisect_left(self.keys, (low, float('-inf')))
+        end = len(self.keys) if high is None else bisect_right(self.keys, (high, float('inf')))
+        return start, end
+
+
+class ProblemIndex:
+    """
+    In-memory index over mirrored problems and problem sheets
+
+    Tags, author UIDs and sheet membership are indexed as inverted sets, level
+    and point as sorted lists. A query starts from the most selective
+    condition and intersects or filters it with the others.
+
+    Example:
+
+        >>> index = ProblemIndex.from_mirror(mirror)
+        >>> index.query(tags=['WEB'], level=(2, 4), point=(None, 300))
+
+    An index built with ``from_mirror`` follows the changes of later syncs.
+    Sheets are added from ``get_problem_sheet_info`` and the problems of
+    ``get_problem_sheet_problem_list_by_page``:
+
+        >>> index.add_sheet(client.problem.get_problem_sheet_info(1),
+        ...                 client.problem.iter_problem_sheet_problems(1))
+    """
+    def __init__(self) -> None:
+        self.problems: Dict[int, Dict[str, Any]] = {}
+        self.sheets: Dict[int, Dict[str, Any]] = {}
+
+        self._tags: Dict[str, Set[int]] = {}
+        self._authors: Dict[int, Set[int]] = {}
+        self._sheets: Dict[int, Set[int]] = {}
+        self._level = _SortedIndex()
+        self._point = _SortedIndex()
+
+    def __len__(self) -> int:
+        return len(self.problems)
+
+    @classmethod
+    def from_mirror(cls, mirror: ProblemMirror) -> 'ProblemIndex':
+        index = cls()
+        for problem in mirror.values():
+            index.add(problem)
+        mirror.subscribe(lambda pid, problem: index.add(problem), index.remove)
+
+        return index
+
+    def add(self, problem: Dict[str, Any]) -> None:
+        """
+        Index a problem as returned by ``get_problem_info``, replacing a previous version.
+        """
+        pid = problem['id']
+        if pid in self.problems:
+            self.remove(pid)
+
+        self.problems[pid] = problem
+        for tag in problem.get('tags') or ():
+            self._tags.setdefault(tag, set()).add(pid)
+        author = (problem.get('author') or {}).get('uid')
+        if author is not None:
+            self._authors.setdefault(author, set()).add(pid)
+        if problem.get('level') is not None:
+            self._level.add(problem['level'], pid)
+        if problem.get('point') is not None:
+            self._point.add(problem['point'], pid)
+
+    def remove(self, pid: int) -> None:
+        problem = self.problems.pop(pid, None)
+        if problem is None:
+            return
+
+        for tag in problem.get('tags') or ():
+            self._tags.get(tag, set()).discard(pid)
+        author = (problem.get('author') or {}).get('uid')
+        if author is not None:
+            self._authors.get(author, set()).discard(pid)
+        if problem.get('level') is not None:
+            self._level.remove(problem['level'], pid)
+        if problem.get('point') is not None:
+            self._point.remove(problem['point'], pid)
+
+    def add_sheet(self, sheet: Dict[str, Any], problems: Iterable[Dict[str, Any]]) -> None:
+        """
+        Index the problems of a sheet, replacing its previous member list.
+        """
+        self.sheets[sheet['id']] = sheet
+        self._sheets[sheet['id']] = {problem['id'] for problem in problems}
+
+    def remove_sheet(self, psid: int) -> None:
+        self.sheets.pop(psid, None)
+        self._sheets.pop(psid, None)
+
+    def query(self,
+        tags: Iterable[str]=None,
+        level: Tuple[Optional[float], Optional[float]]=None,
+        point: Tuple[Optional[float], Optional[float]]=None,
+        author: int=None,
+        sheet: int=None
+    ) -> List[Dict[str, Any]]:
+        """
+        Problems matching every given condition, ordered by pid.
+
+        ``tags`` must all be present, ``level`` and ``point`` are inclusive
+        ``(low, high)`` ranges where ``None`` leaves a side open.
+        """
+        sets = [self._tags.get(tag, set()) for tag in tags or ()]
+        if author is not None:
+            sets.append(self._authors.get(author, set()))
+        if sheet is not None:
+            sets.append(self._sheets.get(sheet, set()))
+
+        ranges = []
+        for name, index, bounds in (('level', self._level, level), ('point', self._point, point)):
+            if bounds is not None:
+                start, end = index.bounds(*bounds)
+                ranges.append((max(0, end - start), name, index, start, end, bounds))
+        ranges.sort(key=lambda item: item[0])
+
+        # start from the most selective condition, intersect or filter the rest
+        if sets:
+            sets.sort(key=len)
+            pids = set(sets[0])
+            for other in sets[1:]:
+                pids &= other
+            # sheets may list problems which are not indexed
+            if sheet is not None:
+                pids &= self.problems.keys()
+        elif ranges:
+            _, _, index, start, end, _ = ranges.pop(0)
+            pids = {pid for _, pid in index.keys[start:end]}
+        else:
+            pids = set(self.problems)
+
+        for size, name, index, start, end, (low, high) in ranges:
+            if size < len(pids):
+                pids &= {pid for _, pid in index.keys[start:end]}
+            else:
+                pids = {
+                    pid for pid in pids
+                    if self.problems[pid].get(name) is not None
+                    and (low is None or self.problems[pid][name] >= low)
+                    and (high is None or self.problems[pid][name] <= high)
+                }
+
+        return [self.problems[pid] for pid in sorted(pids)]
@@ -0,0 +1,353 @@
+"""
+Load generator running a mix of API calls from many concurrent clients.
+
+    python -m balderich.loadgen --url http://127.0.0.1:8000/v2/api/ [--mode threads|asyncio|processes]
+        [--mix contest_rank_list=8,contest_info=2] [--concurrency 32 | --rate 500] [--duration 30]
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import itertools
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from balderich.client import AuthConfig, NSSClient
+from balderich.utils.code import SUCCESS
+from balderich.utils.exceptions import BalderichException
+from balderich.utils.metrics import CODE_NAMES
+
+# name: call(client, rng, options), the same calls work on the async client
+OPERATIONS: Dict[str, Callable[[Any, random.Random, 'Options'], Any]] = {
+    'contest_rank_list': lambda client, rng, options: client.contest.get_contest_rank_list(options.cid, rng.randint(1, options.pages)),
+    'contest_info': lambda client, rng, options: client.contest.get_contest_info(options.cid),
+    'team_contest_rank_list': lambda client, rng, options: client.team.get_team_contest_rank_list_by_page(options.cid, rng.randint(1, options.pages), 10),
+    'contest_list': lambda client, rng, options: client.contest.get_contest_list(0, rng.randint(1, options.pages)),
+    'user_info': lambda client, rng, options: client.user.get_user_info(rng.randint(1, options.ids)),
+    'problem_info': lambda client, rng, options: client.problem.get_problem_info(rng.randint(1, options.ids)),
+    'problem_list': lambda client, rng, options: client.problem.get_problem_list_by_page(rng.randint(1, options.pages), 10),
+}
+
+
+class Options(NamedTuple):
+    """
+    What the clients of a run call and how they are configured.
+    """
+    url: str
+    key: str
+    secret: str
+    mix: Tuple[Tuple[str, float], ...]
+    cid: int = 1
+    pages: int = 10
+    ids: int = 100
+    retry: bool = False
+    cache: bool = False
+    timeout: float = 30.0
+    transport: str = 'requests'
+
+
+def parse_mix(text: str) -> Tuple[Tuple[str, float], ...]:
+    """
+    Parse ``name=weight,name=weight``, a name without weight counts once.
+    """
+    mix = []
+    for part in text.split(','):
+        name, _, weight = part.strip().partition('=')
+        if name not in OPERATIONS:
+            raise ValueError(f'unknown operation {name!r}, choose from {", ".join(OPERATIONS)}')
+        mix.append((name, float(weight or 1)))
+
+    return tuple(mix)
+
+
+class LoadStats:
+    """
+    Latencies and outcomes of the calls of a run
+
+    ``codes`` counts the API codes of the answered calls, ``errors`` the
+    calls which failed without an API code by exception type.
+    """
+    def __init__(self) -> None:
+        self.latencies = array('d')
+        self.codes: Dict[int, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.operations: Dict[str, int] = {}
+        self.seconds = 0.0
+        self.cpu = 0.0
+
+    def record(self, operation: str, seconds: float, error: Optional[BaseException]) -> None:
+        self.latencies.append(seconds)
+        self.operations[operation] = self.operations.get(operation, 0) + 1
+        if error is None:
+            self.codes[SUCCESS] = self.codes.get(SUCCESS, 0) + 1
+        elif isinstance(error, BalderichException) and error.code is not None:
+            self.codes[error.code] = self.codes.get(error.code, 0) + 1
+        else:
+            name = type(error).__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def merge(self, other: 'LoadStats') -> None:
+        self.latencies.extend(other.latencies)
+        for mine, theirs in ((self.codes, other.codes), (self.errors, other.errors), (self.operations, other.operations)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+        self.seconds = max(self.seconds, other.seconds)
+        self.cpu += other.cpu
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+
+        def percentile(share: float) -> float:
+            return latencies[min(int(count * share), count - 1)] * 1000 if count else 0.0
+
+        return {
+            'requests': count,
+            'seconds': self.seconds,
+            'throughput': count / self.seconds if self.seconds else 0.0,
+            'latency_ms': {
+                'p50': percentile(0.5), 'p90': percentile(0.9), 'p99': percentile(0.99), 'p999': percentile(0.999),
+                'max': latencies[-1] * 1000 if count else 0.0, 'mean': sum(latencies) / count * 1000 if count else 0.0
+            },
+            'codes': {str(code): count for code, count in sorted(self.codes.items())},
+            'errors': dict(self.errors),
+            'operations': dict(self.operations),
+            'cpu_seconds': self.cpu,
+            'cpu_percent': self.cpu / self.seconds * 100 if self.seconds else 0.0,
+            'cpu_ms_per_request': self.cpu / count * 1000 if count else 0.0
+        }
+
+
+def _cpu() -> float:
+    if resource is None:
+        return time.process_time()
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+class _Schedule:
+    """
+    Hands out the start time of each call: as soon as a worker is free for a
+    closed loop, every ``1 / rate`` seconds for an open one. Open loop
+    latencies count from the planned start, so a saturated client is not
+    hidden by its own backlog.
+    """
+    def __init__(self, rate: Optional[float], duration: float, requests: Optional[int]) -> None:
+        self.rate = rate
+        self.requests = requests
+        self.start = time.perf_counter()
+        self.deadline = self.start + duration
+        self._slots = itertools.count()
+
+    def next(self) -> Optional[float]:
+        slot = next(self._slots)
+        if self.requests is not None and slot >= self.requests:
+            return None
+        if self.rate is None:
+            now = time.perf_counter()
+            return now if now < self.deadline else None
+
+        due = self.start + slot / self.rate
+        return due if due < self.deadline else None
+
+
+def _client(options: Options) -> NSSClient:
+    return NSSClient(AuthConfig(options.key, options.secret), url=options.url, timeout=options.timeout,
+                     cache=options.cache, retry=options.retry, metrics=False, pool_maxsize=1, transport=options.transport)
+
+
+def run_threads(options: Options, concurrency: int, rate: float=None, duration: float=10.0, requests: int=None, seed: int=0) -> LoadStats:
+    """
+    Run the mix from ``concurrency`` threads, each with its own ``NSSClient``.
+    """
+    names = [name for name, _ in options.mix]
+    weights = [weight for _, weight in options.mix]
+    results = [LoadStats() for _ in range(concurrency)]
+    schedule = None
+    ready = threading.Barrier(concurrency + 1)
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed * 100003 + index)
+        stats = results[index]
+        with _client(options) as client:
+            ready.wait()
+            while True:
+                due = schedule.next()
+                if due is None:
+                    return
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+                name = rng.choices(names, weights)[0]
+                error = None
+                try:
+                    OPERATIONS[name](client, rng, options)
+                except Exception as e:
+                    error = e
+                stats.record(name, time.perf_counter() - due, error)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+
+    cpu = _cpu()
+    schedule = _Schedule(rate, duration, requests)
+    ready.wait()
+    for thread in threads:
+        thread.join()
+
+    stats = LoadStats()
+    for result in results:
+        stats.merge(result)
+    stats.seconds = time.perf_counter() - schedule.start
+    stats.cpu = _cpu() - cpu
+
+    return stats
+
+
+def run_asyncio(options: Options, concurrency: int, rate: float=None, duration: float=10.0, requests: int=None, seed: int=0) -> LoadStats:
+    """
+    Run the mix from ``concurrency`` tasks on one event loop, each with its own ``AsyncNSSClient``.
+    """
+    from balderich.async_client import AsyncNSSClient
+
+    names = [name for name, _ in options.mix]
+    weights = [weight for _, weight in options.mix]
+    stats = LoadStats()
+
+    async def worker(index: int, schedule: _Schedule) -> None:
+        rng = random.Random(seed * 100003 + index)
+        async with AsyncNSSClient(AuthConfig(options.key, options.secret), url=options.url, timeout=options.timeout,
+                                  cache=options.cache, retry=options.retry, metrics=False, limit=1) as client:
+            while True:
+                due = schedule.next()
+                if due is None:
+                    return
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                name = rng.choices(names, weights)[0]
+                error = None
+                try:
+                    await OPERATIONS[name](client, rng, options)
+                except Exception as e:
+                    error = e
+                stats.record(name, time.perf_counter() - due, error)
+
+    async def main() -> float:
+        schedule = _Schedule(rate, duration, requests)
+        await asyncio.gather(*(worker(i, schedule) for i in range(concurrency)))
+        return time.perf_counter() - schedule.start
+
+    cpu = _cpu()
+    stats.seconds = asyncio.run(main())
+    stats.cpu = _cpu() - cpu
+
+    return stats
+
+
+def _process(mode: str, options: Options, concurrency: int, rate: Optional[float], duration: float, requests: Optional[int], seed: int) -> LoadStats:
+    run = run_asyncio if mode == 'asyncio' else run_threads
+    return run(options, concurrency, rate, duration, requests, seed)
+
+
+def run_processes(options: Options, concurrency: int, rate: float=None, duration: float=10.0, requests: int=None,
+                  processes: int=None, mode: str='threads') -> LoadStats:
+    """
+    Split the workers, rate and request budget over ``processes`` processes,
+    each running them with ``mode`` (``'threads'`` or ``'asyncio'``).
+    """
+    processes = min(processes or os.cpu_count() or 1, concurrency)
+    shares = [concurrency // processes + (i < concurrency % processes) for i in range(processes)]
+
+    stats = LoadStats()
+    with ProcessPoolExecutor(processes) as pool:
+        futures = [
+            pool.submit(_process, mode, options, share,
+                        rate * share / concurrency if rate else None, duration,
+                        -(-requests * share // concurrency) if requests else None, i + 1)
+            for i, share in enumerate(shares)
+        ]
+        for future in futures:
+            stats.merge(future.result())
+
+    return stats
+
+
+def report(summary: Dict[str, Any], file=sys.stdout) -> None:
+    latency = summary['latency_ms']
+    print(f'requests    {summary["requests"]} in {summary["seconds"]:.2f}s, {summary["throughput"]:.1f} req/s', file=file)
+    print('latency     ' + '  '.join(f'{name} {value:.2f}ms' for name, value in latency.items()), file=file)
+    print(f'client cpu  {summary["cpu_seconds"]:.2f}s, {summary["cpu_percent"]:.0f}% of a core, {summary["cpu_ms_per_request"]:.3f}ms per request', file=file)
+    print('codes', file=file)
+    for code, count in summary['codes'].items():
+        print(f'  {code} {CODE_NAMES.get(int(code), ""):<28} {count:>9} {count / max(summary["requests"], 1) * 100:6.2f}%', file=file)
+    for name, count in summary['errors'].items():
+        print(f'  {name:<34} {count:>9} {count / max(summary["requests"], 1) * 100:6.2f}%', file=file)
+    print('operations  ' + '  '.join(f'{name} {count}' for name, count in summary['operations'].items()), file=file)
+
+
+def main(argv: List[str]=None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m balderich.loadgen', description='Generate load against a Balderich API.')
+    parser.add_argument('--url', required=True, help='base url of the API, e.g. http://127.0.0.1:8000/v2/api/')
+    parser.add_argument('--key', default='key')
+    parser.add_argument('--secret', default='secret')
+    parser.add_argument('--config', help='a key file for AuthConfig.load_config_file, replaces --key and --secret')
+    parser.add_argument('--mode', choices=('threads', 'asyncio', 'processes'), default='threads')
+    parser.add_argument('--processes', type=int, help='processes of the processes mode, the cpu count by default')
+    parser.add_argument('--process-mode', choices=('threads', 'asyncio'), default='threads', help='how each process runs its workers')
+    parser.add_argument('--mix', default='contest_rank_list=8,contest_info=2', help=f'weighted operations from {", ".join(OPERATIONS)}')
+    parser.add_argument('-c', '--concurrency', type=int, default=16, help='concurrent clients')
+    parser.add_argument('--rate', type=float, help='target requests per second over all clients, as fast as possible by default')
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help='seconds to run')
+    parser.add_argument('-n', '--requests', type=int, help='stop after this many requests')
+    parser.add_argument('--cid', type=int, default=1, help='contest of the contest operations')
+    parser.add_argument('--pages', type=int, default=10, help='pages the list operations pick from')
+    parser.add_argument('--ids', type=int, default=100, help='ids the info operations pick from')
+    parser.add_argument('--retry', action='store_true', help='retry failed calls like the default client does')
+    parser.add_argument('--cache', action='store_true', help='enable the client cache')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--transport', choices=('requests', 'http2'), default='requests', help='transport of the threaded clients')
+    parser.add_argument('--json', help='also write the summary as JSON to this file')
+    args = parser.parse_args(argv)
+
+    if args.config:
+        config = AuthConfig.load_config_file(args.config)
+        args.key, args.secret = config.key, config.secret
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    options = Options(args.url, args.key, args.secret, mix, args.cid, args.pages, args.ids, args.retry, args.cache, args.timeout, args.transport)
+    if args.mode == 'processes':
+        stats = run_processes(options, args.concurrency, args.rate, args.duration, args.requests, args.processes, args.process_mode)
+    elif args.mode == 'asyncio':
+        stats = run_asyncio(options, args.concurrency, args.rate, args.duration, args.requests)
+    else:
+        stats = run_threads(options, args.concurrency, args.rate, args.duration, args.requests)
+
+    summary = stats.summary()
+    summary['mode'] = args.mode
+    report(summary)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(summary, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+import os
+import gzip
+import json
+import hashlib
+from typing import Any, Callable, Dict, Iterator, NamedTuple
+
+
+def content_hash(data: Any) -> str:
+    """
+    Hash of a JSON value which does not depend on the key order.
+    """
+    return hashlib.sha1(json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode()).hexdigest()
+
+
+class SyncReport(NamedTuple):
+    """
+    Outcome of a ``ProblemCollection.sync`` run.
+
+    ``saved`` is the number of ``get_problem_info`` requests skipped because
+    the problem did not change since the previous sync.
+    """
+    pages: int
+    fetched: int
+    saved: int
+    removed: int
+    failed: Dict[int, Exception]
+
+
+class ProblemMirror:
+    """
+    Local copy of the problem set, kept up to date by ``ProblemCollection.sync``
+
+    The mirror is stored as gzip-compressed JSON. Besides the problem details
+    it remembers a content hash of every list page and of every problem list
+    entry, so the next sync only requests the details of problems that are
+    new or changed.
+
+    Example:
+
+        >>> mirror = ProblemMirror('problems.json.gz')
+        >>> report = client.problem.sync(mirror)
+        >>> mirror[1]['title']
+    """
+    def __init__(self, path: str=None) -> None:
+        self.path = path
+        self.problems: Dict[int, Dict[str, Any]] = {}
+        self.fingerprints: Dict[int, str] = {}
+        self.pages: Dict[int, str] = {}
+        self.page_size = None
+        self._listeners = []
+
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.problems)
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self.problems
+
+    def __getitem__(self, pid: int) -> Dict[str, Any]:
+        return self.problems[pid]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.problems)
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.problems.values())
+
+    def subscribe(self, on_update: Callable[[int, Dict[str, Any]], None], on_remove: Callable[[int], None]) -> None:
+        """
+        Get called whenever a problem is added, changed or removed.
+        """
+        self._listeners.append((on_update, on_remove))
+
+    def update(self, pid: int, problem: Dict[str, Any], fingerprint: str) -> None:
+        self.problems[pid] = problem
+        self.fingerprints[pid] = fingerprint
+
+        for on_update, _ in self._listeners:
+            on_update(pid, problem)
+
+    def remove(self, pid: int) -> None:
+        self.fingerprints.pop(pid, None)
+        if self.problems.pop(pid, None) is None:
+            return
+
+        for _, on_remove in self._listeners:
+            on_remove(pid)
+
+    def load(self) -> None:
+        with gzip.open(self.path, 'rt', encoding='utf-8') as file:
+            data = json.load(file)
+
+        self.page_size = data['page_size']
+        self.pages = {int(page): digest for page, digest in data['pages'].items()}
+        self.fingerprints = {int(pid): digest for pid, digest in data['fingerprints'].items()}
+        self.problems = {int(pid): problem for pid, problem in data['problems'].items()}
+
+    def save(self) -> None:
+        """
+        Write the mirror to ``path``, replacing the previous file atomically.
+        """
+        data = {
+            'page_size': self.page_size,
+            'pages': self.pages,
+            'fingerprints': self.fingerprints,
+            'problems': self.problems
+        }
+
+        tmp = f'{self.path}.tmp'
+        with gzip.open(tmp, 'wt', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp, self.path)
@@ -0,0 +1,623 @@
+"""
+A local stand-in for the Balderich API, for tests, benchmarks and load tests.
+
+    python -m balderich.mock [--port 8000] [--total 1000] [--latency 0.01] [--error 10006:0.01]
+"""
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+import email.utils
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Mapping, Optional, Pattern, Tuple
+from urllib.parse import parse_qs, parse_qsl, urlsplit
+
+from balderich.utils import code as codes
+from balderich.utils.endpoint import ENDPOINTS
+
+PREFIX = '/v2/api/'
+
+CATEGORIES = ('WEB', 'PWN', 'REVERSE', 'CRYPTO', 'MISC', 'MOBILE', 'ETH', 'IOT', 'AI', '实战')
+
+_WORDS = ('flag', 'shell', 'heap', 'cipher', 'stack', 'buffer', 'kernel', 'payload', 'token', 'router', 'sandbox', 'format')
+
+# the codes of ids which do not exist
+_NOT_FOUND = {'user': codes.USER_NOT_EXIST, 'problem': codes.PROBLEM_NOT_EXIST, 'sheet': codes.PROBLEM_SHEET_NOT_EXIST,
+              'contest': codes.CONTEST_NOT_EXIST, 'team': codes.TEAM_NOT_EXIST, 'picture': codes.USER_IMAGE_NOT_EXIST}
+
+
+class MockError(Exception):
+    """
+    Ends a request with an API error code.
+    """
+    def __init__(self, code: int) -> None:
+        super().__init__(code)
+        self.code = code
+
+
+def _route(template: str) -> Pattern:
+    return re.compile(re.sub(r'\\{(\w+)\\}', r'(?P<\1>[^/]+)', re.escape(template)))
+
+
+class MockServer:
+    """
+    A local Balderich API answering every endpoint of the collections
+
+    Requests are signed and checked exactly like the real API: a missing
+    ``key``, ``time`` or ``sign`` is ``AUTH_NONE``, another key
+    ``AUTH_NOT_EXIST``, a time more than ``max_skew`` seconds off
+    ``AUTH_TIMEOUT`` and a wrong signature ``AUTH_ERROR_SIGN``. The data is
+    generated from the ids in the path, so the same path always returns the
+    same body.
+
+    Every list holds ``total`` items (users, problems, contests, teams...),
+    the free text fields are ``text_size`` characters long, contests have
+    ``problems`` problems and the pictures are ``picture_size`` bytes.
+    Endpoints without a size parameter return ``page_size`` items per page.
+
+    Each request waits ``latency`` seconds plus up to ``jitter`` more.
+    ``errors`` maps API codes to the share of requests answered with them,
+    ``fail`` queues a number of failures for one path.
+
+    Example:
+
+        >>> with MockServer(total=500, errors={10006: 0.01}) as mock:
+        ...     client = NSSClient(key=mock.key, secret=mock.secret, url=mock.url)
+        ...     client.user.get_user_info(1)
+        >>> mock.counts
+        {10000: 1}
+
+    ``handle`` answers a request without HTTP, for in-process use.
+    """
+    def __init__(self,
+        key: str='key',
+        secret: str='secret',
+        total: int=100,
+        text_size: int=64,
+        problems: int=20,
+        picture_size: int=65536,
+        page_size: int=10,
+        latency: float=0.0,
+        jitter: float=0.0,
+        errors: Mapping[int, float]=None,
+        max_skew: float=60.0,
+        seed: int=0
+    ) -> None:
+        self.key = key
+        self.secret = secret
+        self.total = total
+        self.text_size = text_size
+        self.problems = problems
+        self.picture_size = picture_size
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.errors = dict(errors or {})
+        self.max_skew = max_skew
+        self.url = None
+        self.counts: Dict[int, int] = {}
+
+        self._random = random.Random(seed)
+        self._failures: Dict[Optional[str], List[int]] = {}
+        self._bodies: Dict[Tuple[str, str], bytes] = {}
+        self._content = bytes(self._random.getrandbits(8) for _ in range(min(picture_size, 4096)))
+        self._lock = threading.Lock()
+        self._server = None
+
+        self._routes: List[Tuple[str, Pattern, Callable[..., Any]]] = []
+        for endpoint in ENDPOINTS:
+            # views are named after the template without its parameters, user/{uid}/info/ is _get_user_info
+            name = re.sub(r'\W+', '_', re.sub(r'\{\w+\}', '', endpoint.template)).strip('_')
+            self._routes.append((endpoint.method, _route(endpoint.template), getattr(self, f'_{endpoint.method.lower()}_{name}')))
+
+    def __enter__(self) -> 'MockServer':
+        self.serve()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def fail(self, code: int, times: int=1, path: str=None) -> None:
+        """
+        Answer the next ``times`` requests of ``path`` (any path for ``None``) with ``code``.
+        """
+        with self._lock:
+            self._failures.setdefault(path, []).extend([code] * times)
+
+    def delay(self) -> float:
+        """
+        Seconds the next request waits, ``latency`` plus the jitter.
+        """
+        if not self.jitter:
+            return self.latency
+
+        with self._lock:
+            return self.latency + self._random.random() * self.jitter
+
+    def sign(self, path: str, timestamp: int) -> str:
+        return hashlib.sha256(f'{PREFIX}{path}#{self.key}#{timestamp}#{self.secret}'.encode()).hexdigest()
+
+    def handle(self,
+        method: str,
+        path: str,
+        params: Mapping[str, Any],
+        form: Mapping[str, List[str]]=None,
+        headers: Mapping[str, str]=None,
+        size: int=0
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Answer a request with ``(status, headers, body)``.
+
+        ``path`` is relative to ``/v2/api/``, ``params`` are the query
+        parameters, ``form`` the form fields of the body and ``size`` the
+        size of an uploaded file. Latency is not applied, see ``delay``.
+        """
+        try:
+            self._authorize(path, params)
+            self._inject(path)
+
+            for route_method, pattern, view in self._routes:
+                match = pattern.fullmatch(path)
+                if route_method == method and match:
+                    break
+            else:
+                raise MockError(codes.REQUEST_PARAM_INVALID)
+
+            if method == 'GET':
+                body = self._bodies.get((method, path))
+                if body is None:
+                    body = json.dumps({'code': codes.SUCCESS, 'data': view(**match.groupdict())}).encode()
+                    with self._lock:
+                        if len(self._bodies) >= 4096:
+                            self._bodies.clear()
+                        self._bodies[(method, path)] = body
+            else:
+                data = view(form=form or {}, headers=headers or {}, size=size, **match.groupdict())
+                if isinstance(data, tuple):
+                    self._count(codes.SUCCESS)
+                    return data
+                body = json.dumps({'code': codes.SUCCESS, 'data': data}).encode()
+
+            code = codes.SUCCESS
+        except MockError as e:
+            code = e.code
+            body = json.dumps({'code': code, 'data': None}).encode()
+
+        self._count(code)
+        return 200, self._headers('application/json'), body
+
+    def serve(self, port: int=0, host: str='127.0.0.1') -> ThreadingHTTPServer:
+        """
+        Serve the API over HTTP from a background thread and set ``url``, stop it with ``shutdown()``.
+        """
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def _body(self) -> bytes:
+                if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+                    chunks = []
+                    while True:
+                        length = int(self.rfile.readline().split(b';')[0], 16)
+                        chunks.append(self.rfile.read(length))
+                        self.rfile.readline()
+                        if not length:
+                            return b''.join(chunks)
+
+                length = int(self.headers.get('Content-Length') or 0)
+                return self.rfile.read(length) if length else b''
+
+            def _answer(self):
+                url = urlsplit(self.path)
+                body = self._body()
+                form, size = None, 0
+                if self.headers.get('Content-Type', '').startswith('application/x-www-form-urlencoded'):
+                    form = parse_qs(body.decode())
+                elif body:
+                    size = len(body)
+
+                delay = mock.delay()
+                if delay:
+                    time.sleep(delay)
+
+                path = url.path[len(PREFIX):] if url.path.startswith(PREFIX) else url.path.lstrip('/')
+                try:
+                    status, headers, payload = mock.handle(self.command, path, dict(parse_qsl(url.query)), form, self.headers, size)
+                except Exception:
+                    status, headers, payload = 500, {'Content-Type': 'text/plain'}, b'Internal Server Error'
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = _answer
+
+            def log_message(self, *args):
+                pass
+
+        server = self._server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.url = f'http://{host}:{server.server_port}{PREFIX}'
+
+        return server
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _count(self, code: int) -> None:
+        with self._lock:
+            self.counts[code] = self.counts.get(code, 0) + 1
+
+    @staticmethod
+    def _headers(content_type: str) -> Dict[str, str]:
+        return {'Content-Type': content_type, 'Date': email.utils.formatdate(usegmt=True)}
+
+    def _authorize(self, path: str, params: Mapping[str, Any]) -> None:
+        if not params.get('key') or not params.get('time') or not params.get('sign'):
+            raise MockError(codes.AUTH_NONE)
+        if params['key'] != self.key:
+            raise MockError(codes.AUTH_NOT_EXIST)
+
+        try:
+            timestamp = int(params['time'])
+        except ValueError:
+            raise MockError(codes.AUTH_CALC_ERROR)
+        if abs(time.time() - timestamp) > self.max_skew:
+            raise MockError(codes.AUTH_TIMEOUT)
+        if params['sign'] != self.sign(path, timestamp):
+            raise MockError(codes.AUTH_ERROR_SIGN)
+
+    def _inject(self, path: str) -> None:
+        if not self._failures and not self.errors:
+            return
+
+        with self._lock:
+            for key in (path, None):
+                queued = self._failures.get(key)
+                if queued:
+                    raise MockError(queued.pop(0))
+
+            for code, share in self.errors.items():
+                if self._random.random() < share:
+                    raise MockError(code)
+
+    # generated data
+
+    def _id(self, kind: str, value: str) -> int:
+        # users can be looked up by name as well
+        if kind == 'user' and value.startswith('user'):
+            value = value[4:]
+        try:
+            number = int(value)
+        except ValueError:
+            raise MockError(_NOT_FOUND[kind])
+        if not 1 <= number <= self.total:
+            raise MockError(_NOT_FOUND[kind])
+
+        return number
+
+    def _text(self, seed: int, size: int=None) -> str:
+        size = self.text_size if size is None else size
+        words, length = [], 0
+        while length < size:
+            word = _WORDS[(seed + len(words) * 5) % len(_WORDS)]
+            words.append(word)
+            length += len(word) + 1
+        return ' '.join(words)[:size]
+
+    def _page(self, page: str, size: Optional[str], make: Callable[[int], Any], total: int=None) -> List[Any]:
+        total = self.total if total is None else total
+        page, size = int(page), int(size) if size is not None else self.page_size
+        if page < 1 or not 1 <= size <= 100:
+            raise MockError(codes.REQUEST_PARAM_INVALID)
+
+        return [make(i) for i in range((page - 1) * size + 1, min(page * size, total) + 1)]
+
+    @staticmethod
+    def _time(seed: int) -> int:
+        return 1640995200 + seed * 3607 % 31536000
+
+    def _author(self, seed: int) -> Dict[str, Any]:
+        uid = seed * 31 % self.total + 1
+        return {'uid': uid, 'name': f'user{uid}', 'rating': 1200 + uid % 800}
+
+    def _user(self, uid: int) -> Dict[str, Any]:
+        return {
+            'uid': uid, 'bio': self._text(uid), 'intro': self._text(uid + 1), 'username': f'user{uid}',
+            'solves': uid * 13 % 500, 'rating': 1200 + uid % 800, 'avatar': f'/avatar/{uid}.png', 'cover': f'/cover/{uid}.png',
+            'register_date': self._time(uid), 'last_login_date': self._time(uid + 1), 'email': f'user{uid}@example.com',
+            'followers': uid % 97, 'following': uid % 89, 'tid': uid % 10 + 1, 'team': f'team{uid % 10 + 1}', 'is_vip': uid % 7 == 0
+        }
+
+    def _brief(self, uid: int) -> Dict[str, Any]:
+        return {'uid': uid, 'username': f'user{uid}', 'bio': self._text(uid, 32), 'avatar': f'/avatar/{uid}.png'}
+
+    def _problem_item(self, pid: int) -> Dict[str, Any]:
+        return {
+            'id': pid, 'title': f'problem {pid} {self._text(pid, 16)}', 'point': 100 + pid % 5 * 100,
+            'tags': [CATEGORIES[pid % 5], CATEGORIES[pid % 3 + 5]], 'level': pid % 10 / 2, 'author': self._author(pid)
+        }
+
+    def _problem(self, pid: int) -> Dict[str, Any]:
+        return dict(self._problem_item(pid), desc=self._text(pid, self.text_size * 8), hint=pid % 2 == 0, annex=pid % 3 == 0,
+                    docker=pid % 4 == 0, price=pid % 3 * 10, likes=pid % 50, date=self._time(pid),
+                    info={'solved': pid * 7 % 300, 'wa': pid * 11 % 900})
+
+    def _sheet(self, psid: int) -> Dict[str, Any]:
+        return {'id': psid, 'title': f'sheet {psid}', 'stars': psid % 40, 'count': self.total, 'author': self._author(psid)}
+
+    def _contest(self, cid: int) -> Dict[str, Any]:
+        return {
+            'id': cid, 'cover': f'/cover/contest/{cid}.png', 'title': f'contest {cid}', 'level': cid % 4, 'mode': cid % 2,
+            'start_date': self._time(cid), 'ends_date': self._time(cid) + 86400, 'desc': self._text(cid), 'state': cid % 3,
+            'count': cid * 17 % 1000
+        }
+
+    def _rank(self, cid: int, page: str, size: Optional[str], team: bool) -> Dict[str, Any]:
+        problems = range(1, self.problems + 1)
+
+        def row(rank: int) -> Dict[str, Any]:
+            uid = (rank * 7919 + cid) % self.total + 1
+            solved = [pid for pid in problems if (pid * rank + cid) % 3 and pid <= self.problems - rank % self.problems]
+            return {
+                'uid': uid, 'username': f'user{uid}', 'rating': 1200 + uid % 800, 'solved': ','.join(map(str, solved)),
+                'solved_time': ','.join(str(self._time(cid) + pid * 60 + rank) for pid in solved),
+                'score': sum(100 + pid % 5 * 100 for pid in solved)
+            }
+
+        return {
+            'category': [str(pid % 10 + 1) for pid in problems],
+            'point': {str(pid): 100 + pid % 5 * 100 for pid in problems},
+            'problems': [[pid, pid * 7 % self.total, f'problem {pid}'] for pid in problems],
+            'top3': {str(pid): [str((pid * j) % self.total + 1) for j in (1, 2, 3)] for pid in problems},
+            'solves': self._page(page, size, row),
+            'team': team,
+            'total': self.total
+        }
+
+    def _team(self, tid: int) -> Dict[str, Any]:
+        return {
+            'id': tid, 'name': f'team{tid}', 'bio': self._text(tid), 'date': self._time(tid), 'avatar': f'/avatar/team/{tid}.png',
+            'user': {'uid': tid, 'rating': 1200 + tid % 800, 'username': f'user{tid}'}, 'nums': tid % 50 + 1
+        }
+
+    def _member(self, i: int) -> Dict[str, Any]:
+        return {'id': i, 'uid': i, 'username': f'user{i}', 'rating': 1200 + i % 800, 'alias': f'alias{i}', 'date': self._time(i), 'role': i % 3}
+
+    def _picture(self, pid: int) -> Dict[str, Any]:
+        return {'id': pid, 'name': f'{pid}.png', 'date': self._time(pid), 'size': self.picture_size, 'src': f'/picturebed/{pid}.png'}
+
+    def _uids(self, form: Mapping[str, List[str]]) -> List[int]:
+        try:
+            return [int(uid) for uid in form.get('uids', ())]
+        except ValueError:
+            raise MockError(codes.REQUEST_PARAM_INVALID)
+
+    # user
+
+    def _get_user_picturebed_used(self) -> Dict[str, Any]:
+        return {'used_mem': self.total * self.picture_size, 'max_mem': 1 << 30, 'total': self.total}
+
+    def _get_user_picturebed_list(self, page: str, size: str) -> Dict[str, Any]:
+        return {'pictures': self._page(page, size, self._picture), 'total': self.total}
+
+    def _get_user_info(self, name: str) -> Dict[str, Any]:
+        return self._user(self._id('user', name))
+
+    def _get_user_statistics_active(self, uid: str) -> Dict[str, Any]:
+        uid = self._id('user', uid)
+        start = 1640995200
+        return {
+            'start_date': start, 'ends_date': start + 364 * 86400,
+            'count': [[time.strftime('%Y-%m-%d', time.gmtime(start + day * 86400)), (uid + day) * 7 % 5] for day in range(365)]
+        }
+
+    def _get_user_statistics_solves(self, uid: str) -> List[Dict[str, Any]]:
+        uid = self._id('user', uid)
+        return [{
+            'type': kind, 'name': name, 'data': [self._time(uid * 31 + kind * 7 + i) for i in range((uid + kind) % 5 * self.page_size)]
+        } for kind, name in enumerate(CATEGORIES)]
+
+    def _get_user_statistics_rating(self, uid: str) -> List[Dict[str, Any]]:
+        uid = self._id('user', uid)
+        return [{
+            'date': self._time(uid + i), 'rating': 1200 + (uid + i * 37) % 800, 'title': f'contest {i}', 'rank': (uid * i) % 300 + 1,
+            'unrated': i % 9 == 0, 'nums': 300
+        } for i in range(1, self.page_size * 2 + 1)]
+
+    def _get_user_statistics_radar(self, uid: str) -> List[List[int]]:
+        uid = self._id('user', uid)
+        return [[(uid + i) % 50, 50 + i * 10] for i in range(6)]
+
+    def _get_user_article_list(self, uid: str, page: str, size: str) -> Dict[str, Any]:
+        self._id('user', uid)
+        return {'articles': self._page(page, size, lambda i: {
+            'id': self.total - i + 1, 'title': f'writeup {i} {self._text(i, 24)}', 'date': self._time(i), 'type': i % 3
+        }), 'total': self.total}
+
+    def _get_user_following_list(self, uid: str, page: str, size: str) -> List[Dict[str, Any]]:
+        self._id('user', uid)
+        return self._page(page, size, self._brief)
+
+    _get_user_follower_list = _get_user_following_list
+
+    def _post_user_picturebed_upload(self, form, headers, size) -> Dict[str, Any]:
+        if not size:
+            raise MockError(codes.USER_IMAGE_NONE)
+
+        pid = self.total + 1
+        return {'id': pid, 'name': f'{pid}.png', 'date': int(time.time()), 'size': size, 'url': f'/picturebed/{pid}.png'}
+
+    def _post_user_picturebed_download(self, pid: str, form, headers, size) -> Tuple[int, Dict[str, str], bytes]:
+        self._id('picture', pid)
+        length = self.picture_size
+        offset = 0
+        match = re.fullmatch(r'bytes=(\d+)-', headers.get('Range') or '')
+        if match:
+            offset = int(match.group(1))
+            if offset >= length:
+                return 416, self._headers('application/octet-stream'), b''
+
+        repeat = -(-length // len(self._content)) if self._content else 0
+        content = (self._content * repeat)[offset:length]
+        headers = self._headers('application/octet-stream')
+        if match:
+            headers['Content-Range'] = f'bytes {offset}-{length - 1}/{length}'
+            return 206, headers, content
+
+        return 200, headers, content
+
+    # problem
+
+    def _get_problem_list(self, page: str, size: str) -> Dict[str, Any]:
+        return {'problems': self._page(page, size, self._problem_item), 'total': self.total}
+
+    def _get_problem_info(self, pid: str) -> Dict[str, Any]:
+        return self._problem(self._id('problem', pid))
+
+
+    def _get_problem_sheet_info(self, psid: str) -> Dict[str, Any]:
+        psid = self._id('sheet', psid)
+        return dict(self._sheet(psid), type=psid % 3, content=self._text(psid, self.text_size * 4))
+
+    def _get_problem_sheet_list(self, page: str, size: str, psid: str=None) -> Dict[str, Any]:
+        # the sheet list and the problem list of a sheet share the name
+        if psid is None:
+            return {'sheets': self._page(page, size, self._sheet), 'total': self.total}
+
+        self._id('sheet', psid)
+        return {'problems': self._page(page, size, lambda i: {
+            'id': i, 'title': f'problem {i}', 'point': 100 + i % 5 * 100, 'solved': i * 7 % 300, 'level': i % 10 / 2,
+            'tags': [CATEGORIES[i % 5]], 'index': i
+        }), 'total': self.total}
+
+    # contest
+
+    def _get_contest_list(self, type: str, page: str) -> Dict[str, Any]:
+        if type not in ('0', '1'):
+            raise MockError(codes.REQUEST_PARAM_INVALID)
+        return {'contests': self._page(page, None, self._contest), 'total': self.total}
+
+    def _get_contest_info(self, cid: str) -> Dict[str, Any]:
+        cid = self._id('contest', cid)
+        contest = self._contest(cid)
+        del contest['state'], contest['count']
+        return dict(contest, type=cid % 2, top_score=1000, descrease_score=cid % 5 * 10, is_team=cid % 4 >= 2)
+
+    def _get_contest_rank_list(self, cid: str, page: str) -> Dict[str, Any]:
+        return self._rank(self._id('contest', cid), page, None, False)
+
+    # team
+
+    def _get_team_list(self, page: str, size: str) -> Dict[str, Any]:
+        return {'teams': self._page(page, size, self._team), 'total': self.total}
+
+    def _get_team_notice(self) -> Dict[str, Any]:
+        return {'notice': self._text(0, self.text_size * 4)}
+
+    def _get_team_problem_list(self, page: str, size: str) -> Dict[str, Any]:
+        return {'problems': self._page(page, size, lambda i: dict(self._problem_item(i), solves=i * 3 % 50)), 'total': self.total}
+
+    def _get_team_problem_info(self, pid: str) -> Dict[str, Any]:
+        return self._problem(self._id('problem', pid))
+
+    def _get_team_contest_list(self, page: str, size: str) -> Dict[str, Any]:
+        return {'contests': self._page(page, size, lambda i: {
+            'id': i, 'cover': f'/cover/contest/{i}.png', 'title': f'team contest {i}', 'start_date': self._time(i),
+            'ends_date': self._time(i) + 86400, 'is_team': i % 2 == 0, 'desc': self._text(i), 'state': i % 3
+        }), 'total': self.total}
+
+    def _get_team_contest_info(self, cid: str) -> Dict[str, Any]:
+        cid = self._id('contest', cid)
+        return {
+            'title': f'team contest {cid}', 'level': cid % 4, 'type': cid % 2, 'mode': cid % 2, 'desc': self._text(cid),
+            'cover': f'/cover/contest/{cid}.png', 'top_score': 1000, 'decrease_score': cid % 5 * 10,
+            'start_date': self._time(cid), 'ends_date': self._time(cid) + 86400
+        }
+
+    def _get_team_contest_rank_list(self, cid: str, page: str, size: str) -> Dict[str, Any]:
+        return self._rank(self._id('contest', cid), page, size, True)
+
+    def _get_team_user_list(self, page: str, size: str) -> Dict[str, Any]:
+        return {'users': self._page(page, size, self._member), 'total': self.total}
+
+    def _get_team_user_apply_list(self, page: str, size: str) -> Dict[str, Any]:
+        return {'users': self._page(page, size, lambda i: {
+            'id': i, 'uid': i, 'username': f'user{i}', 'rating': 1200 + i % 800, 'msg': self._text(i, 32), 'date': self._time(i)
+        }), 'total': self.total}
+
+    def _get_team_analysis_use(self) -> Dict[str, Any]:
+        return {
+            'problem': {'now': self.total, 'max': 1000}, 'contest': {'now': self.total // 10, 'max': 100},
+            'memory': {'now': 12.5, 'max': 1024}, 'person': {'now': self.total, 'max': 500}, 'level': 1, 'state': 1
+        }
+
+    def _get_team_info(self, tid: str) -> Dict[str, Any]:
+        return self._team(self._id('team', tid))
+
+    def _put_team_clockin(self, form, headers, size) -> Dict[str, Any]:
+        return {'state': True, 'nums': self.total}
+
+    def _post_team_analysis_solves_curve(self, form, headers, size) -> Dict[str, List[int]]:
+        return {str(uid): [self._time(uid * 13 + i) for i in range(uid % 5 * 4)] for uid in self._uids(form)}
+
+    def _post_team_statistics_day(self, form, headers, size) -> Dict[str, Dict[str, int]]:
+        # totals of the given uids per day of the last 30 days
+        days = {}
+        for uid in self._uids(form):
+            for i in range(uid % 4 + 1):
+                day = days.setdefault(str(1640995200 + (uid + i * 7) % 30 * 86400), dict.fromkeys(('count', 'sum_score', 'team_count', 'team_sum_score'), 0))
+                day['count'] += uid % 7
+                day['sum_score'] += uid % 7 * 100
+                day['team_count'] += uid % 13
+                day['team_sum_score'] += uid % 13 * 100
+
+        return days
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m balderich.mock', description='Serve a local mock of the Balderich API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--key', default='key')
+    parser.add_argument('--secret', default='secret')
+    parser.add_argument('--total', type=int, default=100, help='items of every list')
+    parser.add_argument('--text-size', type=int, default=64, help='characters of the free text fields')
+    parser.add_argument('--problems', type=int, default=20, help='problems of every contest')
+    parser.add_argument('--picture-size', type=int, default=65536, help='bytes of every picture')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds every request waits')
+    parser.add_argument('--jitter', type=float, default=0.0, help='random extra seconds of latency')
+    parser.add_argument('--error', action='append', default=[], metavar='CODE:SHARE', help='answer a share of the requests with an API code')
+    args = parser.parse_args()
+
+    errors = {}
+    for error in args.error:
+        code, _, share = error.partition(':')
+        errors[int(code)] = float(share or 1)
+
+    mock = MockServer(args.key, args.secret, args.total, args.text_size, args.problems, args.picture_size,
+                      latency=args.latency, jitter=args.jitter, errors=errors)
+    server = mock.serve(args.port, args.host)
+    print(mock.url, flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
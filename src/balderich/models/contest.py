@@ -1,7 +1,6 @@
-from typing import Any, Dict
+from typing import Any, Dict, Iterator
 from balderich.models.resource import Collection
-from balderich.utils.code import SUCCESS
-from balderich.utils.exceptions import get_exception
+from balderich.models.typed import Contest, ContestPage, RankList
 
 
 class ContestCollection(Collection):
@@ -32,11 +31,7 @@ class ContestCollection(Collection):
                 total: integer
             }
         """
-        code, data = self.client._get(f'contest/{type}/list/{page}/')
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'contest/{type}/list/{page}/', model=ContestPage)
     
     def get_contest_info(self, cid: int) -> Dict[str, Any]:
         """
@@ -61,11 +56,7 @@ class ContestCollection(Collection):
                 is_team: boolean
             }
         """
-        code, data = self.client._get(f'contest/{cid}/info/')
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'contest/{cid}/info/', model=Contest)
     
 
     def get_contest_rank_list(self, cid: int, page: int) -> Dict[str, Any]:
@@ -101,8 +92,28 @@ class ContestCollection(Collection):
                 total: integer
             }
         """
-        code, data = self.client._get(f'contest/{cid}/rank/list/{page}/')
-        if code != SUCCESS:
-            raise get_exception(code)
+        return self._get(f'contest/{cid}/rank/list/{page}/', model=RankList)
+
+    def iter_contests(self, type: int, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历比赛列表，自动翻页。
 
-        return data
\ No newline at end of file
+        Args:
+            type参数为比赛类型，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_contest_list中contests列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_contest_list(type, page), 'contests', None, prefetch)
+
+    def iter_contest_rank_list(self, cid: int, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历比赛榜单，自动翻页。
+
+        Args:
+            cid参数为比赛ID，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_contest_rank_list中solves列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_contest_rank_list(cid, page), 'solves', None, prefetch)
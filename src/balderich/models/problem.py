@@ -1,7 +1,7 @@
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, Tuple
+from balderich.mirror import ProblemMirror, SyncReport, content_hash
 from balderich.models.resource import Collection
-from balderich.utils.code import SUCCESS
-from balderich.utils.exceptions import get_exception
+from balderich.models.typed import Problem, ProblemPage, SheetProblemPage
 
 
 class ProblemCollection(Collection):
@@ -29,12 +29,7 @@ class ProblemCollection(Collection):
                 total: integer
             }
         """
-        code, data = self.client._get(f'problem/list/{page}/{size}/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'problem/list/{page}/{size}/', model=ProblemPage)
 
     def get_problem_info(self, pid: int) -> Dict[str, Any]:
         """
@@ -68,12 +63,20 @@ class ProblemCollection(Collection):
                 }
             }
         """
-        code, data = self.client._get(f'problem/{pid}/info/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
+        return self._get(f'problem/{pid}/info/', model=Problem)
 
-        return data
+    def get_problem_info_many(self, pids: Iterable[Any], workers: int=8, ordered: bool=True) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        """
+        批量获取题目详细信息，重复的ID只请求一次。
+
+        Args:
+            pids参数为题目ID列表，workers参数为并发请求数，ordered参数为是否按输入顺序返回，否则按完成顺序返回。
+
+        Returns:
+            逐项返回(pid, data)，data与get_problem_info返回值相同；请求失败时data为对应的异常对象，不会中断其余请求。
+            使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._fetch_many(self.get_problem_info, pids, workers, ordered)
 
     def get_problem_sheet_list_by_page(self, page: int, size: int=10) -> Dict[str, Any]:
         """
@@ -98,12 +101,7 @@ class ProblemCollection(Collection):
                 total: integer
             }
         """
-        code, data = self.client._get(f'problem/sheet/list/{page}/{size}/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'problem/sheet/list/{page}/{size}/')
 
     def get_problem_sheet_info(self, psid: int) -> Dict[str, Any]:
         """
@@ -128,12 +126,7 @@ class ProblemCollection(Collection):
                 }
             }
         """
-        code, data = self.client._get(f'problem/sheet/{psid}/info/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'problem/sheet/{psid}/info/')
 
     def get_problem_sheet_problem_list_by_page(self, psid: int, page: int, size: int=10) -> Dict[str, Any]:
         """
@@ -157,9 +150,108 @@ class ProblemCollection(Collection):
                 total: integer
             }
         """
-        code, data = self.client._get(f'problem/sheet/{psid}/list/{page}/{size}/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
+        return self._get(f'problem/sheet/{psid}/list/{page}/{size}/', model=SheetProblemPage)
+
+    def iter_problems(self, size: int=10, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历题目列表，自动翻页。
+
+        Args:
+            size参数为每页大小，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_problem_list_by_page中problems列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_problem_list_by_page(page, size), 'problems', size, prefetch)
+
+    def iter_problem_sheets(self, size: int=10, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历题单列表，自动翻页。
+
+        Args:
+            size参数为每页大小，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_problem_sheet_list_by_page中sheets列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_problem_sheet_list_by_page(page, size), 'sheets', size, prefetch)
+
+    def iter_problem_sheet_problems(self, psid: int, size: int=10, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历题单题目列表，自动翻页。
+
+        Args:
+            psid参数为题单ID，size参数为每页大小，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_problem_sheet_problem_list_by_page中problems列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_problem_sheet_problem_list_by_page(psid, page, size), 'problems', size, prefetch)
+
+    def sync(self, store: ProblemMirror, size: int=50, workers: int=8) -> SyncReport:
+        """
+        增量同步全部题目到本地镜像，仅支持NSSClient。
+
+        先并发获取全部题目列表页，通过列表页和列表项的内容哈希找出新增或列表字段（point、level、tags等）
+        发生变化的题目，只对这些题目请求get_problem_info；列表中已不存在的题目从镜像中删除。
+
+        Args:
+            store参数为ProblemMirror对象，设置了path时同步后自动保存。size参数为每页大小，workers参数为并发请求数。
+
+        Returns:
+            SyncReport(pages, fetched, saved, removed, failed)，
+            saved为因题目未变化而省去的请求数，failed为获取详细信息失败的题目ID与对应异常，下次同步时会重新获取。
+        """
+        if store.page_size != size:
+            store.pages = {}
+            store.page_size = size
+
+        # the mirror stores the raw responses
+        with self.client.untyped():
+            first = self.get_problem_list_by_page(1, size)
+            pages = {1: first}
+            count = (first['total'] + size - 1) // size
+            for page, data in self._fetch_many(lambda page: self.get_problem_list_by_page(page, size), range(2, count + 1), workers):
+                if isinstance(data, Exception):
+                    raise data
+                pages[page] = data
+
+        listed, listed_on = {}, {}
+        for page, data in pages.items():
+            problems = data['problems']
+            digest = content_hash(problems)
+            # an unchanged page keeps the fingerprints of its problems
+            unchanged = store.pages.get(page) == digest
+
+            for problem in problems:
+                pid = problem['id']
+                listed_on[pid] = page
+                if unchanged and pid in store.fingerprints:
+                    listed[pid] = store.fingerprints[pid]
+                else:
+                    listed[pid] = content_hash(problem)
+            store.pages[page] = digest
+
+        changed = [pid for pid, fingerprint in listed.items() if store.fingerprints.get(pid) != fingerprint]
+        failed = {}
+        with self.client.untyped():
+            for pid, data in self.get_problem_info_many(changed, workers):
+                if isinstance(data, Exception):
+                    failed[pid] = data
+                else:
+                    store.update(pid, data, listed[pid])
+
+        # the page of a failed problem is hashed again next time, so that its
+        # stale fingerprint is compared and the problem fetched again
+        for pid in failed:
+            store.pages.pop(listed_on[pid], None)
+
+        removed = [pid for pid in store if pid not in listed]
+        for pid in removed:
+            store.remove(pid)
+        store.pages = {page: store.pages[page] for page in pages if page in store.pages}
+
+        if store.path is not None:
+            store.save()
 
-        return data
+        return SyncReport(len(pages), len(changed) - len(failed), len(listed) - len(changed), len(removed), failed)
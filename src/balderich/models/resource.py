@@ -1,9 +1,33 @@
 from __future__ import annotations
+from typing import Any, Callable, Hashable, Iterable
 
 class Collection:
     """
     A base class fro representing all objects of a particular type on the server.
+
+    Collections only describe the endpoints, the requests are sent by the
+    client they are bound to. With ``NSSClient`` every method returns the
+    response data, with ``AsyncNSSClient`` it returns an awaitable of it.
     """
 
     def __init__(self, client = None):
         self.client = client
+
+    def _get(self, path: str, model: Callable[[Any], Any] = None):
+        return self.client._call('GET', path, model=model)
+
+    def _post(self, path: str, data: dict = None, files: dict = None):
+        return self.client._call('POST', path, data=data, files=files)
+
+    def _put(self, path: str, data: dict = None):
+        return self.client._call('PUT', path, data=data)
+
+    def _paginate(self, fetch: Callable[[int], Any], key: str, size: int = None, prefetch: bool = True):
+        return self.client._paginate(fetch, key, size=size, prefetch=prefetch)
+
+    def _fetch_many(self, fetch: Callable[[Any], Any], ids: Iterable[Hashable], workers: int = 8, ordered: bool = True):
+        return self.client._fetch_many(fetch, ids, workers=workers, ordered=ordered)
+
+    def _fan_out(self, fetch: Callable[[list], Any], items: Iterable[Hashable], chunk_size: int = 100, workers: int = 8,
+                 merge: Callable[[dict, dict], None] = None):
+        return self.client._fan_out(fetch, items, chunk_size=chunk_size, workers=workers, merge=merge)
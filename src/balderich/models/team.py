@@ -1,7 +1,7 @@
 from balderich.models.resource import Collection
-from balderich.utils.code import SUCCESS
-from balderich.utils.exceptions import get_exception
-from typing import Any, Dict, List
+from balderich.models.typed import Team, TeamPage
+from balderich.utils.bulk import sum_merge
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 class TeamCollection(Collection):
     def get_team_list_by_page(self, page: int, size: int=10) -> Dict[str, Any]:
@@ -28,12 +28,7 @@ class TeamCollection(Collection):
                 total: integer
             }
         """
-        code, data = self.client._get(f'team/list/{page}/{size}/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'team/list/{page}/{size}/', model=TeamPage)
     
     def get_team_info(self, tid: int) -> Dict[str, Any]:
         """
@@ -57,13 +52,21 @@ class TeamCollection(Collection):
                 nums: integer
             }
         """
-        code, data = self.client._get(f'team/{tid}/info/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'team/{tid}/info/', model=Team)
     
+    def get_team_info_many(self, tids: Iterable[Any], workers: int=8, ordered: bool=True) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        """
+        批量获取团队详细信息，重复的ID只请求一次。
+
+        Args:
+            tids参数为团队ID列表，workers参数为并发请求数，ordered参数为是否按输入顺序返回，否则按完成顺序返回。
+
+        Returns:
+            逐项返回(tid, data)，data与get_team_info返回值相同；请求失败时data为对应的异常对象，不会中断其余请求。
+            使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._fetch_many(self.get_team_info, tids, workers, ordered)
+
     def get_team_notice(self) -> Dict[str, Any]:
         """
         获取团队通知信息。数据缓存10分钟。
@@ -73,12 +76,7 @@ class TeamCollection(Collection):
                 notice: string
             }
         """
-        code, data = self.client._get(f'team/notice/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'team/notice/')
     
     def put_team_clockin(self) -> Dict[str, Any]:
         """
@@ -90,12 +88,7 @@ class TeamCollection(Collection):
                 nums: integer
             }
         """
-        code, data = self.client._put(f'team/clockin/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._put(f'team/clockin/')
     
     def get_team_problem_list_by_page(self, page: int, size: int=10) -> Dict[str, Any]:
         """
@@ -117,12 +110,7 @@ class TeamCollection(Collection):
                 total: integer
             }
         """
-        code, data = self.client._get(f'team/problem/list/{page}/{size}/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'team/problem/list/{page}/{size}/')
     
     def get_team_problem_info(self, pid: int) -> Dict[str, Any]:
         """
@@ -156,12 +144,7 @@ class TeamCollection(Collection):
                 }
             }
         """
-        code, data = self.client._get(f'team/problem/{pid}/info/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'team/problem/{pid}/info/')
     
     def get_team_contest_list_by_page(self, page: int, size: int=10) -> Dict[str, Any]:
         """
@@ -188,12 +171,7 @@ class TeamCollection(Collection):
                 total: integer
             }
         """
-        code, data = self.client._get(f'team/contest/list/{page}/{size}/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'team/contest/list/{page}/{size}/')
     
     def get_team_contest_info(self, cid: int) -> Dict[str, Any]:
         """
@@ -217,19 +195,14 @@ class TeamCollection(Collection):
                 ends_date: integer,
             }
         """
-        code, data = self.client._get(f'team/contest/{cid}/info/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'team/contest/{cid}/info/')
     
-    def get_team_contest_rank_list_by_page(self, cid: int, page: int) -> Dict[str, Any]:
+    def get_team_contest_rank_list_by_page(self, cid: int, page: int, size: int=10) -> Dict[str, Any]:
         """
         获取团队比赛榜单列表。相同的路径数据缓存60秒。
 
         Args:
-            cid参数为比赛ID。page参数为页数。
+            cid参数为比赛ID。page参数为页数，size参数为每页大小。
 
         Returns:
             cetegory为类型列表，包含题目类型字符串，“1”->"10"分别代表WEB->实战。
@@ -257,12 +230,7 @@ class TeamCollection(Collection):
                 total: integer
             }
         """
-        code, data = self.client._get(f'team/contest/{cid}/rank/list/{page}/{size}/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'team/contest/{cid}/rank/list/{page}/{size}/')
     
     def get_team_user_list_by_page(self, page: int, size: int=10) -> Dict[str, Any]:
         """
@@ -286,12 +254,7 @@ class TeamCollection(Collection):
                 total: integer
             }
         """
-        code, data = self.client._get(f'team/user/list/{page}/{size}/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'team/user/list/{page}/{size}/')
     
     def get_team_apply_list_by_page(self, page: int, size: int=10) -> Dict[str, Any]:
         """
@@ -313,12 +276,7 @@ class TeamCollection(Collection):
                 total: integer
             }
         """
-        code, data = self.client._get(f'team/user/apply/list/{page}/{size}/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'team/user/apply/list/{page}/{size}/')
     
     def get_team_analysis_use(self) -> Dict[str, Any]:
         """
@@ -346,19 +304,18 @@ class TeamCollection(Collection):
                 state: integer
             }
         """
-        code, data = self.client._get(f'team/analysis/use/')
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'team/analysis/use/')
     
-    def post_team_analysis_solves_curve(self, uids: List[int]) -> Dict[str, Any]:
+    def post_team_analysis_solves_curve(self, uids: List[int], chunk_size: int=100, workers: int=8) -> Dict[str, Any]:
         """
         获取团队解题曲线数据，访问此API需要团队管理员及以上权限。数据缓存10分钟。
 
+        UID数量超过chunk_size时自动分批并发请求并合并结果，失败的批次会单独重试，
+        仍然失败时抛出PartialResultException，其results为成功部分的结果。
+
         Args:
             uids: [integer, ]
+            chunk_size参数为每批UID数量，workers参数为并发请求数。
 
         Returns:
             获取最近三月做题时间戳列表
@@ -366,21 +323,20 @@ class TeamCollection(Collection):
                 integer: [interger, ]
             }
         """
-        code, data = self.client._post(f'team/analysis/solves/curve/', data={
-            'uids': uids
-        })
-        
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._fan_out(lambda chunk: self._post(f'team/analysis/solves/curve/', data={
+            'uids': chunk
+        }), uids, chunk_size, workers)
     
-    def get_team_statistics_day(self, uids: str) -> Dict[str, Any]:
+    def get_team_statistics_day(self, uids: List[int], chunk_size: int=100, workers: int=8) -> Dict[str, Any]:
         """
         获取团队每日解题数据，访问此API需要团队管理员及以上权限。数据缓存10分钟。
 
+        UID数量超过chunk_size时自动分批并发请求，同一天的各项数据按批次相加合并，
+        失败的批次会单独重试，仍然失败时抛出PartialResultException，其results为成功部分的结果。
+
         Args:
             uids: [integer, ]
+            chunk_size参数为每批UID数量，workers参数为并发请求数。
 
         Returns:
             {
@@ -392,11 +348,78 @@ class TeamCollection(Collection):
                 }
             }
         """
-        code, data = self.client._post(f'team/statistics/day/', data={
-            'uids': uids
-        })
-        
-        if code != SUCCESS:
-            raise get_exception(code)
+        return self._fan_out(lambda chunk: self._post(f'team/statistics/day/', data={
+            'uids': chunk
+        }), uids, chunk_size, workers, merge=sum_merge)
+
+    def iter_teams(self, size: int=10, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历团队列表，自动翻页。
 
-        return data
+        Args:
+            size参数为每页大小，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_team_list_by_page中teams列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_team_list_by_page(page, size), 'teams', size, prefetch)
+
+    def iter_team_problems(self, size: int=10, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历团队题目列表，自动翻页。
+
+        Args:
+            size参数为每页大小，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_team_problem_list_by_page中problems列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_team_problem_list_by_page(page, size), 'problems', size, prefetch)
+
+    def iter_team_contests(self, size: int=10, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历团队比赛列表，自动翻页。
+
+        Args:
+            size参数为每页大小，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_team_contest_list_by_page中contests列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_team_contest_list_by_page(page, size), 'contests', size, prefetch)
+
+    def iter_team_contest_rank_list(self, cid: int, size: int=10, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历团队比赛榜单，自动翻页。
+
+        Args:
+            cid参数为比赛ID，size参数为每页大小，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_team_contest_rank_list_by_page中solves列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_team_contest_rank_list_by_page(cid, page, size), 'solves', size, prefetch)
+
+    def iter_team_users(self, size: int=10, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历团队成员列表，自动翻页。
+
+        Args:
+            size参数为每页大小，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_team_user_list_by_page中users列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_team_user_list_by_page(page, size), 'users', size, prefetch)
+
+    def iter_team_applies(self, size: int=10, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历团队申请列表，自动翻页。
+
+        Args:
+            size参数为每页大小，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_team_apply_list_by_page中users列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_team_apply_list_by_page(page, size), 'users', size, prefetch)
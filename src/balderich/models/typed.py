@@ -0,0 +1,197 @@
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+
+class nested:
+    """
+    A field holding a nested object, decoded with ``decode`` on first access.
+
+    The raw value is kept in the ``_<name>`` slot and replaced by the decoded
+    one, so responses whose nested fields are never read pay nothing for them.
+    """
+    def __init__(self, decode: Callable[[Any], Any]) -> None:
+        self.decode = decode
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.slot = f'_{name}'
+
+    def __get__(self, obj: Any, owner: type=None) -> Any:
+        if obj is None:
+            return self
+
+        value = getattr(obj, self.slot)
+        # JSON only produces dicts and lists, decoded values are records and tuples
+        if isinstance(value, (dict, list)):
+            value = self.decode(value)
+            setattr(obj, self.slot, value)
+
+        return value
+
+
+class records:
+    """
+    Decoder of a list of ``model`` objects.
+    """
+    def __init__(self, model: type) -> None:
+        self.model = model
+
+    def __call__(self, items: list) -> Tuple[Any, ...]:
+        return tuple(self.model(item) for item in items)
+
+
+class Record:
+    """
+    Base class of the typed results returned with ``typed=True``
+
+    Fields are stored in ``__slots__`` instead of a dict per object, nested
+    objects are declared with ``nested`` and decoded lazily. Records can also
+    be read like the dicts they replace, so code written against the raw
+    responses keeps working:
+
+        >>> problem = client.problem.get_problem_info(1)
+        >>> problem.title == problem['title'] == problem.get('title')
+
+    Keys which are not documented for an endpoint are dropped.
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _nested: Tuple[str, ...] = ()
+    _layout: Tuple[Tuple[str, str], ...] = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._nested = tuple(name for name, value in vars(cls).items() if isinstance(value, nested))
+        cls._fields = tuple(slot for slot in cls.__slots__ if not slot.startswith('_')) + cls._nested
+        cls._layout = tuple((name, name) for name in cls._fields if name not in cls._nested) \
+            + tuple((f'_{name}', name) for name in cls._nested)
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        for slot, name in self._layout:
+            setattr(self, slot, data.get(name))
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._fields if name not in self._nested)
+        return f'{type(self).__name__}({fields})'
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+        return NotImplemented
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._fields:
+            raise KeyError(name)
+
+        return getattr(self, name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._fields
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def get(self, name: str, default: Any=None) -> Any:
+        value = getattr(self, name, None) if name in self._fields else None
+        return default if value is None else value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The record as the dict of the raw response, nested records included.
+        """
+        data = {}
+        for name in self._fields:
+            value = getattr(self, name)
+            if isinstance(value, Record):
+                value = value.to_dict()
+            elif isinstance(value, tuple):
+                value = [item.to_dict() if isinstance(item, Record) else item for item in value]
+            data[name] = value
+
+        return data
+
+
+class Author(Record):
+    __slots__ = ('uid', 'name', 'rating')
+
+
+class Owner(Record):
+    __slots__ = ('uid', 'username', 'rating')
+
+
+class ProblemInfo(Record):
+    __slots__ = ('solved', 'wa')
+
+
+class Problem(Record):
+    __slots__ = (
+        'id', 'title', 'desc', 'point', 'tags', 'hint', 'level', 'annex',
+        'docker', 'price', 'likes', 'date', '_info', '_author'
+    )
+    info = nested(ProblemInfo)
+    author = nested(Author)
+
+
+class ProblemItem(Record):
+    __slots__ = ('id', 'title', 'point', 'tags', 'level', '_author')
+    author = nested(Author)
+
+
+class ProblemPage(Record):
+    __slots__ = ('total', '_problems')
+    problems = nested(records(ProblemItem))
+
+
+class SheetProblem(Record):
+    __slots__ = ('id', 'title', 'point', 'solved', 'level', 'tags', 'index')
+
+
+class SheetProblemPage(Record):
+    __slots__ = ('total', '_problems')
+    problems = nested(records(SheetProblem))
+
+
+class User(Record):
+    __slots__ = (
+        'uid', 'bio', 'intro', 'username', 'solves', 'rating', 'avatar', 'cover',
+        'register_date', 'last_login_date', 'email', 'followers', 'following',
+        'tid', 'team', 'is_vip'
+    )
+
+
+class Contest(Record):
+    __slots__ = (
+        'id', 'title', 'cover', 'level', 'type', 'mode', 'desc', 'top_score',
+        'descrease_score', 'start_date', 'ends_date', 'is_team'
+    )
+
+
+class ContestItem(Record):
+    __slots__ = ('id', 'cover', 'title', 'level', 'mode', 'start_date', 'ends_date', 'desc', 'state', 'count')
+
+
+class ContestPage(Record):
+    __slots__ = ('total', '_contests')
+    contests = nested(records(ContestItem))
+
+
+class RankRow(Record):
+    __slots__ = ('uid', 'username', 'rating', 'solved', 'solved_time', 'score')
+
+
+class RankList(Record):
+    __slots__ = ('category', 'point', 'problems', 'top3', 'team', 'total', '_solves')
+    solves = nested(records(RankRow))
+
+
+class Team(Record):
+    __slots__ = ('id', 'name', 'bio', 'date', 'avatar', 'nums', '_user')
+    user = nested(Owner)
+
+
+class TeamPage(Record):
+    __slots__ = ('total', '_teams')
+    teams = nested(records(Team))
@@ -1,8 +1,8 @@
 import io
 from balderich.models.resource import Collection
-from balderich.utils.code import SUCCESS
-from balderich.utils.exceptions import get_exception
-from typing import IO, Any, Dict, List
+from balderich.models.typed import User
+from balderich.utils.multipart import UploadProgress
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
 
 class UserCollection(Collection):
     def get_user_info(self, name: str) -> Dict[str, Any]:
@@ -32,13 +32,21 @@ class UserCollection(Collection):
                 is_vip: boolean
             }
         """
-        code, data = self.client._get(f'user/{name}/info/')
+        return self._get(f'user/{name}/info/', model=User)
+        
+    def get_user_info_many(self, names: Iterable[Any], workers: int=8, ordered: bool=True) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        """
+        批量获取用户个人信息，重复的ID只请求一次。
 
-        if code != SUCCESS:
-            raise get_exception(code)
+        Args:
+            names参数为用户名或用户UID列表，workers参数为并发请求数，ordered参数为是否按输入顺序返回，否则按完成顺序返回。
+
+        Returns:
+            逐项返回(name, data)，data与get_user_info返回值相同；请求失败时data为对应的异常对象，不会中断其余请求。
+            使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._fetch_many(self.get_user_info, names, workers, ordered)
 
-        return data
-        
     def get_user_statistics_active(self, uid: int) -> Dict[str, Any]:
         """
         获取用户解题活跃数据。相同的路径数据缓存60分钟。
@@ -58,12 +66,7 @@ class UserCollection(Collection):
                 ]
             }
         """
-        code, data = self.client._get(f'user/{uid}/statistics/active/')
-
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'user/{uid}/statistics/active/')
     
     def get_user_statistics_solves(self, uid: int) -> List[Any]:
         """
@@ -119,12 +122,7 @@ class UserCollection(Collection):
                 },
             ]
         """
-        code, data = self.client._get(f'user/{uid}/statistics/solves/')
-
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'user/{uid}/statistics/solves/')
     
     def get_user_statistics_rating(self, uid: int) -> Dict[str, Any]:
         """
@@ -147,12 +145,7 @@ class UserCollection(Collection):
                 }
             ]
         """
-        code, data = self.client._get(f'user/{uid}/statistics/rating/')
-
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'user/{uid}/statistics/rating/')
     
     def get_user_statistics_radar(self, uid: int) -> Dict[str, Any]:
         """
@@ -175,12 +168,7 @@ class UserCollection(Collection):
                 }
             ]
         """
-        code, data = self.client._get(f'user/{uid}/statistics/radar/')
-
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'user/{uid}/statistics/radar/')
     
     def get_user_article_list(self, uid: int, page: int, size: int) -> Dict[str, Any]:
         """
@@ -204,12 +192,7 @@ class UserCollection(Collection):
                 total: integer
             }
         """
-        code, data = self.client._get(f'user/{uid}/article/list/{page}/{size}/')
-
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'user/{uid}/article/list/{page}/{size}/')
     
     def get_user_following_list(self, uid: int, page: int, size: int) -> Dict[str, Any]:
         """
@@ -230,12 +213,7 @@ class UserCollection(Collection):
                 },
             ]
         """
-        code, data = self.client._get(f'user/{uid}/following/list/{page}/{size}/')
-
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'user/{uid}/following/list/{page}/{size}/')
     
     def get_user_follower_list(self, uid: int, page: int, size: int) -> Dict[str, Any]:
         """
@@ -256,12 +234,7 @@ class UserCollection(Collection):
                 },
             ]
         """
-        code, data = self.client._get(f'user/{uid}/follower/list/{page}/{size}/')
-
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'user/{uid}/follower/list/{page}/{size}/')
     
     def get_user_picturebed_used(self) -> Dict[str, Any]:
         """
@@ -276,14 +249,9 @@ class UserCollection(Collection):
                 total: integer,
             }
         """
-        code, data = self._get(f'user/picturebed/used/')
-
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'user/picturebed/used/')
     
-    def get_user_picturebed_used(self, page: int, size: int) -> Dict[str, Any]:
+    def get_user_picturebed_list(self, page: int, size: int) -> Dict[str, Any]:
         """
         获取图床列表。数据缓存10分钟。
         
@@ -306,20 +274,17 @@ class UserCollection(Collection):
                 total: integer
             }
         """
-        code, data = self.client._get(f'user/picturebed/list/{page}/{size}/')
-
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self._get(f'user/picturebed/list/{page}/{size}/')
     
-    def post_user_picturebed_upload(self, filename: str, image: IO) -> Dict[str, Any]:
+    def post_user_picturebed_upload(self, filename: str, image: IO, progress: Callable[[UploadProgress], None]=None) -> Dict[str, Any]:
         """
-        图床上传图片
+        图床上传图片，文件内容在发送时分块读取，不会整体读入内存。
 
         Args:
             filename: 文件名
-            image: 文件IO流
+            image: 文件IO流或bytes
+            progress: 上传进度回调，每发送一块数据以UploadProgress(sent, total, elapsed)调用一次，
+                其throughput属性为上传速率（字节/秒）
 
         Returns:
             {
@@ -330,13 +295,9 @@ class UserCollection(Collection):
                 url: string
             }
         """
-        code, data = self.client._post(f'user/picturebed/upload/', files={
-            'image': (filename, image.read())
-        })
-        if code != SUCCESS:
-            raise get_exception(code)
-
-        return data
+        return self.client._upload(f'user/picturebed/upload/', files={
+            'image': (filename, image)
+        }, progress=progress)
     
     def post_user_picturebed_download(self, pid: int) -> io.BytesIO:
         """
@@ -348,9 +309,78 @@ class UserCollection(Collection):
         Returns:
             bytes IO流
         """
-        res = self.client._post(f'user/picturebed/{pid}/download/', parse=False)
+        return self.client._download(f'user/picturebed/{pid}/download/')
+
+    def iter_user_picturebed_download(self, pid: int, chunk_size: int=65536) -> Iterator[bytes]:
+        """
+        图床流式下载图片，不会将整个文件读入内存。
+
+        Args:
+            pid参数为图片ID，chunk_size参数为每块的字节数。
+
+        Returns:
+            逐块返回图片数据，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self.client._download_chunks(f'user/picturebed/{pid}/download/', chunk_size)
 
-        if res.headers['Content-Type'] != 'application/octet-stream':
-            raise get_exception(res.json()['code'])
+    def download_user_picturebed(self, pid: int, dest: Union[str, IO], chunk_size: int=65536, resume: bool=True) -> int:
+        """
+        图床下载图片并逐块写入文件。
+
+        Args:
+            pid参数为图片ID，dest参数为文件路径或以二进制写入模式打开的文件对象，chunk_size参数为每块的字节数。
+            resume参数为是否断点续传：dest中已有的数据（文件路径为文件大小，文件对象为当前位置）不再重复下载，
+            服务端不支持续传时重新下载整个文件。
+
+        Returns:
+            写入完成后的文件大小。
+        """
+        return self.client._download_to(f'user/picturebed/{pid}/download/', dest, chunk_size, resume)
+
+    def iter_user_articles(self, uid: int, size: int=10, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历用户文章列表，自动翻页。
+
+        Args:
+            uid参数为用户UID，size参数为每页大小，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_user_article_list中articles列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_user_article_list(uid, page, size), 'articles', size, prefetch)
+
+    def iter_user_following(self, uid: int, size: int=10, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历用户关注列表，自动翻页。
+
+        Args:
+            uid参数为用户UID，size参数为每页大小，prefetch参数为是否在处理当前页时预取下一页。
 
-        return io.BytesIO(res.content)
+        Returns:
+            逐项返回get_user_following_list返回列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_user_following_list(uid, page, size), None, size, prefetch)
+
+    def iter_user_followers(self, uid: int, size: int=10, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历用户粉丝列表，自动翻页。
+
+        Args:
+            uid参数为用户UID，size参数为每页大小，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_user_follower_list返回列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_user_follower_list(uid, page, size), None, size, prefetch)
+
+    def iter_user_picturebed(self, size: int=10, prefetch: bool=True) -> Iterator[Dict[str, Any]]:
+        """
+        遍历图床图片列表，自动翻页。
+
+        Args:
+            size参数为每页大小，prefetch参数为是否在处理当前页时预取下一页。
+
+        Returns:
+            逐项返回get_user_picturebed_list中pictures列表的元素，使用AsyncNSSClient时为异步迭代器。
+        """
+        return self._paginate(lambda page: self.get_user_picturebed_list(page, size), 'pictures', size, prefetch)
@@ -0,0 +1,373 @@
+import re
+import time
+from array import array
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+
+def parse_ids(value: Union[str, list, None]) -> List[int]:
+    """
+    PIDs or timestamps from a ``solved``/``solved_time`` field, which the rank
+    list returns as a delimited string.
+    """
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [int(item) for item in value]
+
+    return [int(item) for item in re.findall(r'\d+', str(value))]
+
+
+class Row(NamedTuple):
+    uid: int
+    username: str
+    rank: int
+    score: int
+    solved: FrozenSet[int]
+    solved_time: Dict[int, int]
+
+
+class Snapshot(NamedTuple):
+    """
+    Every rank list page of a contest merged into one board.
+    """
+    rows: Dict[int, Row]
+    top3: Dict[int, List[int]]
+    point: Dict[int, int]
+    problems: List[list]
+    head: Any
+    fetched: float
+
+
+class Solve(NamedTuple):
+    uid: int
+    username: str
+    pid: int
+    time: Optional[int]
+
+
+class RankChange(NamedTuple):
+    """
+    ``old`` is ``None`` for a participant who just entered the board.
+    """
+    uid: int
+    username: str
+    old: Optional[int]
+    new: int
+
+
+class ScoreChange(NamedTuple):
+    uid: int
+    username: str
+    old: Optional[int]
+    new: int
+
+
+class Blood(NamedTuple):
+    """
+    A new first (``position`` 1), second or third blood on a problem.
+    """
+    pid: int
+    position: int
+    uid: int
+
+
+def _rank_page(client, cid: int, team: bool, size: int) -> Callable[[int], Dict[str, Any]]:
+    if team:
+        return lambda page: client.team.get_team_contest_rank_list_by_page(cid, page, size)
+
+    return lambda page: client.contest.get_contest_rank_list(cid, page)
+
+
+def rank_pages(client, cid: int, team: bool=False, workers: int=8, size: int=10, first: Dict[str, Any]=None) -> List[Dict[str, Any]]:
+    """
+    Every rank list page of a contest, the pages after the first requested concurrently.
+
+    ``team`` selects ``get_team_contest_rank_list_by_page`` with ``size``
+    rows per page instead of ``get_contest_rank_list``. An already fetched
+    first page can be passed as ``first``.
+    """
+    fetch = _rank_page(client, cid, team, size)
+    if first is None:
+        first = fetch(1)
+
+    pages = [first]
+    per_page = len(first.get('solves') or ()) or size
+    count = (first.get('total', 0) + per_page - 1) // per_page
+    for _, data in client._fetch_many(fetch, range(2, count + 1), workers):
+        if isinstance(data, Exception):
+            raise data
+        pages.append(data)
+
+    return pages
+
+
+def _head(page: Dict[str, Any]) -> Any:
+    # the first page carries the solve count and point of every problem, so
+    # any solve on the board changes it
+    return page.get('problems'), page.get('point'), page.get('top3'), page.get('total')
+
+
+def _snapshot(pages: List[Dict[str, Any]]) -> Snapshot:
+    first = pages[0]
+    rows = {}
+    for page in pages:
+        for row in page.get('solves') or ():
+            solved = parse_ids(row.get('solved'))
+            times = parse_ids(row.get('solved_time'))
+            rows[row['uid']] = Row(
+                row['uid'],
+                row.get('username'),
+                len(rows) + 1,
+                row.get('score', 0),
+                frozenset(solved),
+                dict(zip(solved, times)) if len(times) == len(solved) else {}
+            )
+
+    return Snapshot(
+        rows,
+        {int(pid): parse_ids(uids) for pid, uids in (first.get('top3') or {}).items()},
+        {int(pid): point for pid, point in (first.get('point') or {}).items()},
+        first.get('problems') or [],
+        _head(first),
+        time.time()
+    )
+
+
+def diff(old: Optional[Snapshot], new: Snapshot) -> List[Union[Solve, RankChange, ScoreChange, Blood]]:
+    """
+    Events turning the ``old`` board into the ``new`` one.
+    """
+    events = []
+    old_rows = old.rows if old is not None else {}
+
+    for uid, row in new.rows.items():
+        before = old_rows.get(uid)
+        solved = row.solved - before.solved if before is not None else row.solved
+        for pid in sorted(solved, key=lambda pid: row.solved_time.get(pid, 0)):
+            events.append(Solve(uid, row.username, pid, row.solved_time.get(pid)))
+        if before is None or before.score != row.score:
+            events.append(ScoreChange(uid, row.username, before and before.score, row.score))
+        if before is None or before.rank != row.rank:
+            events.append(RankChange(uid, row.username, before and before.rank, row.rank))
+
+    old_top3 = old.top3 if old is not None else {}
+    for pid, uids in new.top3.items():
+        known = old_top3.get(pid, [])
+        for position, uid in enumerate(uids, 1):
+            if position > len(known) or known[position - 1] != uid:
+                events.append(Blood(pid, position, uid))
+
+    return events
+
+
+class Scoreboard:
+    """
+    Full contest scoreboard stored by column
+
+    UIDs, scores and ranks are kept in arrays indexed by row, and the solves
+    as one ``bytearray`` bitset per problem where bit ``i`` is set when row
+    ``i`` solved it. Next to saving the memory of a dict per row, this makes "who solved
+    this problem" a single bitset scan.
+
+    Example:
+
+        >>> board = Scoreboard.fetch(client, cid=100)
+        >>> board.solvers(1)
+        >>> board.solve_counts()
+
+    ``team`` builds the board from ``get_team_contest_rank_list_by_page``.
+    """
+    def __init__(self) -> None:
+        self.uids = array('q')
+        self.scores = array('d')
+        self.ranks = array('l')
+        self.usernames: List[str] = []
+        self.pids: List[int] = []
+
+        self._rows: Dict[int, int] = {}
+        self._columns: Dict[int, int] = {}
+        self._solved: List[bytearray] = []
+
+    def __len__(self) -> int:
+        return len(self.uids)
+
+    def __contains__(self, uid: int) -> bool:
+        return uid in self._rows
+
+    @classmethod
+    def fetch(cls, client, cid: int, team: bool=False, workers: int=8, size: int=10) -> 'Scoreboard':
+        """
+        Request every rank list page of a contest, bypassing the client cache.
+        """
+        with client.no_cache():
+            return cls.from_pages(rank_pages(client, cid, team, workers, size))
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[Dict[str, Any]]) -> 'Scoreboard':
+        board = cls()
+        for page in pages:
+            if not board.pids:
+                for problem in page.get('problems') or ():
+                    board._column(int(problem[0]))
+            for row in page.get('solves') or ():
+                board.add(row)
+
+        return board
+
+    def _column(self, pid: int) -> int:
+        column = self._columns.get(pid)
+        if column is None:
+            column = self._columns[pid] = len(self.pids)
+            self.pids.append(pid)
+            self._solved.append(bytearray())
+
+        return column
+
+    def add(self, row: Dict[str, Any]) -> None:
+        """
+        Append a ``solves`` row of the rank list, ranked after the previous ones.
+        """
+        index = self._rows[row['uid']] = len(self.uids)
+        self.uids.append(row['uid'])
+        self.scores.append(row.get('score') or 0)
+        self.ranks.append(index + 1)
+        self.usernames.append(row.get('username'))
+
+        byte, bit = divmod(index, 8)
+        for pid in parse_ids(row.get('solved')):
+            bits = self._solved[self._column(pid)]
+            if len(bits) <= byte:
+                bits.extend(bytes(byte + 1 - len(bits)))
+            bits[byte] |= 1 << bit
+
+    def _bits(self, pid: int) -> int:
+        column = self._columns.get(pid)
+        return int.from_bytes(self._solved[column], 'little') if column is not None else 0
+
+    def _members(self, bits: int) -> List[int]:
+        uids = []
+        for byte, value in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, 'little')):
+            while value:
+                low = value & -value
+                uids.append(self.uids[byte * 8 + low.bit_length() - 1])
+                value ^= low
+
+        return uids
+
+    def solvers(self, pid: int) -> List[int]:
+        """
+        UIDs that solved a problem, in rank order.
+        """
+        return self._members(self._bits(pid))
+
+    def solve_counts(self) -> Dict[int, int]:
+        return {pid: bin(int.from_bytes(bits, 'little')).count('1') for pid, bits in zip(self.pids, self._solved)}
+
+    def solved(self, uid: int) -> List[int]:
+        """
+        PIDs solved by a participant.
+        """
+        byte, bit = divmod(self._rows[uid], 8)
+        return [pid for pid, bits in zip(self.pids, self._solved) if len(bits) > byte and bits[byte] >> bit & 1]
+
+    def solved_all(self, pids: Iterable[int]) -> List[int]:
+        """
+        UIDs that solved every one of ``pids``, in rank order.
+        """
+        bits = (1 << len(self.uids)) - 1
+        for pid in pids:
+            bits &= self._bits(pid)
+
+        return self._members(bits)
+
+    def row(self, uid: int) -> Row:
+        index = self._rows[uid]
+        return Row(uid, self.usernames[index], self.ranks[index], self.scores[index], frozenset(self.solved(uid)), {})
+
+
+class ScoreboardWatcher:
+    """
+    Polls the full scoreboard of a contest and reports what changed
+
+    The server refreshes a rank list once per ``interval`` (60 seconds). The
+    watcher probes the first page, which carries the solve count and point of
+    every problem, every ``probe`` seconds until it sees a refresh, and from
+    then on only around the time the next refresh is expected. The other pages
+    are requested when the first one changed. The client cache is bypassed.
+
+    Example:
+
+        >>> watcher = ScoreboardWatcher(client, cid=100)
+        >>> for event in watcher.watch():
+        ...     if isinstance(event, Blood) and event.position == 1:
+        ...         print(f'first blood on {event.pid} by {event.uid}')
+
+    The first poll reports every participant as new.
+    """
+    def __init__(self,
+        client,
+        cid: int,
+        team: bool=False,
+        interval: float=60.0,
+        probe: float=2.0,
+        workers: int=8,
+        size: int=10
+    ) -> None:
+        self.client = client
+        self.cid = cid
+        self.team = team
+        self.interval = interval
+        self.probe = probe
+        self.workers = workers
+        self.size = size
+        self.snapshot: Optional[Snapshot] = None
+
+    def fetch(self) -> Snapshot:
+        """
+        Request every rank list page of the contest.
+        """
+        with self.client.no_cache():
+            return _snapshot(rank_pages(self.client, self.cid, self.team, self.workers, self.size))
+
+    def poll(self) -> List[Union[Solve, RankChange, ScoreChange, Blood]]:
+        """
+        Fetch the board once and return the events since the previous poll.
+        """
+        with self.client.no_cache():
+            first = _rank_page(self.client, self.cid, self.team, self.size)(1)
+            if self.snapshot is not None and _head(first) == self.snapshot.head:
+                return []
+
+            snapshot = _snapshot(rank_pages(self.client, self.cid, self.team, self.workers, self.size, first))
+
+        events = diff(self.snapshot, snapshot)
+        self.snapshot = snapshot
+
+        return events
+
+    def watch(self) -> Iterator[Union[Solve, RankChange, ScoreChange, Blood]]:
+        """
+        Poll forever in step with the server refresh, yielding the events as they are found.
+        """
+        # monotonic (start, end) range in which the next refresh is expected
+        window: Optional[Tuple[float, float]] = None
+        last = None
+        while True:
+            before, now = self.snapshot, time.monotonic()
+            yield from self.poll()
+
+            if before is not None and self.snapshot is not before:
+                # the refresh happened after the previous probe, which is at
+                # most one probe ahead of the window when one is known
+                low = last if window is None else max(last, window[0] - self.probe)
+                window = (low + self.interval, now + self.interval)
+            last = now
+
+            if window is None:
+                time.sleep(self.probe)
+                continue
+            while window[1] <= last:
+                # nothing changed in this window, the board was not touched
+                window = (window[0] + self.interval, window[1] + self.interval)
+            wait = window[0] - self.probe - time.monotonic()
+            time.sleep(wait if wait > 0 else self.probe)
@@ -0,0 +1,328 @@
+import os
+import json
+import time
+import weakref
+import threading
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple, Type, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from balderich.utils.profile import POOL_CLASSES
+
+Timeout = Union[float, Tuple[float, float], None]
+
+
+class Transport(ABC):
+    """
+    Sends the signed requests of ``NSSClient`` and returns the responses
+
+    Signing, retries, error codes, caching and metrics stay in the client, a
+    transport only moves bytes. ``request`` takes the arguments of
+    ``requests.Session.request`` the client uses and returns an object with
+    the ``requests.Response`` attributes it reads: ``status_code``,
+    ``headers``, ``content``, ``elapsed`` (the time to the response headers),
+    ``iter_content``, ``json``, ``raise_for_status`` and ``close``. ``errors``
+    are the exceptions of failed requests, they are retried like network
+    errors.
+
+    Example:
+
+        >>> client = NSSClient(key, secret, transport='http2')
+        >>> client = NSSClient(key, secret, transport=InProcessTransport(MockServer()))
+    """
+    errors: Tuple[Type[BaseException], ...] = ()
+
+    @abstractmethod
+    def request(self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any]=None,
+        data: Any=None,
+        files: Dict[str, Tuple[str, Any]]=None,
+        headers: Mapping[str, str]=None,
+        stream: bool=False,
+        timeout: Timeout=None
+    ) -> Any:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class RequestsTransport(Transport):
+    """
+    HTTP/1.1 over a pool of keep-alive ``requests`` connections
+
+    The pool is shared by all threads, each thread getting its own
+    ``requests.Session`` on top of it. ``pool_connections`` is the number of
+    hosts to keep pools for and ``pool_maxsize`` the number of connections
+    kept per host; with ``pool_block`` set, no more than ``pool_maxsize``
+    connections are opened to a host at once. With ``profiled`` the
+    connections record their connect phase into the current
+    ``balderich.utils.profile.RequestProfile``.
+    """
+    errors = (requests.ConnectionError, requests.Timeout, requests.HTTPError)
+
+    def __init__(self, pool_connections: int=10, pool_maxsize: int=10, pool_block: bool=False, profiled: bool=False) -> None:
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.profiled = profiled
+
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._adapter = None
+        # held by the thread locals, a session goes away with its thread
+        self._sessions = weakref.WeakSet()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        The ``requests.Session`` of the calling thread.
+
+        Sessions are created lazily and all of them share one connection pool.
+        A forked child process drops the pool inherited from its parent and
+        opens its own connections.
+        """
+        if self._pid != os.getpid():
+            # the lock may have been held by another thread at fork time
+            self._lock = threading.Lock()
+            self._reset()
+
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            with self._lock:
+                if self._adapter is None:
+                    self._adapter = HTTPAdapter(
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize,
+                        pool_block=self.pool_block
+                    )
+                    if self.profiled:
+                        # connections which time their connect phase
+                        self._adapter.poolmanager.pool_classes_by_scheme = POOL_CLASSES
+                session = requests.Session()
+                session.mount('http://', self._adapter)
+                session.mount('https://', self._adapter)
+                self._sessions.add(session)
+            self._local.session = session
+
+        return session
+
+    def request(self, method: str, url: str, params: Mapping[str, Any]=None, data: Any=None, files: Dict[str, Tuple[str, Any]]=None,
+                headers: Mapping[str, str]=None, stream: bool=False, timeout: Timeout=None) -> requests.Response:
+        return self.session.request(method, url, params=params, data=data, files=files, headers=headers, stream=stream, timeout=timeout)
+
+    def close(self) -> None:
+        """
+        Close every session and the pooled connections, a new pool is opened on the next request.
+        """
+        with self._lock:
+            adapter, sessions = self._adapter, list(self._sessions)
+            if self._pid == os.getpid():
+                for session in sessions:
+                    session.close()
+                if adapter is not None:
+                    adapter.close()
+            self._reset()
+
+
+class _Response:
+    """
+    The ``requests.Response`` attributes the client reads, for the other transports.
+    """
+    def __init__(self, status_code: int, headers: Mapping[str, str], elapsed: float, content: bytes=None, chunks: Iterator[bytes]=None,
+                 url: str=None, close: Any=None) -> None:
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.elapsed = timedelta(seconds=elapsed)
+        self.url = url
+
+        self._content = content
+        self._chunks = chunks
+        self._close = close
+
+    def __enter__(self) -> '_Response':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            self._content = b''.join(self._chunks)
+            self.close()
+
+        return self._content
+
+    def iter_content(self, chunk_size: int=1) -> Iterator[bytes]:
+        if self._content is not None:
+            for offset in range(0, len(self._content), chunk_size):
+                yield self._content[offset:offset + chunk_size]
+            return
+
+        buffer = b''
+        try:
+            for chunk in self._chunks:
+                buffer += chunk
+                while len(buffer) >= chunk_size:
+                    yield buffer[:chunk_size]
+                    buffer = buffer[chunk_size:]
+            if buffer:
+                yield buffer
+        finally:
+            self.close()
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code} Error for url: {self.url}', response=self)
+
+    def close(self) -> None:
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+
+def _body(data: Any, files: Optional[Dict[str, Tuple[str, Any]]]) -> Tuple[Optional[Dict[str, list]], int]:
+    # form fields and the size of the uploaded content
+    if hasattr(data, 'read'):
+        size = 0
+        for chunk in iter(lambda: data.read(65536), b''):
+            size += len(chunk)
+        return None, size
+
+    form = {
+        name: [str(item) for item in (value if isinstance(value, (list, tuple)) else [value])]
+        for name, value in (data or {}).items()
+    }
+    size = 0
+    for _, content in (files or {}).values():
+        size += len(content.read() if hasattr(content, 'read') else content)
+
+    return form, size
+
+
+class InProcessTransport(Transport):
+    """
+    Answers the requests with a server object in the same process, without sockets
+
+    ``server`` is a ``balderich.mock.MockServer`` or any object with its
+    ``handle`` and ``delay`` methods. Latency is slept like over HTTP.
+
+    Example:
+
+        >>> mock = MockServer(total=1000)
+        >>> client = NSSClient(key=mock.key, secret=mock.secret, transport=InProcessTransport(mock))
+    """
+    errors = (requests.HTTPError,)
+
+    def __init__(self, server: Any, prefix: str='/v2/api/') -> None:
+        self.server = server
+        self.prefix = prefix
+
+    def request(self, method: str, url: str, params: Mapping[str, Any]=None, data: Any=None, files: Dict[str, Tuple[str, Any]]=None,
+                headers: Mapping[str, str]=None, stream: bool=False, timeout: Timeout=None) -> _Response:
+        start = time.perf_counter()
+        path = urlsplit(url).path
+        path = path[len(self.prefix):] if path.startswith(self.prefix) else path.lstrip('/')
+        form, size = _body(data, files)
+
+        delay = self.server.delay()
+        if delay:
+            time.sleep(delay)
+
+        params = {name: str(value) for name, value in (params or {}).items()}
+        status, res_headers, body = self.server.handle(method, path, params, form, CaseInsensitiveDict(headers or {}), size)
+
+        return _Response(status, res_headers, time.perf_counter() - start, content=body, url=url)
+
+
+class HTTP2Transport(Transport):
+    """
+    HTTP/2 over ``httpx``, requires ``pip install balderich[http2]``
+
+    Concurrent requests from any number of threads are multiplexed as
+    streams over a few connections instead of one connection each;
+    ``max_connections`` bounds the connections kept. Servers without HTTP/2
+    are spoken to in HTTP/1.1.
+    """
+    def __init__(self, max_connections: int=10) -> None:
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError('HTTP2Transport requires httpx, install it with `pip install balderich[http2]`')
+
+        self.max_connections = max_connections
+        self.errors = (httpx.TransportError, requests.HTTPError)
+
+        self._httpx = httpx
+        self._lock = threading.Lock()
+        self._client = None
+        self._pid = os.getpid()
+
+    @property
+    def client(self) -> Any:
+        """
+        The ``httpx.Client``, opened on first use and again in a forked child.
+        """
+        if self._client is None or self._pid != os.getpid():
+            with self._lock:
+                if self._client is None or self._pid != os.getpid():
+                    self._pid = os.getpid()
+                    self._client = self._httpx.Client(http2=True, limits=self._httpx.Limits(max_connections=self.max_connections))
+
+        return self._client
+
+    def request(self, method: str, url: str, params: Mapping[str, Any]=None, data: Any=None, files: Dict[str, Tuple[str, Any]]=None,
+                headers: Mapping[str, str]=None, stream: bool=False, timeout: Timeout=None) -> _Response:
+        if isinstance(timeout, tuple):
+            timeout = self._httpx.Timeout(timeout[1], connect=timeout[0])
+
+        kwargs = {}
+        if hasattr(data, 'read'):
+            # a streamed body, sent chunk by chunk
+            kwargs['content'] = iter(lambda: data.read(65536), b'')
+            if getattr(data, 'len', None) is not None:
+                headers = dict(headers or {}, **{'Content-Length': str(data.len)})
+        else:
+            kwargs['data'] = data
+            kwargs['files'] = files
+
+        start = time.perf_counter()
+        req = self.client.build_request(method, url, params=params, headers=headers, timeout=timeout, **kwargs)
+        res = self.client.send(req, stream=True)
+        elapsed = time.perf_counter() - start
+
+        if not stream:
+            try:
+                res.read()
+            finally:
+                res.close()
+            return _Response(res.status_code, res.headers, elapsed, content=res.content, url=url)
+
+        return _Response(res.status_code, res.headers, elapsed, chunks=res.iter_bytes(), url=url, close=res.close)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None and self._pid == os.getpid():
+                self._client.close()
+            self._client = None
+
+
+TRANSPORTS = {
+    'requests': RequestsTransport,
+    'http2': HTTP2Transport
+}
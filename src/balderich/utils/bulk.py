@@ -0,0 +1,182 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from balderich.utils.exceptions import BalderichException, PartialResultException, is_retryable
+
+
+def fetch_many(fetch: Callable[[Any], Any], ids: Iterable[Hashable], workers: int=8, ordered: bool=True) -> Iterator[Tuple[Any, Any]]:
+    """
+    Call ``fetch(id)`` for every distinct id from a pool of ``workers`` threads.
+
+    Yields ``(id, result)`` pairs in the order of ``ids`` or, when ``ordered``
+    is false, as the requests complete. A failed lookup does not stop the
+    batch, its result is the raised exception.
+    """
+    ids = list(dict.fromkeys(ids))
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(workers, len(ids))))
+    futures = {}
+    try:
+        futures = {
+            pool.submit(contextvars.copy_context().run, fetch, id): id
+            for id in ids
+        }
+
+        for future in (futures if ordered else as_completed(futures)):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+    finally:
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
+async def afetch_many(fetch: Callable[[Any], Awaitable[Any]], ids: Iterable[Hashable], workers: int=8, ordered: bool=True) -> AsyncIterator[Tuple[Any, Any]]:
+    """
+    Asynchronous version of ``fetch_many``, at most ``workers`` requests are in flight.
+    """
+    ids = list(dict.fromkeys(ids))
+    semaphore = asyncio.Semaphore(workers)
+
+    async def run(id):
+        async with semaphore:
+            try:
+                return id, await fetch(id)
+            except Exception as e:
+                return id, e
+
+    tasks = [asyncio.ensure_future(run(id)) for id in ids]
+    try:
+        for task in (tasks if ordered else asyncio.as_completed(tasks)):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _chunks(items: Sequence, size: int) -> List[tuple]:
+    items = list(dict.fromkeys(items))
+    return [tuple(items[i:i + size]) for i in range(0, len(items), size)]
+
+
+def _resend(chunk: tuple, error: Exception) -> List[tuple]:
+    # an API error other than throttling fails the same way again; anything
+    # else is resent in halves so that a single bad item or an oversized
+    # payload only fails its own half
+    if isinstance(error, BalderichException) and not is_retryable(error.code):
+        return []
+    if len(chunk) == 1:
+        return [chunk]
+
+    half = len(chunk) // 2
+    return [chunk[:half], chunk[half:]]
+
+
+def _merge(done: Iterable[Tuple[tuple, Any]], results: dict, failed: dict, retry: bool, merge: Callable[[dict, dict], None]) -> Tuple[List[tuple], int]:
+    pending, succeeded = [], 0
+    for chunk, data in done:
+        if not isinstance(data, Exception):
+            merge(results, data or {})
+            succeeded += 1
+            continue
+
+        resend = _resend(chunk, data) if retry else []
+        if resend:
+            pending += resend
+        else:
+            failed.update((item, data) for item in chunk)
+
+    return pending, succeeded
+
+
+def _check(results: dict, failed: dict, chunks: int, succeeded: int) -> dict:
+    if not failed:
+        return results
+
+    # with nothing to return partially, a single chunk or the same API error
+    # for every chunk is raised as is, like the unsplit request would
+    errors = list(dict.fromkeys(failed.values()))
+    if not succeeded:
+        if chunks == 1:
+            raise errors[0]
+        if all(isinstance(e, BalderichException) for e in errors) and len({(type(e), e.code) for e in errors}) == 1:
+            raise errors[0]
+
+    raise PartialResultException(results, failed)
+
+
+def sum_merge(results: dict, data: dict) -> None:
+    """
+    Merge by adding up the numeric fields of the values under the same key,
+    for results aggregated per key (e.g. per day) in every chunk.
+    """
+    for key, value in data.items():
+        if key not in results:
+            results[key] = dict(value) if isinstance(value, dict) else value
+        elif isinstance(value, dict):
+            total = results[key]
+            for field, number in value.items():
+                total[field] = total.get(field, 0) + number
+        else:
+            results[key] += value
+
+
+def fan_out(fetch: Callable[[list], dict], items: Sequence, chunk_size: int=100, workers: int=8, attempts: int=2,
+            merge: Optional[Callable[[dict, dict], None]]=None) -> dict:
+    """
+    Call ``fetch(chunk)`` for chunks of at most ``chunk_size`` distinct items
+    concurrently and merge the returned mappings, with ``dict.update`` or
+    ``merge(results, data)``.
+
+    A failed chunk is resent on its own, split in halves, up to ``attempts``
+    more times. If chunks still fail, ``PartialResultException`` is raised
+    with the merged results of the others. When no chunk succeeded and the
+    items fit in one chunk or every chunk failed with the same API error,
+    that exception is raised instead.
+    """
+    results, failed, succeeded = {}, {}, 0
+    merge = merge or dict.update
+    pending = _chunks(items, chunk_size)
+    chunks = len(pending)
+
+    for attempt in range(attempts + 1):
+        if not pending:
+            break
+
+        if len(pending) == 1:
+            try:
+                done = [(pending[0], fetch(list(pending[0])))]
+            except Exception as e:
+                done = [(pending[0], e)]
+        else:
+            done = fetch_many(lambda chunk: fetch(list(chunk)), pending, workers, ordered=False)
+
+        pending, count = _merge(done, results, failed, attempt < attempts, merge)
+        succeeded += count
+
+    return _check(results, failed, chunks, succeeded)
+
+
+async def afan_out(fetch: Callable[[list], Awaitable[dict]], items: Sequence, chunk_size: int=100, workers: int=8, attempts: int=2,
+                   merge: Optional[Callable[[dict, dict], None]]=None) -> dict:
+    """
+    Asynchronous version of ``fan_out``.
+    """
+    results, failed, succeeded = {}, {}, 0
+    merge = merge or dict.update
+    pending = _chunks(items, chunk_size)
+    chunks = len(pending)
+
+    for attempt in range(attempts + 1):
+        if not pending:
+            break
+
+        done = [item async for item in afetch_many(lambda chunk: fetch(list(chunk)), pending, workers, ordered=False)]
+        pending, count = _merge(done, results, failed, attempt < attempts, merge)
+        succeeded += count
+
+    return _check(results, failed, chunks, succeeded)
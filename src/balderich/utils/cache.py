@@ -0,0 +1,243 @@
+import os
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+
+class BaseCache(ABC):
+    """
+    Interface of the response caches used by the clients
+    """
+    hits = 0
+    misses = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, body: bytes, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+
+class TTLCache(BaseCache):
+    """
+    In-memory LRU cache of raw response bodies with a time to live per entry
+
+    The least recently used entries are evicted once more than ``maxsize``
+    entries or ``maxbytes`` bytes of bodies are stored.
+
+    Example:
+
+        >>> client = NSSClient(key, secret, cache=TTLCache(maxsize=4096))
+        >>> client.cache.hits, client.cache.misses
+    """
+    def __init__(self, maxsize: int=1024, maxbytes: int=None) -> None:
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                body, expires = item
+                if expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return body
+
+                del self._data[key]
+                self.size -= len(body)
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, body: bytes, ttl: float) -> None:
+        if self.maxbytes is not None and len(body) > self.maxbytes:
+            return
+
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= len(old[0])
+
+            self._data[key] = (body, time.monotonic() + ttl)
+            self.size += len(body)
+
+            while len(self._data) > self.maxsize or (self.maxbytes is not None and self.size > self.maxbytes):
+                _, (evicted, _) = self._data.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._data),
+            'bytes': self.size
+        }
+
+
+class SQLiteCache(BaseCache):
+    """
+    Response cache stored in a SQLite database, shared by every process using it
+
+    The database runs in WAL mode so that readers are not blocked by a writer.
+    Entries expire by wall-clock time; once more than ``maxsize`` entries or
+    ``maxbytes`` bytes are stored, the least recently used ones are evicted.
+    To keep reads cheap the access time of an entry is only refreshed once
+    per ``touch_interval`` seconds. ``hits`` and ``misses`` count the lookups
+    of this process.
+
+    Example:
+
+        >>> client = NSSClient(key, secret, cache=SQLiteCache('balderich-cache.db'))
+    """
+    def __init__(self,
+        path: str,
+        maxsize: int=100000,
+        maxbytes: int=None,
+        timeout: float=30.0,
+        touch_interval: float=60.0,
+        evict_every: int=64
+    ) -> None:
+        self.path = path
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.timeout = timeout
+        self.touch_interval = touch_interval
+        self.evict_every = evict_every
+        self.hits = 0
+        self.misses = 0
+
+        self._writes = 0
+        self._pid = None
+        self._local = None
+
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, body BLOB NOT NULL, size INTEGER NOT NULL, '
+                'expires REAL NOT NULL, accessed REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        # connections can neither be shared between threads nor survive a fork
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._local = threading.local()
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        conn = self._connection()
+        row = conn.execute('SELECT body, expires, accessed FROM responses WHERE key = ?', (key,)).fetchone()
+
+        now = time.time()
+        if row is None or row[1] <= now:
+            self.misses += 1
+            return None
+
+        if now - row[2] >= self.touch_interval:
+            conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+
+        self.hits += 1
+        return row[0]
+
+    def set(self, key: str, body: bytes, ttl: float) -> None:
+        if self.maxbytes is not None and len(body) > self.maxbytes:
+            return
+
+        now = time.time()
+        self._connection().execute(
+            'INSERT OR REPLACE INTO responses (key, body, size, expires, accessed) VALUES (?, ?, ?, ?, ?)',
+            (key, body, len(body), now + ttl, now)
+        )
+
+        self._writes += 1
+        if self._writes % self.evict_every == 0:
+            self.evict()
+
+    def evict(self) -> None:
+        """
+        Delete the expired entries, then the least recently used ones above the bounds.
+        """
+        conn = self._connection()
+        conn.execute('DELETE FROM responses WHERE expires <= ?', (time.time(),))
+
+        count, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        if count > self.maxsize:
+            conn.execute(
+                'DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)',
+                (count - self.maxsize,)
+            )
+        if self.maxbytes is not None and size > self.maxbytes:
+            conn.execute(
+                'DELETE FROM responses WHERE key IN ('
+                'SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed DESC) AS total FROM responses) '
+                'WHERE total > ?)',
+                (self.maxbytes,)
+            )
+
+    def compact(self) -> None:
+        """
+        Evict, then give the free pages and the write-ahead log back to the file system.
+        """
+        self.evict()
+
+        conn = self._connection()
+        conn.execute('VACUUM')
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def clear(self) -> None:
+        self._connection().execute('DELETE FROM responses')
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._pid == os.getpid():
+            conn.close()
+            self._local.conn = None
+
+    def stats(self) -> dict:
+        count, size = self._connection().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': count,
+            'bytes': size
+        }
@@ -0,0 +1,201 @@
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from balderich.models.typed import Record, records
+
+
+class Decoder:
+    """
+    Turns response bodies into ``(code, data)`` with the standard library
+
+    The time spent decoding is recorded per endpoint template by the client,
+    see ``stats()``. ``OrjsonDecoder`` and ``MsgspecDecoder`` use the faster
+    backends; ``get_decoder`` picks the fastest one installed.
+
+    Example:
+
+        >>> client = NSSClient(key, secret, decoder='orjson')
+        >>> client.decoder.stats()['problem/list/{page}/{size}/']
+        {'count': 12, 'seconds': 0.0041, 'bytes': 52340}
+    """
+    name = 'json'
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def loads(self, body: bytes) -> Any:
+        return json.loads(body)
+
+    def decode(self, body: bytes, model: type=None) -> Tuple[int, Any]:
+        """
+        ``model`` is the ``Record`` type of the data when the client is typed,
+        decoders that support it decode straight into it.
+        """
+        res = self.loads(body)
+        return res['code'], res['data']
+
+    def record(self, endpoint: Optional[str], seconds: float, size: int) -> None:
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = [0, 0.0, 0]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] += size
+
+    def stats(self) -> Dict[Optional[str], Dict[str, Union[int, float]]]:
+        """
+        Count, total seconds and total bytes of the decoded bodies per endpoint
+        template, bodies of unknown paths are counted under ``None``.
+        """
+        with self._lock:
+            return {
+                endpoint: {'count': count, 'seconds': seconds, 'bytes': size}
+                for endpoint, (count, seconds, size) in self._stats.items()
+            }
+
+
+class OrjsonDecoder(Decoder):
+    """
+    Decoder using orjson.
+    """
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        super().__init__()
+        try:
+            import orjson
+        except ImportError:
+            raise ImportError('OrjsonDecoder requires orjson, install it with `pip install balderich[fast]`')
+
+        self.loads = orjson.loads
+
+
+class MsgspecDecoder(Decoder):
+    """
+    Decoder using msgspec
+
+    Bodies are decoded into builtins, typed clients wrap them in the
+    ``balderich.models.typed`` records like with the other decoders. With
+    ``structs`` the data of the endpoints with a record type is decoded
+    straight into ``msgspec.Struct`` types generated from the records instead,
+    without building the intermediate dicts. The structs can be read like the
+    records, but they are not instances of them, their nested lists are lists
+    and their nested fields are decoded eagerly.
+
+    Example:
+
+        >>> client = NSSClient(key, secret, typed=True, decoder=MsgspecDecoder(structs=True))
+    """
+    name = 'msgspec'
+
+    def __init__(self, structs: bool=False) -> None:
+        super().__init__()
+        self.structs = structs
+        try:
+            import msgspec
+        except ImportError:
+            raise ImportError('MsgspecDecoder requires msgspec, install it with `pip install balderich[fast]`')
+
+        self._msgspec = msgspec
+        self._plain = msgspec.json.Decoder()
+        self._structs: Dict[type, Any] = {}
+        self._envelopes: Dict[type, Any] = {}
+        self._base = None
+
+    def loads(self, body: bytes) -> Any:
+        return self._plain.decode(body)
+
+    def _struct_base(self) -> type:
+        if self._base is None:
+            class StructRecord(self._msgspec.Struct):
+                def __getitem__(self, name: str) -> Any:
+                    if name not in self.__struct_fields__:
+                        raise KeyError(name)
+                    return getattr(self, name)
+
+                def __contains__(self, name: str) -> bool:
+                    return name in self.__struct_fields__
+
+                def keys(self) -> Tuple[str, ...]:
+                    return self.__struct_fields__
+
+                def get(self, name: str, default: Any=None) -> Any:
+                    value = getattr(self, name, None) if name in self.__struct_fields__ else None
+                    return default if value is None else value
+
+                def to_dict(self) -> Dict[str, Any]:
+                    return self._to_builtins(self)
+
+            StructRecord._to_builtins = staticmethod(self._msgspec.to_builtins)
+            self._base = StructRecord
+
+        return self._base
+
+    def struct(self, model: type) -> type:
+        """
+        The ``msgspec.Struct`` type with the fields of a ``Record`` type.
+        """
+        struct = self._structs.get(model)
+        if struct is not None:
+            return struct
+
+        fields = []
+        for name in model._fields:
+            kind = Any
+            if name in model._nested:
+                decode = vars(model)[name].decode
+                if isinstance(decode, records):
+                    kind = Optional[List[self.struct(decode.model)]]
+                elif isinstance(decode, type) and issubclass(decode, Record):
+                    kind = Optional[self.struct(decode)]
+            fields.append((name, kind, None))
+
+        struct = self._structs[model] = self._msgspec.defstruct(model.__name__, fields, bases=(self._struct_base(),))
+        return struct
+
+    def decode(self, body: bytes, model: type=None) -> Tuple[int, Any]:
+        if not self.structs or model is None or not (isinstance(model, type) and issubclass(model, Record)):
+            return super().decode(body)
+
+        envelope = self._envelopes.get(model)
+        if envelope is None:
+            struct = self.struct(model)
+            envelope = self._envelopes[model] = self._msgspec.json.Decoder(
+                self._msgspec.defstruct('Envelope', [('code', int), ('data', Optional[struct], None)])
+            )
+
+        try:
+            res = envelope.decode(body)
+        except self._msgspec.ValidationError:
+            # error responses do not carry the documented data
+            return super().decode(body)
+
+        return res.code, res.data
+
+
+DECODERS = {
+    'json': Decoder,
+    'orjson': OrjsonDecoder,
+    'msgspec': MsgspecDecoder
+}
+
+
+def get_decoder(decoder: Union[str, Decoder]=None) -> Decoder:
+    """
+    A decoder instance by name, or the fastest one installed for ``None`` or ``'auto'``.
+    """
+    if isinstance(decoder, Decoder):
+        return decoder
+    if decoder is not None and decoder != 'auto':
+        return DECODERS[decoder]()
+
+    for cls in (MsgspecDecoder, OrjsonDecoder):
+        try:
+            return cls()
+        except ImportError:
+            pass
+
+    return Decoder()
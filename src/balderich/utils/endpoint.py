@@ -0,0 +1,76 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Pattern
+
+
+class Endpoint(NamedTuple):
+    """
+    An API path template, how long the server caches its data, in seconds,
+    and whether sending the request twice is safe.
+    """
+    method: str
+    template: str
+    ttl: int
+    idempotent: bool
+    pattern: Pattern
+
+
+def _endpoint(method: str, template: str, ttl: int=0, idempotent: bool=None) -> Endpoint:
+    if idempotent is None:
+        idempotent = method != 'POST'
+
+    pattern = re.compile(re.sub(r'\\{\w+\\}', '[^/]+', re.escape(template)))
+    return Endpoint(method, template, ttl, idempotent, pattern)
+
+
+ENDPOINTS = [
+    _endpoint('GET', 'user/picturebed/used/', 600),
+    _endpoint('GET', 'user/picturebed/list/{page}/{size}/', 600),
+    _endpoint('GET', 'user/{name}/info/', 3600),
+    _endpoint('GET', 'user/{uid}/statistics/active/', 3600),
+    _endpoint('GET', 'user/{uid}/statistics/solves/', 3600),
+    _endpoint('GET', 'user/{uid}/statistics/rating/', 3600),
+    _endpoint('GET', 'user/{uid}/statistics/radar/', 3600),
+    _endpoint('GET', 'user/{uid}/article/list/{page}/{size}/', 300),
+    _endpoint('GET', 'user/{uid}/following/list/{page}/{size}/', 600),
+    _endpoint('GET', 'user/{uid}/follower/list/{page}/{size}/', 600),
+    _endpoint('POST', 'user/picturebed/upload/'),
+    _endpoint('POST', 'user/picturebed/{pid}/download/', idempotent=True),
+
+    _endpoint('GET', 'problem/list/{page}/{size}/', 600),
+    _endpoint('GET', 'problem/{pid}/info/', 600),
+    _endpoint('GET', 'problem/sheet/list/{page}/{size}/', 600),
+    _endpoint('GET', 'problem/sheet/{psid}/info/', 600),
+    _endpoint('GET', 'problem/sheet/{psid}/list/{page}/{size}/', 600),
+
+    _endpoint('GET', 'contest/{type}/list/{page}/', 600),
+    _endpoint('GET', 'contest/{cid}/info/', 600),
+    _endpoint('GET', 'contest/{cid}/rank/list/{page}/', 60),
+
+    _endpoint('GET', 'team/list/{page}/{size}/', 600),
+    _endpoint('GET', 'team/notice/', 600),
+    _endpoint('GET', 'team/problem/list/{page}/{size}/', 600),
+    _endpoint('GET', 'team/problem/{pid}/info/', 600),
+    _endpoint('GET', 'team/contest/list/{page}/{size}/', 600),
+    _endpoint('GET', 'team/contest/{cid}/info/', 600),
+    _endpoint('GET', 'team/contest/{cid}/rank/list/{page}/{size}/', 60),
+    _endpoint('GET', 'team/user/list/{page}/{size}/', 600),
+    _endpoint('GET', 'team/user/apply/list/{page}/{size}/', 600),
+    _endpoint('GET', 'team/analysis/use/', 600),
+    _endpoint('GET', 'team/{tid}/info/', 600),
+    _endpoint('PUT', 'team/clockin/'),
+    _endpoint('POST', 'team/analysis/solves/curve/', idempotent=True),
+    _endpoint('POST', 'team/statistics/day/', idempotent=True),
+]
+
+
+@lru_cache(maxsize=4096)
+def match_endpoint(method: str, path: str) -> Optional[Endpoint]:
+    """
+    Find the endpoint a request path belongs to, ``None`` for unknown paths.
+    """
+    for endpoint in ENDPOINTS:
+        if endpoint.method == method and endpoint.pattern.fullmatch(path):
+            return endpoint
+
+    return None
@@ -1,99 +1,116 @@
+from typing import Dict, NamedTuple, Type
 from balderich.utils.code import *
 
-class AuthNoneException(Exception): ...
-class AuthNotExistException(Exception): ...
-class AuthErrorSignException(Exception): ...
-class AuthTimeoutException(Exception): ...
-class AuthCalcErrorException(Exception): ...
-class AuthRequestFastException(Exception): ...
-class RequestPramInvaildException(Exception): ...
-
-class UserNotExistException(Exception): ...
-class UserCloseFollowException(Exception): ...
-class UserImageNoneException(Exception): ...
-class UserImageFormatErrorException(Exception): ...
-class UserImageOpenErrorException(Exception): ...
-class UserMemoryNotEnoughException(Exception): ...
-class UserImageNotExistException(Exception): ...
-
-class ProblemNotExistException(Exception): ...
-class ProblemPermissionDeniedException(Exception): ...
-class ProblemSheetNotExistException(Exception): ...
-class ProblemSheetPermissionDeniedException(Exception): ...
-
-class ContestNotExistException(Exception): ...
-class ContestPermissionDeniedException(Exception): ...
-
-class TeamNotExistException(Exception): ...
-class TeamPermissionDeniedException(Exception): ...
-class TeamNoMemberException(Exception): ...
-class TeamMethodPermissionDeniedException(Exception): ...
-class TeamProblemNotExistException(Exception): ...
-class TeamProblemPermissionDeniedException(Exception): ...
-class TeamContestNotExistException(Exception): ...
-class TeamContestPermissionDeniedException(Exception): ...
-
-
-def get_exception(code: int, msg: str='') -> Exception:
-    if code == AUTH_NONE:
-        return AuthNoneException(msg)
-    elif code == AUTH_NOT_EXIST:
-        return AuthNotExistException(msg)
-    elif code == AUTH_NOT_EXIST:
-        return AuthErrorSignException(msg)
-    elif code == AUTH_ERROR_SIGN:
-        return AuthErrorSignException(msg)
-    elif code == AUTH_TIMEOUT:
-        return AuthTimeoutException(msg)
-    elif code == AUTH_CALC_ERROR:
-        return AuthCalcErrorException(msg)
-    elif code == AUTH_REQUEST_FAST:
-        return AuthRequestFastException(msg)
-    elif code == REQUEST_PARAM_INVALID:
-        return RequestPramInvaildException(msg)
-
-    elif code == USER_NOT_EXIST:
-        return UserNotExistException(msg)
-    elif code == USER_CLOSE_FOLLOW:
-        return UserCloseFollowException(msg)
-    elif code == USER_IMAGE_NONE:
-        return UserImageNoneException(msg)
-    elif code == USER_IMAGE_FORMAT_ERROR:
-        return UserImageFormatErrorException(msg)
-    elif code == USER_IMAGE_OPEN_ERROR:
-        return UserImageOpenErrorException(msg)
-    elif code == USER_MEMORY_NOT_ENOUGH:
-        return UserMemoryNotEnoughException(msg)
-    elif code == USER_IMAGE_NOT_EXIST:
-        return UserImageNotExistException(msg)
-    
-    elif code == PROBLEM_NOT_EXIST:
-        return ProblemNotExistException(msg)
-    elif code == PROBLEM_PEMISSION_DENIED:
-        return ProblemPermissionDeniedException(msg)
-    elif code == PROBLEM_SHEET_NOT_EXIST:
-        return ProblemSheetNotExistException(msg)
-    elif code == PROBLEM_SHEET_PEMISSION_DENIED:
-        return ProblemSheetPermissionDeniedException(msg)
-    
-    elif code == CONTEST_NOT_EXIST:
-        return ContestNotExistException(msg)
-    elif code == CONTEST_PERMISSION_DENIED:
-        return ContestPermissionDeniedException(msg)
-    
-    elif code == TEAM_NOT_EXIST:
-        return TeamNotExistException(msg)
-    elif code == TEAM_PERMISSION_DENIED:
-        return TeamPermissionDeniedException(msg)
-    elif code == TEAM_NO_MEMBER:
-        return TeamNoMemberException(msg)
-    elif code == TEAM_METHOD_PERMISSION_DENIED:
-        return TeamMethodPermissionDeniedException(msg)
-    elif code == TEAM_PROBLEM_NOT_EXIST:
-        return TeamProblemNotExistException(msg)
-    elif code == TEAM_PROBELM_PERMISSION_DENIED:
-        return TeamProblemPermissionDeniedException(msg)
-    elif code == TEAM_CONTEST_NOT_EXIST:
-        return TeamContestNotExistException(msg)
-    elif code == TEAM_CONTEST_PERMISSION_DENIED:
-        return TeamContestPermissionDeniedException(msg)
+class BalderichException(Exception):
+    """
+    Base class of the exceptions raised for API error codes.
+    """
+    code = None
+
+    def __init__(self, msg: str='', code: int=None) -> None:
+        super().__init__(msg)
+        if code is not None:
+            self.code = code
+
+class AuthNoneException(BalderichException): ...
+class AuthNotExistException(BalderichException): ...
+class AuthErrorSignException(BalderichException): ...
+class AuthTimeoutException(BalderichException): ...
+class AuthCalcErrorException(BalderichException): ...
+class AuthRequestFastException(BalderichException): ...
+class RequestPramInvaildException(BalderichException): ...
+
+class UserNotExistException(BalderichException): ...
+class UserCloseFollowException(BalderichException): ...
+class UserImageNoneException(BalderichException): ...
+class UserImageFormatErrorException(BalderichException): ...
+class UserImageOpenErrorException(BalderichException): ...
+class UserMemoryNotEnoughException(BalderichException): ...
+class UserImageNotExistException(BalderichException): ...
+
+class ProblemNotExistException(BalderichException): ...
+class ProblemPermissionDeniedException(BalderichException): ...
+class ProblemSheetNotExistException(BalderichException): ...
+class ProblemSheetPermissionDeniedException(BalderichException): ...
+
+class ContestNotExistException(BalderichException): ...
+class ContestPermissionDeniedException(BalderichException): ...
+
+class TeamNotExistException(BalderichException): ...
+class TeamPermissionDeniedException(BalderichException): ...
+class TeamNoMemberException(BalderichException): ...
+class TeamMethodPermissionDeniedException(BalderichException): ...
+class TeamProblemNotExistException(BalderichException): ...
+class TeamProblemPermissionDeniedException(BalderichException): ...
+class TeamContestNotExistException(BalderichException): ...
+class TeamContestPermissionDeniedException(BalderichException): ...
+
+
+class PartialResultException(BalderichException):
+    """
+    Raised when some chunks of a split request still failed after retrying.
+
+    ``results`` holds the merged results of the chunks that succeeded and
+    ``failed`` maps every item of the failed chunks to its exception.
+    """
+    def __init__(self, results: dict, failed: dict) -> None:
+        super().__init__(f'{len(failed)} items failed')
+        self.results = results
+        self.failed = failed
+
+
+class Error(NamedTuple):
+    """
+    The exception raised for an API code and whether a retry may succeed.
+    """
+    exception: Type[BalderichException]
+    retryable: bool
+
+
+ERRORS: Dict[int, Error] = {
+    AUTH_NONE: Error(AuthNoneException, False),
+    AUTH_NOT_EXIST: Error(AuthNotExistException, False),
+    AUTH_ERROR_SIGN: Error(AuthErrorSignException, False),
+    AUTH_TIMEOUT: Error(AuthTimeoutException, True),
+    AUTH_CALC_ERROR: Error(AuthCalcErrorException, False),
+    AUTH_REQUEST_FAST: Error(AuthRequestFastException, True),
+    REQUEST_PARAM_INVALID: Error(RequestPramInvaildException, False),
+
+    USER_NOT_EXIST: Error(UserNotExistException, False),
+    USER_CLOSE_FOLLOW: Error(UserCloseFollowException, False),
+    USER_IMAGE_NONE: Error(UserImageNoneException, False),
+    USER_IMAGE_FORMAT_ERROR: Error(UserImageFormatErrorException, False),
+    USER_IMAGE_OPEN_ERROR: Error(UserImageOpenErrorException, False),
+    USER_MEMORY_NOT_ENOUGH: Error(UserMemoryNotEnoughException, False),
+    USER_IMAGE_NOT_EXIST: Error(UserImageNotExistException, False),
+
+    PROBLEM_NOT_EXIST: Error(ProblemNotExistException, False),
+    PROBLEM_PEMISSION_DENIED: Error(ProblemPermissionDeniedException, False),
+    PROBLEM_SHEET_NOT_EXIST: Error(ProblemSheetNotExistException, False),
+    PROBLEM_SHEET_PEMISSION_DENIED: Error(ProblemSheetPermissionDeniedException, False),
+
+    CONTEST_NOT_EXIST: Error(ContestNotExistException, False),
+    CONTEST_PERMISSION_DENIED: Error(ContestPermissionDeniedException, False),
+
+    TEAM_NOT_EXIST: Error(TeamNotExistException, False),
+    TEAM_PERMISSION_DENIED: Error(TeamPermissionDeniedException, False),
+    TEAM_NO_MEMBER: Error(TeamNoMemberException, False),
+    TEAM_METHOD_PERMISSION_DENIED: Error(TeamMethodPermissionDeniedException, False),
+    TEAM_PROBLEM_NOT_EXIST: Error(TeamProblemNotExistException, False),
+    TEAM_PROBELM_PERMISSION_DENIED: Error(TeamProblemPermissionDeniedException, False),
+    TEAM_CONTEST_NOT_EXIST: Error(TeamContestNotExistException, False),
+    TEAM_CONTEST_PERMISSION_DENIED: Error(TeamContestPermissionDeniedException, False),
+}
+
+
+def get_exception(code: int, msg: str='') -> BalderichException:
+    error = ERRORS.get(code)
+    if error is None:
+        return BalderichException(msg or f'unknown error code {code}', code)
+
+    return error.exception(msg, code)
+
+
+def is_retryable(code: int) -> bool:
+    error = ERRORS.get(code)
+    return error is not None and error.retryable
@@ -0,0 +1,178 @@
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from balderich.utils import code as codes
+
+CODE_NAMES = {value: name for name, value in vars(codes).items() if name.isupper() and isinstance(value, int)}
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class EndpointMetrics:
+    """
+    Counters of one method and endpoint template.
+    """
+    __slots__ = ('count', 'seconds', 'buckets', 'bytes', 'codes', 'errors')
+
+    def __init__(self, buckets: int) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (buckets + 1)
+        self.bytes = 0
+        self.codes: Dict[Optional[int], int] = {}
+        self.errors: Dict[str, int] = {}
+
+
+def _label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsRegistry:
+    """
+    Request metrics per endpoint template
+
+    Every request the client sends, retries included, is counted under its
+    method and the template of ``balderich.utils.endpoint.ENDPOINTS`` it
+    matches (``None`` for unknown paths): the latency histogram, the bytes
+    received, the API codes of the responses and the transport errors.
+    Recording takes a lock and a few additions, so it can stay on.
+
+    Example:
+
+        >>> client = NSSClient(key, secret, metrics=True)
+        >>> client.metrics.snapshot()[('GET', 'user/{name}/info/')]['codes']
+        {10000: 12}
+        >>> print(client.metrics.prometheus())
+        >>> server = client.metrics.serve(9464)
+
+    ``buckets`` are the upper bounds of the latency histogram in seconds.
+    """
+    def __init__(self, buckets: Tuple[float, ...]=BUCKETS) -> None:
+        self.bounds = tuple(sorted(buckets))
+        self._endpoints: Dict[Tuple[str, Optional[str]], EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, method: str, endpoint: Optional[str]) -> EndpointMetrics:
+        metrics = self._endpoints.get((method, endpoint))
+        if metrics is None:
+            metrics = self._endpoints[(method, endpoint)] = EndpointMetrics(len(self.bounds))
+
+        return metrics
+
+    def observe(self, method: str, endpoint: Optional[str], seconds: float, size: int, code: Optional[int]) -> None:
+        """
+        Record a response, ``code`` is ``None`` for bodies without an API code.
+        """
+        bucket = bisect_left(self.bounds, seconds)
+        with self._lock:
+            metrics = self._get(method, endpoint)
+            metrics.count += 1
+            metrics.seconds += seconds
+            metrics.buckets[bucket] += 1
+            metrics.bytes += size
+            metrics.codes[code] = metrics.codes.get(code, 0) + 1
+
+    def observe_error(self, method: str, endpoint: Optional[str], seconds: float, error: BaseException) -> None:
+        """
+        Record a request which failed without a usable response.
+        """
+        bucket = bisect_left(self.bounds, seconds)
+        name = type(error).__name__
+        with self._lock:
+            metrics = self._get(method, endpoint)
+            metrics.count += 1
+            metrics.seconds += seconds
+            metrics.buckets[bucket] += 1
+            metrics.errors[name] = metrics.errors.get(name, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> Dict[Tuple[str, Optional[str]], dict]:
+        """
+        A copy of the counters per ``(method, template)``, ``buckets`` are cumulative
+        counts per upper bound with ``inf`` last.
+        """
+        with self._lock:
+            snapshot = {}
+            for key, metrics in self._endpoints.items():
+                total, buckets = 0, {}
+                for bound, count in zip(self.bounds + (float('inf'),), metrics.buckets):
+                    total += count
+                    buckets[bound] = total
+                snapshot[key] = {
+                    'count': metrics.count,
+                    'seconds': metrics.seconds,
+                    'buckets': buckets,
+                    'bytes': metrics.bytes,
+                    'codes': dict(metrics.codes),
+                    'errors': dict(metrics.errors)
+                }
+
+            return snapshot
+
+    def prometheus(self) -> str:
+        """
+        The metrics in the Prometheus text exposition format.
+        """
+        requests: List[str] = []
+        durations: List[str] = []
+        received: List[str] = []
+        errors: List[str] = []
+
+        for (method, endpoint), metrics in sorted(self.snapshot().items(), key=lambda item: (item[0][0], item[0][1] or '')):
+            labels = f'method="{_label(method)}",endpoint="{_label(endpoint or "")}"'
+            for code, count in sorted(metrics['codes'].items(), key=lambda item: item[0] or 0):
+                name = CODE_NAMES.get(code, '') if code is not None else ''
+                requests.append(f'balderich_requests_total{{{labels},code="{code or ""}",name="{name}"}} {count}')
+            for bound, count in metrics['buckets'].items():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                durations.append(f'balderich_request_duration_seconds_bucket{{{labels},le="{le}"}} {count}')
+            durations.append(f'balderich_request_duration_seconds_sum{{{labels}}} {metrics["seconds"]}')
+            durations.append(f'balderich_request_duration_seconds_count{{{labels}}} {metrics["count"]}')
+            received.append(f'balderich_response_bytes_total{{{labels}}} {metrics["bytes"]}')
+            for error, count in sorted(metrics['errors'].items()):
+                errors.append(f'balderich_request_errors_total{{{labels},error="{_label(error)}"}} {count}')
+
+        lines = [
+            '# HELP balderich_requests_total Responses per endpoint and API code.',
+            '# TYPE balderich_requests_total counter',
+            *requests,
+            '# HELP balderich_request_duration_seconds Request latency per endpoint.',
+            '# TYPE balderich_request_duration_seconds histogram',
+            *durations,
+            '# HELP balderich_response_bytes_total Response body bytes received per endpoint.',
+            '# TYPE balderich_response_bytes_total counter',
+            *received,
+            '# HELP balderich_request_errors_total Requests failed without a response per endpoint and error.',
+            '# TYPE balderich_request_errors_total counter',
+            *errors
+        ]
+
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port: int=9464, host: str='127.0.0.1') -> ThreadingHTTPServer:
+        """
+        Serve ``prometheus()`` over HTTP from a background thread, stop it with ``shutdown()``.
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        return server
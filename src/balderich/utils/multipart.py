@@ -0,0 +1,144 @@
+import os
+import time
+import uuid
+from typing import IO, Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+
+class UploadProgress(NamedTuple):
+    """
+    Bytes of the request body sent so far, its total size (``None`` when
+    unknown) and the seconds since the first read.
+    """
+    sent: int
+    total: Optional[int]
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+        """
+        Bytes sent per second.
+        """
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+
+class MultipartEncoder:
+    """
+    A multipart/form-data body read from the file objects as it is sent
+
+    ``files`` maps field names to ``(filename, content)`` where content is a
+    file object or bytes. Files are read chunk by chunk while the request is
+    sent instead of being loaded into memory first. ``callback`` is called with an ``UploadProgress`` after every read.
+
+    Example:
+
+        >>> encoder = MultipartEncoder(files={'image': ('a.png', open('a.png', 'rb'))})
+        >>> requests.post(url, data=encoder, headers={'Content-Type': encoder.content_type})
+    """
+    def __init__(self,
+        fields: Dict[str, str]=None,
+        files: Dict[str, Tuple[str, Union[bytes, IO]]]=None,
+        callback: Callable[[UploadProgress], None]=None
+    ) -> None:
+        self.boundary = uuid.uuid4().hex
+        self.callback = callback
+
+        self._parts = []
+        for name, value in (fields or {}).items():
+            for item in (value if isinstance(value, (list, tuple)) else [value]):
+                self._parts.append(self._header(name) + f'\r\n{item}\r\n'.encode())
+        for name, (filename, content) in (files or {}).items():
+            if isinstance(content, str):
+                content = content.encode()
+            elif not hasattr(content, 'read'):
+                content = bytes(content)
+
+            self._parts.append(self._header(name, filename) + b'\r\n')
+            self._parts.append(content)
+            self._parts.append(b'\r\n')
+        self._parts.append(f'--{self.boundary}--\r\n'.encode())
+
+        self._starts = {}
+        for part in self._parts:
+            if not isinstance(part, bytes):
+                try:
+                    self._starts[id(part)] = part.tell()
+                except (AttributeError, OSError):
+                    pass
+        self.len = self._length()
+        self.reset()
+
+    def _header(self, name: str, filename: str=None) -> bytes:
+        header = f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"'
+        if filename is not None:
+            header += f'; filename="{filename}"\r\nContent-Type: application/octet-stream'
+
+        return (header + '\r\n').encode()
+
+    def _length(self) -> Optional[int]:
+        length = 0
+        for part in self._parts:
+            if isinstance(part, bytes):
+                length += len(part)
+                continue
+
+            start = self._starts.get(id(part))
+            if start is None:
+                return None
+
+            try:
+                size = os.fstat(part.fileno()).st_size
+            except (AttributeError, OSError, ValueError):
+                try:
+                    size = part.seek(0, os.SEEK_END)
+                    part.seek(start)
+                except (AttributeError, OSError):
+                    return None
+
+            length += size - start
+
+        return length
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def reset(self) -> None:
+        """
+        Rewind to the start of the body so that it can be sent again.
+        """
+        for part in self._parts:
+            if id(part) in self._starts:
+                part.seek(self._starts[id(part)])
+
+        self._index = 0
+        self._offset = 0
+        self._sent = 0
+        self._started = None
+
+    def read(self, size: int=-1) -> bytes:
+        if self._started is None:
+            self._started = time.perf_counter()
+
+        out = bytearray()
+        while (size is None or size < 0 or len(out) < size) and self._index < len(self._parts):
+            part = self._parts[self._index]
+            want = -1 if size is None or size < 0 else size - len(out)
+
+            if isinstance(part, bytes):
+                chunk = part[self._offset:] if want < 0 else part[self._offset:self._offset + want]
+                self._offset += len(chunk)
+                if self._offset >= len(part):
+                    self._index, self._offset = self._index + 1, 0
+            else:
+                chunk = part.read(want if want > 0 else 65536)
+                if not chunk:
+                    self._index += 1
+                    continue
+
+            out += chunk
+
+        self._sent += len(out)
+        if self.callback is not None and out:
+            self.callback(UploadProgress(self._sent, self.len, time.perf_counter() - self._started))
+
+        return bytes(out)
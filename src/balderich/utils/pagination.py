@@ -0,0 +1,96 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Tuple
+
+
+def _page_items(data: Any, key: str) -> Tuple[List[Any], Optional[int]]:
+    # most list endpoints return {key: [...], total: n} or its typed record,
+    # a few only the list
+    if data is None or isinstance(data, list):
+        return data or [], None
+
+    return data.get(key) or [], data.get('total')
+
+
+def _has_next(items: List[Any], seen: int, total: Optional[int], size: Optional[int]) -> bool:
+    if not items:
+        return False
+    if total is not None:
+        return seen < total
+
+    return size is None or len(items) >= size
+
+
+def iter_pages(fetch: Callable[[int], Any], key: Optional[str], size: int=None, prefetch: bool=True) -> Iterator[Any]:
+    """
+    Yield the items of every page returned by ``fetch(page)``, starting at page 1.
+
+    Iteration stops once ``total`` items were yielded or a page comes back
+    short. With ``prefetch`` the next page is requested in a background thread
+    while the items of the current one are consumed.
+    """
+    if not prefetch:
+        page, seen = 1, 0
+        while True:
+            items, total = _page_items(fetch(page), key)
+            seen += len(items)
+            yield from items
+
+            if not _has_next(items, seen, total, size):
+                return
+            page += 1
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    future = None
+    try:
+        page, seen = 1, 0
+        future = pool.submit(contextvars.copy_context().run, fetch, page)
+        while True:
+            items, total = _page_items(future.result(), key)
+            seen += len(items)
+
+            more = _has_next(items, seen, total, size)
+            if more:
+                future = pool.submit(contextvars.copy_context().run, fetch, page + 1)
+
+            yield from items
+
+            if not more:
+                return
+            page += 1
+    finally:
+        # a prefetched page which did not start yet is dropped when the consumer stops
+        if future is not None:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
+async def aiter_pages(fetch: Callable[[int], Awaitable[Any]], key: Optional[str], size: int=None, prefetch: bool=True) -> AsyncIterator[Any]:
+    """
+    Asynchronous version of ``iter_pages``, the next page is fetched in a task.
+    """
+    page, seen = 1, 0
+    task = asyncio.ensure_future(fetch(page))
+    try:
+        while True:
+            items, total = _page_items(await task, key)
+            seen += len(items)
+
+            more = _has_next(items, seen, total, size)
+            if more:
+                task = fetch(page + 1)
+                if prefetch:
+                    task = asyncio.ensure_future(task)
+
+            for item in items:
+                yield item
+
+            if not more:
+                return
+            page += 1
+    finally:
+        if isinstance(task, asyncio.Future):
+            task.cancel()
+        elif asyncio.iscoroutine(task):
+            task.close()
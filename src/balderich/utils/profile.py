@@ -0,0 +1,157 @@
+import time
+import random
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+_current = ContextVar('balderich_profile', default=None)
+
+PHASES = ('sign', 'connect', 'ttfb', 'download', 'decode', 'check')
+
+
+class RequestProfile:
+    """
+    Seconds spent in each phase of one API call
+
+    ``sign`` is the time spent in ``AuthConfig.sign``, ``connect`` in opening
+    connections (TCP and TLS), ``ttfb`` from sending the request to the
+    response headers, ``download`` reading the body, ``decode`` decoding it
+    and ``check`` turning the API code into a result or exception. Retried
+    calls add up the phases of every attempt, ``attempts`` counts them.
+    ``total`` is the wall time of the whole call.
+    """
+    __slots__ = ('method', 'path', 'start', 'total', 'attempts', 'cached', 'code') + PHASES
+
+    def __init__(self, method: str, path: str) -> None:
+        self.method = method
+        self.path = path
+        self.start = time.time()
+        self.total = 0.0
+        self.attempts = 0
+        self.cached = False
+        self.code = None
+        for phase in PHASES:
+            setattr(self, phase, 0.0)
+
+    def __repr__(self) -> str:
+        phases = ', '.join(f'{phase}={getattr(self, phase) * 1000:.2f}ms' for phase in PHASES)
+        return f'RequestProfile({self.method} {self.path}, {phases}, total={self.total * 1000:.2f}ms)'
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Profiler:
+    """
+    Records the phase breakdown of a sample of the API calls
+
+    A ``sample`` share of the calls (``0.01`` for 1%) is profiled and each
+    ``RequestProfile`` is passed to ``callback`` once the call finished, the
+    others are not measured at all.
+
+    Example:
+
+        >>> client = NSSClient(key, secret, profiler=Profiler(print, sample=0.01))
+
+    ``tracing_callback`` turns the profiles into OpenTelemetry spans.
+    """
+    def __init__(self, callback: Callable[[RequestProfile], None], sample: float=1.0) -> None:
+        self.callback = callback
+        self.sample = sample
+
+    def start(self, method: str, path: str) -> Optional[RequestProfile]:
+        if self.sample < 1.0 and random.random() >= self.sample:
+            return None
+
+        return RequestProfile(method, path)
+
+    def finish(self, profile: RequestProfile, started: float) -> None:
+        profile.total = time.perf_counter() - started
+        self.callback(profile)
+
+
+def current() -> Optional[RequestProfile]:
+    """
+    The profile of the API call running in this context, if it is sampled.
+    """
+    return _current.get()
+
+
+def tracing_callback(tracer: Any=None) -> Callable[[RequestProfile], None]:
+    """
+    A ``Profiler`` callback recording every profile as an OpenTelemetry span
+    with one attribute per phase.
+    """
+    if tracer is None:
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError('tracing_callback requires opentelemetry-api, install it with `pip install opentelemetry-api`')
+        tracer = trace.get_tracer('balderich')
+
+    def callback(profile: RequestProfile) -> None:
+        start = int(profile.start * 1e9)
+        span = tracer.start_span(f'balderich {profile.method} {profile.path}', start_time=start)
+        for name, value in profile.as_dict().items():
+            if value is not None:
+                span.set_attribute(f'balderich.{name}', value)
+        span.end(end_time=start + int(profile.total * 1e9))
+
+    return callback
+
+
+class _ProfiledConnection(HTTPConnection):
+    def connect(self) -> None:
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            profile = _current.get()
+            if profile is not None:
+                profile.connect += time.perf_counter() - start
+
+
+class _ProfiledHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            profile = _current.get()
+            if profile is not None:
+                profile.connect += time.perf_counter() - start
+
+
+class _ProfiledPool(HTTPConnectionPool):
+    ConnectionCls = _ProfiledConnection
+
+
+class _ProfiledHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _ProfiledHTTPSConnection
+
+
+# the pool classes an HTTPAdapter has to use for the connect phase to be measured
+POOL_CLASSES = {'http': _ProfiledPool, 'https': _ProfiledHTTPSPool}
+
+
+def trace_config() -> Any:
+    """
+    An ``aiohttp.TraceConfig`` timing the connect phase of the profiled calls.
+    """
+    import aiohttp
+
+    async def on_start(session, context, params):
+        context.connect_start = time.perf_counter()
+
+    async def on_end(session, context, params):
+        profile = _current.get()
+        if profile is not None:
+            profile.connect += time.perf_counter() - context.connect_start
+
+    config = aiohttp.TraceConfig()
+    config.on_connection_create_start.append(on_start)
+    config.on_connection_create_end.append(on_end)
+
+    return config
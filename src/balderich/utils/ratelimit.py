@@ -0,0 +1,94 @@
+import time
+import asyncio
+import threading
+
+
+class RateLimiter:
+    """
+    Token bucket limiting the request rate, adapted to the server (AIMD)
+
+    Every successful response raises the rate by about ``increase`` requests
+    per second each second, an ``AUTH_REQUEST_FAST`` response multiplies it by
+    ``decrease`` (at most once per ``cooldown`` seconds) and the request is
+    queued again instead of failing.
+
+    Example:
+
+        >>> client = NSSClient(key, secret, rate_limit=RateLimiter(rate=5))
+        >>> client.rate_limiter.rate, client.rate_limiter.queue_depth
+    """
+    def __init__(self,
+        rate: float=10.0,
+        burst: float=10.0,
+        min_rate: float=0.5,
+        max_rate: float=None,
+        increase: float=1.0,
+        decrease: float=0.5,
+        cooldown: float=1.0
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+
+        self.queue_depth = 0
+        self.throttled = 0
+
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._decreased = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0.0
+
+            self.queue_depth += 1
+            return -self._tokens / self.rate
+
+    def _release(self) -> None:
+        with self._lock:
+            self.queue_depth -= 1
+
+    def acquire(self) -> None:
+        """
+        Block until a request may be sent.
+        """
+        wait = self._reserve()
+        if wait:
+            try:
+                time.sleep(wait)
+            finally:
+                self._release()
+
+    async def acquire_async(self) -> None:
+        wait = self._reserve()
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._release()
+
+    def on_success(self) -> None:
+        with self._lock:
+            rate = self.rate + self.increase / self.rate
+            self.rate = rate if self.max_rate is None else min(self.max_rate, rate)
+
+    def on_throttled(self) -> None:
+        with self._lock:
+            self.throttled += 1
+
+            now = time.monotonic()
+            if now - self._decreased >= self.cooldown:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self._decreased = now
+            self._tokens = min(self._tokens, 0.0)
@@ -0,0 +1,55 @@
+import random
+import threading
+from typing import Optional
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, limited by a retry budget
+
+    A request is sent at most ``attempts`` times, the n-th retry waits a random
+    time between 0 and ``min(max_backoff, backoff * 2 ** n)`` seconds. Every
+    request adds ``budget_ratio`` to the budget (capped at ``budget_reserve``)
+    and every retry spends one from it, so when the server is down retries
+    stay a bounded share of the traffic instead of multiplying it.
+
+    Example:
+
+        >>> client = NSSClient(key, secret, retry=RetryPolicy(attempts=5))
+    """
+    def __init__(self,
+        attempts: int=3,
+        backoff: float=0.5,
+        max_backoff: float=8.0,
+        budget_ratio: float=0.2,
+        budget_reserve: float=10.0
+    ) -> None:
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget_ratio = budget_ratio
+        self.budget_reserve = budget_reserve
+        self.retries = 0
+
+        self._budget = budget_reserve
+        self._lock = threading.Lock()
+
+    def on_request(self) -> None:
+        with self._lock:
+            self._budget = min(self.budget_reserve, self._budget + self.budget_ratio)
+
+    def delay(self, attempt: int) -> Optional[float]:
+        """
+        Seconds to wait before retrying after the given failed attempt
+        (counted from 0), ``None`` if the request must not be retried.
+        """
+        if attempt + 1 >= self.attempts:
+            return None
+
+        with self._lock:
+            if self._budget < 1:
+                return None
+            self._budget -= 1
+            self.retries += 1
+
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
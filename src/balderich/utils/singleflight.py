@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one
+
+    While a call for a key is running, callers of the same key wait for it
+    and get its result or exception instead of running their own. ``saved``
+    counts the calls that were coalesced. Threads and asyncio tasks are
+    tracked separately, with ``do`` and ``do_async``.
+
+    Example:
+
+        >>> flight = SingleFlight()
+        >>> flight.do('user/1/info/', lambda: requests.get(url))
+    """
+    def __init__(self) -> None:
+        self.saved = 0
+
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._calls) + len(self._tasks)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.saved += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # futures belong to one event loop, the key includes it
+        loop = asyncio.get_running_loop()
+        key = (id(loop), key)
+
+        future = self._tasks.get(key)
+        while future is not None:
+            self.saved += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # the leading task was cancelled, not this one
+                if not future.cancelled():
+                    raise
+            self.saved -= 1
+            future = self._tasks.get(key)
+
+        future = self._tasks[key] = loop.create_future()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # retrieved here so that a flight without followers does not log it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._tasks[key]
@@ -0,0 +1,17 @@
+import pytest
+
+from balderich import NSSClient
+from balderich.mock import MockServer
+from balderich.utils.retry import RetryPolicy
+
+
+@pytest.fixture
+def mock():
+    with MockServer(total=50) as server:
+        yield server
+
+
+@pytest.fixture
+def client(mock):
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url, retry=RetryPolicy(backoff=0.0)) as client:
+        yield client
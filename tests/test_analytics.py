@@ -0,0 +1,39 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from balderich.analytics import DAY, SolveTimelines
+
+
+def timelines():
+    return SolveTimelines({
+        1: [{'name': 'WEB', 'type': 1, 'data': [0, 10, DAY, 3 * DAY]}],
+        2: [{'name': 'PWN', 'type': 2, 'data': [2 * DAY]}]
+    })
+
+
+def test_histogram():
+    edges, counts = timelines().histogram('day')
+
+    assert edges.tolist() == [0, DAY, 2 * DAY, 3 * DAY, 4 * DAY]
+    assert counts.tolist() == [[2, 1, 0, 1], [0, 0, 1, 0]]
+
+
+def test_rolling():
+    _, total = timelines().rolling(2)
+
+    assert total.tolist() == [[2, 3, 1, 1], [0, 0, 1, 1]]
+
+
+@pytest.mark.parametrize('window', [0, -1])
+def test_rolling_rejects_empty_windows(window):
+    with pytest.raises(ValueError):
+        timelines().rolling(window)
+
+
+def test_fetch(client):
+    uids = [1, 2, 3]
+    result = SolveTimelines.fetch(client, uids)
+
+    assert result.uids.tolist() == uids
+    assert result.totals().sum() == sum(len(category['data']) for uid in uids for category in client.user.get_user_statistics_solves(uid))
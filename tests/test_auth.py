@@ -0,0 +1,81 @@
+import time
+import asyncio
+import hashlib
+
+import pytest
+
+from balderich import AsyncNSSClient, NSSClient
+from balderich.client import AuthConfig
+from balderich.utils.code import AUTH_ERROR_SIGN, AUTH_TIMEOUT
+from balderich.utils.exceptions import AuthErrorSignException
+
+
+def options(mock, **kwargs):
+    # without retries only the clock correction sends a request again
+    return dict(key=mock.key, secret=mock.secret, url=mock.url, retry=False, **kwargs)
+
+
+def test_sign_is_remembered_for_the_second():
+    config = AuthConfig('key', 'secret')
+
+    sign, timestamp = config.sign('user/1/info/', 100)
+    assert timestamp == 100
+    assert sign == hashlib.sha256(b'/v2/api/user/1/info/#key#100#secret').hexdigest()
+    assert config.sign('user/2/info/', 100)[0] != sign
+    assert config.sign('user/1/info/', 100, prefix='/v1/api/')[0] != sign
+    assert config._signs == (100, {
+        '/v2/api/user/1/info/': sign,
+        '/v2/api/user/2/info/': config.sign('user/2/info/', 100)[0],
+        '/v1/api/user/1/info/': config.sign('user/1/info/', 100, prefix='/v1/api/')[0]
+    })
+
+    # a new second starts over
+    assert config.sign('user/1/info/', 101)[0] != sign
+    assert list(config._signs[1]) == ['/v2/api/user/1/info/']
+
+
+def test_sign_follows_the_offset():
+    config = AuthConfig('key', 'secret')
+    assert config.update_offset(time.time() + 300) is True
+    assert config.update_offset(time.time() + 300.5) is False
+
+    _, timestamp = config.sign('user/1/info/')
+    assert abs(timestamp - (time.time() + 300)) <= 2
+
+
+def test_skewed_clock_is_corrected(mock):
+    with NSSClient(**options(mock)) as client:
+        # the local clock is five minutes ahead of the server
+        client.auth_config.offset = -300.0
+
+        assert client.user.get_user_info(1)['uid'] == 1
+        assert abs(client.auth_config.offset) <= 2
+
+    assert mock.counts == {AUTH_TIMEOUT: 1, 10000: 1}
+
+
+def test_rejected_sign_is_sent_again_once_the_offset_changed(mock):
+    with NSSClient(**options(mock)) as client:
+        client.auth_config.offset = 5.0
+        mock.fail(AUTH_ERROR_SIGN)
+        assert client.user.get_user_info(1)['uid'] == 1
+
+        # the offset is right, the rejection is not about the clock
+        mock.fail(AUTH_ERROR_SIGN)
+        with pytest.raises(AuthErrorSignException):
+            client.user.get_user_info(2)
+
+    assert mock.counts == {AUTH_ERROR_SIGN: 2, 10000: 1}
+
+
+def test_async_skewed_clock_is_corrected(mock):
+    async def main():
+        async with AsyncNSSClient(**options(mock)) as client:
+            client.auth_config.offset = -300.0
+            return client, await client.user.get_user_info(1)
+
+    client, data = asyncio.run(main())
+
+    assert data['uid'] == 1
+    assert abs(client.auth_config.offset) <= 2
+    assert mock.counts == {AUTH_TIMEOUT: 1, 10000: 1}
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from balderich import AsyncNSSClient
+from balderich.utils.bulk import fan_out, sum_merge
+from balderich.utils.code import TEAM_METHOD_PERMISSION_DENIED
+from balderich.utils.exceptions import (
+    PartialResultException, TeamMethodPermissionDeniedException, UserNotExistException
+)
+
+
+def test_single_chunk_raises_the_api_exception(client, mock):
+    mock.fail(TEAM_METHOD_PERMISSION_DENIED, path='team/statistics/day/')
+
+    with pytest.raises(TeamMethodPermissionDeniedException):
+        client.team.get_team_statistics_day([1, 2, 3])
+
+
+def test_same_api_error_in_every_chunk_raises_it(client, mock):
+    mock.fail(TEAM_METHOD_PERMISSION_DENIED, times=3, path='team/analysis/solves/curve/')
+
+    with pytest.raises(TeamMethodPermissionDeniedException):
+        client.team.post_team_analysis_solves_curve(list(range(1, 31)), chunk_size=10)
+
+
+def test_failed_chunk_among_others_is_a_partial_result(client, mock):
+    mock.fail(TEAM_METHOD_PERMISSION_DENIED, path='team/analysis/solves/curve/')
+
+    with pytest.raises(PartialResultException) as info:
+        client.team.post_team_analysis_solves_curve(list(range(1, 31)), chunk_size=10)
+
+    assert len(info.value.failed) == 10
+    assert len(info.value.results) == 20
+    assert set(info.value.results) | {str(uid) for uid in info.value.failed} == {str(uid) for uid in range(1, 31)}
+
+
+def test_statistics_day_adds_up_the_chunks(client):
+    uids = list(range(1, 41))
+    whole = client.team.get_team_statistics_day(uids, chunk_size=100)
+    chunked = client.team.get_team_statistics_day(uids, chunk_size=7)
+
+    assert chunked == whole
+
+
+def test_transient_failure_is_resent():
+    calls = []
+
+    def fetch(chunk):
+        calls.append(chunk)
+        if len(calls) == 1:
+            raise ConnectionError()
+        return {item: item for item in chunk}
+
+    assert fan_out(fetch, range(4), chunk_size=10) == {0: 0, 1: 1, 2: 2, 3: 3}
+    assert sorted(calls[1:]) == [[0, 1], [2, 3]]
+
+
+def test_different_errors_without_results_are_a_partial_result():
+    def fetch(chunk):
+        raise UserNotExistException(code=chunk[0]) if chunk[0] else ConnectionError()
+
+    with pytest.raises(PartialResultException) as info:
+        fan_out(fetch, range(4), chunk_size=2, attempts=0)
+
+    assert info.value.results == {}
+    assert set(info.value.failed) == {0, 1, 2, 3}
+
+
+def test_sum_merge():
+    results = {}
+    sum_merge(results, {'1': {'count': 1, 'score': 10}})
+    sum_merge(results, {'1': {'count': 2, 'score': 5}, '2': {'count': 1}})
+
+    assert results == {'1': {'count': 3, 'score': 15}, '2': {'count': 1}}
+
+
+def test_async_single_chunk_raises_the_api_exception(mock):
+    async def main():
+        async with AsyncNSSClient(key=mock.key, secret=mock.secret, url=mock.url) as client:
+            mock.fail(TEAM_METHOD_PERMISSION_DENIED, path='team/statistics/day/')
+            with pytest.raises(TeamMethodPermissionDeniedException):
+                await client.team.get_team_statistics_day([1, 2, 3])
+
+            whole = await client.team.get_team_statistics_day(list(range(1, 41)))
+            assert await client.team.get_team_statistics_day(list(range(1, 41)), chunk_size=7) == whole
+
+    asyncio.run(main())
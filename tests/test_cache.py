@@ -0,0 +1,53 @@
+import time
+
+import pytest
+
+from balderich import NSSClient
+from balderich.utils.cache import BaseCache, SQLiteCache, TTLCache
+
+
+def test_base_cache_is_abstract():
+    class Incomplete(BaseCache):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        BaseCache()
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_ttl_cache_expires_and_evicts():
+    cache = TTLCache(maxsize=2)
+    cache.set('a', b'1', 60)
+    cache.set('b', b'2', 0.01)
+    time.sleep(0.02)
+
+    assert cache.get('a') == b'1'
+    assert cache.get('b') is None
+
+    cache.set('c', b'3', 60)
+    cache.set('d', b'4', 60)
+    assert cache.get('a') is None
+    assert cache.stats()['entries'] == 2
+
+
+def test_sqlite_cache(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = SQLiteCache(path, maxsize=10)
+    cache.set('a', b'1', 60)
+
+    assert SQLiteCache(path).get('a') == b'1'
+    assert cache.get('missing') is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_client_cache_and_no_cache(mock):
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url, cache=True) as client:
+        first = client.user.get_user_info(1)
+        assert client.user.get_user_info(1) == first
+        assert mock.counts[10000] == 1
+
+        with client.no_cache():
+            client.user.get_user_info(1)
+        assert mock.counts[10000] == 2
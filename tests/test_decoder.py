@@ -0,0 +1,59 @@
+import pytest
+
+from balderich import NSSClient
+from balderich.models import typed
+from balderich.utils.decoder import DECODERS, Decoder, MsgspecDecoder, get_decoder
+
+
+def installed():
+    for name, cls in DECODERS.items():
+        try:
+            cls()
+        except ImportError:
+            continue
+        yield name
+
+
+@pytest.mark.parametrize('decoder', list(installed()))
+def test_typed_results_are_records_with_every_decoder(mock, decoder):
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url, typed=True, decoder=decoder) as client:
+        user = client.user.get_user_info(3)
+        page = client.problem.get_problem_list_by_page(1, 10)
+
+        assert isinstance(user, typed.User)
+        assert isinstance(page, typed.ProblemPage)
+        # nested fields stay raw until they are read
+        assert isinstance(page._problems, list)
+        assert isinstance(page.problems, tuple)
+        assert isinstance(page.problems[0], typed.ProblemItem)
+        assert isinstance(page.problems[0].author, typed.Author)
+
+        with client.untyped():
+            assert isinstance(client.user.get_user_info(3), dict)
+
+        assert client.decoder.stats()['user/{name}/info/']['count'] == 2
+
+
+def test_default_decoder_does_not_change_the_results(mock):
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url, typed=True) as default, \
+            NSSClient(key=mock.key, secret=mock.secret, url=mock.url, typed=True, decoder='json') as plain:
+        assert type(default.user.get_user_info(3)) is type(plain.user.get_user_info(3)) is typed.User
+        assert default.user.get_user_info(3).to_dict() == plain.user.get_user_info(3).to_dict()
+
+
+def test_msgspec_structs_are_opt_in(mock):
+    pytest.importorskip('msgspec')
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url, typed=True, decoder=MsgspecDecoder(structs=True)) as client:
+        page = client.problem.get_problem_list_by_page(1, 10)
+
+        assert not isinstance(page, typed.ProblemPage)
+        assert page['total'] == page.total
+        assert page.problems[0].author['uid'] == page.to_dict()['problems'][0]['author']['uid']
+
+
+def test_get_decoder():
+    decoder = Decoder()
+
+    assert get_decoder(decoder) is decoder
+    assert get_decoder('json').name == 'json'
+    assert get_decoder().name in DECODERS
@@ -0,0 +1,80 @@
+import pytest
+
+from balderich.index import ProblemIndex
+from balderich.mirror import ProblemMirror
+
+
+def problem(pid, tags=(), author=1, level=1.0, point=100):
+    return {'id': pid, 'title': f'problem {pid}', 'tags': list(tags), 'author': {'uid': author}, 'level': level, 'point': point}
+
+
+@pytest.fixture
+def index():
+    index = ProblemIndex()
+    index.add(problem(1, ['WEB', 'SQL'], author=1, level=1.0, point=100))
+    index.add(problem(2, ['WEB'], author=2, level=2.5, point=200))
+    index.add(problem(3, ['PWN'], author=1, level=4.0, point=300))
+    index.add(problem(4, ['WEB', 'XSS'], author=1, level=3.0, point=500))
+    index.add_sheet({'id': 9}, [{'id': 2}, {'id': 3}, {'id': 4}])
+    return index
+
+
+def pids(problems):
+    return [problem['id'] for problem in problems]
+
+
+def test_single_conditions(index):
+    assert pids(index.query()) == [1, 2, 3, 4]
+    assert pids(index.query(tags=['WEB'])) == [1, 2, 4]
+    assert pids(index.query(tags=['WEB', 'SQL'])) == [1]
+    assert pids(index.query(tags=['MISC'])) == []
+    assert pids(index.query(author=1)) == [1, 3, 4]
+    assert pids(index.query(sheet=9)) == [2, 3, 4]
+    assert pids(index.query(sheet=8)) == []
+
+
+def test_ranges_are_inclusive_and_open_ended(index):
+    assert pids(index.query(level=(2.5, 4.0))) == [2, 3, 4]
+    assert pids(index.query(level=(None, 2.5))) == [1, 2]
+    assert pids(index.query(point=(300, None))) == [3, 4]
+    assert pids(index.query(level=(1, 3), point=(200, 500))) == [2, 4]
+
+
+def test_combined_conditions(index):
+    assert pids(index.query(tags=['WEB'], author=1)) == [1, 4]
+    assert pids(index.query(tags=['WEB'], level=(2, None))) == [2, 4]
+    assert pids(index.query(author=1, sheet=9, point=(None, 300))) == [3]
+    assert pids(index.query(tags=['WEB'], sheet=9, level=(0, 2.9), point=(0, 1000))) == [2]
+
+
+def test_sheets_may_list_problems_which_are_not_indexed(index):
+    index.add_sheet({'id': 10}, [{'id': 1}, {'id': 99}])
+
+    assert pids(index.query(sheet=10)) == [1]
+    assert pids(index.query(sheet=10, level=(0, 5))) == [1]
+    assert pids(index.query(sheet=10, tags=['WEB'])) == [1]
+
+
+def test_replacing_and_removing_problems(index):
+    index.add(problem(2, ['PWN'], author=3, level=5.0, point=50))
+
+    assert pids(index.query(tags=['WEB'])) == [1, 4]
+    assert pids(index.query(author=3, level=(5, 5))) == [2]
+    assert pids(index.query(point=(None, 50))) == [2]
+
+    index.remove(2)
+    index.remove_sheet(9)
+    assert pids(index.query(tags=['PWN'])) == [3]
+    assert pids(index.query(point=(None, 100))) == [1]
+    assert pids(index.query(sheet=9)) == []
+
+
+def test_index_follows_the_mirror():
+    mirror = ProblemMirror()
+    mirror.update(1, problem(1, ['WEB']), 'a')
+    index = ProblemIndex.from_mirror(mirror)
+
+    mirror.update(2, problem(2, ['WEB']), 'b')
+    mirror.remove(1)
+
+    assert pids(index.query(tags=['WEB'])) == [2]
@@ -0,0 +1,95 @@
+import urllib.request
+
+from balderich import NSSClient
+from balderich.utils.code import AUTH_REQUEST_FAST, SUCCESS
+from balderich.utils.metrics import MetricsRegistry
+
+
+def test_histogram_counts_cumulative_buckets():
+    registry = MetricsRegistry(buckets=(1.0, 0.1))
+    for seconds in (0.05, 0.1, 0.5, 3.0):
+        registry.observe('GET', 'user/{name}/info/', seconds, 10, SUCCESS)
+
+    metrics = registry.snapshot()[('GET', 'user/{name}/info/')]
+    # bounds are sorted and inclusive
+    assert metrics['buckets'] == {0.1: 2, 1.0: 3, float('inf'): 4}
+    assert metrics['count'] == 4
+    assert metrics['seconds'] == 0.05 + 0.1 + 0.5 + 3.0
+    assert metrics['bytes'] == 40
+
+
+def test_codes_and_errors_are_counted_per_endpoint():
+    registry = MetricsRegistry()
+    registry.observe('GET', 'user/{name}/info/', 0.01, 5, SUCCESS)
+    registry.observe('GET', 'user/{name}/info/', 0.01, 5, SUCCESS)
+    registry.observe('GET', 'user/{name}/info/', 0.01, 5, AUTH_REQUEST_FAST)
+    registry.observe('POST', 'user/picturebed/{pid}/download/', 0.01, 100, None)
+    registry.observe_error('GET', None, 0.01, ConnectionError())
+
+    snapshot = registry.snapshot()
+    assert snapshot[('GET', 'user/{name}/info/')]['codes'] == {SUCCESS: 2, AUTH_REQUEST_FAST: 1}
+    assert snapshot[('POST', 'user/picturebed/{pid}/download/')]['codes'] == {None: 1}
+    assert snapshot[('GET', None)]['errors'] == {'ConnectionError': 1}
+    assert snapshot[('GET', None)]['count'] == 1
+
+    registry.clear()
+    assert registry.snapshot() == {}
+
+
+def test_prometheus_exposition():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.observe('GET', 'user/{name}/info/', 0.5, 20, SUCCESS)
+    registry.observe('GET', 'user/{name}/info/', 0.5, 20, AUTH_REQUEST_FAST)
+    registry.observe_error('GET', None, 2.0, ConnectionError())
+
+    assert registry.prometheus().splitlines() == [
+        '# HELP balderich_requests_total Responses per endpoint and API code.',
+        '# TYPE balderich_requests_total counter',
+        'balderich_requests_total{method="GET",endpoint="user/{name}/info/",code="10000",name="SUCCESS"} 1',
+        'balderich_requests_total{method="GET",endpoint="user/{name}/info/",code="10006",name="AUTH_REQUEST_FAST"} 1',
+        '# HELP balderich_request_duration_seconds Request latency per endpoint.',
+        '# TYPE balderich_request_duration_seconds histogram',
+        'balderich_request_duration_seconds_bucket{method="GET",endpoint="",le="0.1"} 0',
+        'balderich_request_duration_seconds_bucket{method="GET",endpoint="",le="1.0"} 0',
+        'balderich_request_duration_seconds_bucket{method="GET",endpoint="",le="+Inf"} 1',
+        'balderich_request_duration_seconds_sum{method="GET",endpoint=""} 2.0',
+        'balderich_request_duration_seconds_count{method="GET",endpoint=""} 1',
+        'balderich_request_duration_seconds_bucket{method="GET",endpoint="user/{name}/info/",le="0.1"} 0',
+        'balderich_request_duration_seconds_bucket{method="GET",endpoint="user/{name}/info/",le="1.0"} 2',
+        'balderich_request_duration_seconds_bucket{method="GET",endpoint="user/{name}/info/",le="+Inf"} 2',
+        'balderich_request_duration_seconds_sum{method="GET",endpoint="user/{name}/info/"} 1.0',
+        'balderich_request_duration_seconds_count{method="GET",endpoint="user/{name}/info/"} 2',
+        '# HELP balderich_response_bytes_total Response body bytes received per endpoint.',
+        '# TYPE balderich_response_bytes_total counter',
+        'balderich_response_bytes_total{method="GET",endpoint=""} 0',
+        'balderich_response_bytes_total{method="GET",endpoint="user/{name}/info/"} 40',
+        '# HELP balderich_request_errors_total Requests failed without a response per endpoint and error.',
+        '# TYPE balderich_request_errors_total counter',
+        'balderich_request_errors_total{method="GET",endpoint="",error="ConnectionError"} 1'
+    ]
+
+
+def test_labels_are_escaped():
+    registry = MetricsRegistry(buckets=())
+    registry.observe_error('GET', 'a"b\\c', 0.1, type('Bad\nError', (Exception,), {})())
+
+    assert 'balderich_request_errors_total{method="GET",endpoint="a\\"b\\\\c",error="Bad\\nError"} 1' in registry.prometheus().splitlines()
+
+
+def test_client_requests_are_recorded_and_served(mock):
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url, metrics=True) as client:
+        client.user.get_user_info(1)
+        client.user.get_user_info(2)
+
+    metrics = client.metrics.snapshot()[('GET', 'user/{name}/info/')]
+    assert metrics['count'] == 2
+    assert metrics['codes'] == {SUCCESS: 2}
+    assert metrics['bytes'] > 0
+
+    server = client.metrics.serve(port=0)
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{server.server_address[1]}/metrics') as res:
+            assert res.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            assert res.read().decode() == client.metrics.prometheus()
+    finally:
+        server.shutdown()
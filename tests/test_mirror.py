@@ -0,0 +1,56 @@
+from balderich import NSSClient
+from balderich.mirror import ProblemMirror
+from balderich.mock import MockServer
+from balderich.utils.code import PROBLEM_NOT_EXIST
+
+
+class ChangingMock(MockServer):
+    """
+    A mock whose problems can be given more points.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.bonus = {}
+
+    def _problem_item(self, pid):
+        item = super()._problem_item(pid)
+        item['point'] += self.bonus.get(pid, 0)
+        return item
+
+    def change(self, pid, bonus):
+        self.bonus[pid] = bonus
+        self._bodies.clear()
+
+
+def test_sync_fetches_only_changed_problems(tmp_path):
+    with ChangingMock(total=30) as mock, NSSClient(key=mock.key, secret=mock.secret, url=mock.url) as client:
+        path = str(tmp_path / 'problems.json.gz')
+        report = client.problem.sync(ProblemMirror(path), size=10)
+        assert (report.pages, report.fetched, report.saved, report.removed, report.failed) == (3, 30, 0, 0, {})
+
+        mock.change(5, 50)
+        mirror = ProblemMirror(path)
+        report = client.problem.sync(mirror, size=10)
+        assert (report.fetched, report.saved) == (1, 29)
+        assert mirror[5]['point'] == 100 + 5 % 5 * 100 + 50
+
+
+def test_sync_retries_a_failed_problem():
+    with ChangingMock(total=30) as mock, NSSClient(key=mock.key, secret=mock.secret, url=mock.url, retry=False) as client:
+        mirror = ProblemMirror()
+        client.problem.sync(mirror, size=10)
+        point = mirror[5]['point']
+
+        mock.change(5, 50)
+        mock.fail(PROBLEM_NOT_EXIST, path='problem/5/info/')
+        report = client.problem.sync(mirror, size=10)
+        assert list(report.failed) == [5]
+        assert mirror[5]['point'] == point
+
+        report = client.problem.sync(mirror, size=10)
+        assert report.failed == {}
+        assert report.fetched == 1
+        assert mirror[5]['point'] == point + 50
+
+        report = client.problem.sync(mirror, size=10)
+        assert report.fetched == 0
@@ -0,0 +1,115 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from balderich.utils.pagination import aiter_pages, iter_pages
+
+
+class Pages:
+    """
+    ``count`` items served ``size`` per page, with or without a ``total``.
+    """
+    def __init__(self, count, size=3, total=True):
+        self.count = count
+        self.size = size
+        self.total = total
+        self.requested = []
+
+    def __call__(self, page):
+        self.requested.append(page)
+        items = list(range((page - 1) * self.size, min(page * self.size, self.count)))
+        return {'items': items, 'total': self.count} if self.total else items
+
+    async def fetch(self, page):
+        return self(page)
+
+
+def collect(pages, key, size=None, prefetch=True):
+    return list(iter_pages(pages, key, size, prefetch))
+
+
+def acollect(pages, key, size=None, prefetch=True):
+    async def main():
+        return [item async for item in aiter_pages(pages.fetch, key, size, prefetch)]
+
+    return asyncio.run(main())
+
+
+@pytest.fixture(params=[collect, acollect], ids=['sync', 'async'])
+def pages_of(request):
+    return request.param
+
+
+@pytest.mark.parametrize('prefetch', [True, False])
+def test_stops_on_total(pages_of, prefetch):
+    pages = Pages(7)
+    assert pages_of(pages, 'items', prefetch=prefetch) == list(range(7))
+    assert pages.requested == [1, 2, 3]
+
+    # a full last page is not followed by an empty one
+    pages = Pages(6)
+    assert pages_of(pages, 'items', prefetch=prefetch) == list(range(6))
+    assert pages.requested == [1, 2]
+
+
+@pytest.mark.parametrize('prefetch', [True, False])
+def test_stops_on_short_page_without_total(pages_of, prefetch):
+    pages = Pages(7, total=False)
+    assert pages_of(pages, None, size=3, prefetch=prefetch) == list(range(7))
+    assert pages.requested == [1, 2, 3]
+
+    # without a page size only an empty page ends the list
+    pages = Pages(7, total=False)
+    assert pages_of(pages, None, prefetch=prefetch) == list(range(7))
+    assert pages.requested == [1, 2, 3, 4]
+
+
+def test_early_stop_does_not_wait_for_the_prefetched_page():
+    started, release = threading.Event(), threading.Event()
+    pages = Pages(30)
+
+    def fetch(page):
+        if page > 1:
+            started.set()
+            release.wait(5)
+        return pages(page)
+
+    items = iter_pages(fetch, 'items')
+    assert next(items) == 0
+    assert started.wait(5)
+    start = time.monotonic()
+    items.close()
+    assert time.monotonic() - start < 1
+
+    release.set()
+    time.sleep(0.05)
+    # nothing is requested past the page which was being prefetched
+    assert pages.requested == [1, 2]
+
+
+def test_async_early_stop_cancels_the_prefetched_page():
+    cancelled = []
+    pages = Pages(30)
+
+    async def fetch(page):
+        if page > 1:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(page)
+                raise
+        return pages(page)
+
+    async def main():
+        items = aiter_pages(fetch, 'items')
+        assert await items.__anext__() == 0
+        await asyncio.sleep(0)
+        await items.aclose()
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+
+    assert cancelled == [2]
+    assert pages.requested == [1]
@@ -0,0 +1,124 @@
+import io
+import asyncio
+
+import pytest
+
+from balderich import AsyncNSSClient, NSSClient
+from balderich.utils.code import AUTH_REQUEST_FAST, AUTH_TIMEOUT, USER_IMAGE_NOT_EXIST
+from balderich.utils.exceptions import UserImageNotExistException
+from balderich.utils.ratelimit import RateLimiter
+from balderich.utils.retry import RetryPolicy
+
+UPLOAD = b'\x89PNG' + bytes(100000)
+DOWNLOAD = 'user/picturebed/3/download/'
+
+
+def options(mock, **kwargs):
+    return dict(key=mock.key, secret=mock.secret, url=mock.url, retry=RetryPolicy(backoff=0.0), **kwargs)
+
+
+def test_download(mock, client):
+    content = client.user.post_user_picturebed_download(3).read()
+
+    assert len(content) == mock.picture_size
+    assert b''.join(client.user.iter_user_picturebed_download(3, chunk_size=4096)) == content
+
+
+def test_download_resumes_a_partial_file(mock, client, tmp_path):
+    content = client.user.post_user_picturebed_download(3).read()
+    path = str(tmp_path / 'picture.png')
+    with open(path, 'wb') as file:
+        file.write(content[:1000])
+
+    assert client.user.download_user_picturebed(3, path) == len(content)
+    assert open(path, 'rb').read() == content
+    # complete files are answered with 416 and left alone
+    assert client.user.download_user_picturebed(3, path) == len(content)
+    assert open(path, 'rb').read() == content
+
+    dest = io.BytesIO(content[:5000])
+    dest.seek(0, io.SEEK_END)
+    assert client.user.download_user_picturebed(3, dest) == len(content)
+    assert dest.getvalue() == content
+
+
+def test_download_errors(mock, client):
+    mock.fail(USER_IMAGE_NOT_EXIST, times=2, path=DOWNLOAD)
+
+    with pytest.raises(UserImageNotExistException):
+        client.user.post_user_picturebed_download(3)
+    with pytest.raises(UserImageNotExistException):
+        client.user.download_user_picturebed(3, io.BytesIO())
+
+
+def test_failed_download_leaves_the_destination_alone(mock, client, tmp_path):
+    mock.fail(USER_IMAGE_NOT_EXIST, times=4, path=DOWNLOAD)
+    partial, missing = tmp_path / 'partial.png', tmp_path / 'missing.png'
+    partial.write_bytes(b'partial')
+
+    with pytest.raises(UserImageNotExistException):
+        client.user.download_user_picturebed(3, str(partial))
+    with pytest.raises(UserImageNotExistException):
+        client.user.download_user_picturebed(3, str(missing))
+
+    async def main():
+        async with AsyncNSSClient(**options(mock)) as client:
+            for path in (partial, missing):
+                with pytest.raises(UserImageNotExistException):
+                    await client.user.download_user_picturebed(3, str(path))
+
+    asyncio.run(main())
+
+    assert partial.read_bytes() == b'partial'
+    assert not missing.exists()
+
+
+def test_download_is_retried(mock, client):
+    mock.fail(AUTH_TIMEOUT, path=DOWNLOAD)
+
+    assert len(client.user.post_user_picturebed_download(3).read()) == mock.picture_size
+    assert client.retry.retries == 1
+
+
+def test_throttled_upload_is_sent_again_in_full(mock):
+    mock.fail(AUTH_REQUEST_FAST, path='user/picturebed/upload/')
+    progress = []
+
+    with NSSClient(**options(mock, rate_limit=RateLimiter(rate=100))) as client:
+        data = client.user.post_user_picturebed_upload('a.png', io.BytesIO(UPLOAD), progress=progress.append)
+
+    assert data['size'] > len(UPLOAD)
+    assert mock.counts == {AUTH_REQUEST_FAST: 1, 10000: 1}
+
+
+def test_async_transfers_share_the_request_pipeline(mock, tmp_path):
+    mock.fail(AUTH_TIMEOUT, path=DOWNLOAD)
+    mock.fail(AUTH_REQUEST_FAST, path='user/picturebed/upload/')
+    async def main():
+        async with AsyncNSSClient(**options(mock, rate_limit=RateLimiter(rate=100))) as client:
+            content = (await client.user.post_user_picturebed_download(3)).read()
+            chunks = [chunk async for chunk in client.user.iter_user_picturebed_download(3, chunk_size=4096)]
+
+            path = str(tmp_path / 'picture.png')
+            with open(path, 'wb') as file:
+                file.write(content[:1000])
+            written = await client.user.download_user_picturebed(3, path)
+            again = await client.user.download_user_picturebed(3, path)
+
+            uploaded = await client.user.post_user_picturebed_upload('a.png', io.BytesIO(UPLOAD))
+            return client, content, b''.join(chunks), open(path, 'rb').read(), written, again, uploaded
+
+    client, content, streamed, resumed, written, again, uploaded = asyncio.run(main())
+
+    assert len(content) == mock.picture_size
+    assert streamed == resumed == content
+    assert written == again == len(content)
+    assert uploaded['size'] > len(UPLOAD)
+
+    # the failed download was retried and the throttled upload queued again
+    assert client.retry.retries == 1
+    assert mock.counts[AUTH_REQUEST_FAST] == 1
+
+    snapshot = client.metrics.snapshot()
+    assert snapshot[('POST', 'user/picturebed/{pid}/download/')]['count'] == 5
+    assert snapshot[('POST', 'user/picturebed/upload/')]['codes'] == {AUTH_REQUEST_FAST: 1, 10000: 1}
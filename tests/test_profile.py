@@ -0,0 +1,60 @@
+import io
+import asyncio
+
+from balderich import AsyncNSSClient, NSSClient
+from balderich.utils.code import AUTH_TIMEOUT
+from balderich.utils.profile import PHASES, Profiler
+from balderich.utils.retry import RetryPolicy
+
+
+def options(mock, profiles, **kwargs):
+    return dict(key=mock.key, secret=mock.secret, url=mock.url, retry=RetryPolicy(backoff=0.0), profiler=profiles.append, **kwargs)
+
+
+def test_calls_are_profiled(mock):
+    profiles = []
+    mock.fail(AUTH_TIMEOUT, path='user/1/info/')
+
+    with NSSClient(**options(mock, profiles, cache=True)) as client:
+        client.user.get_user_info(1)
+        client.user.get_user_info(1)
+
+    first, cached = profiles
+    assert (first.method, first.path, first.code, first.attempts, first.cached) == ('GET', 'user/1/info/', 10000, 2, False)
+    assert first.sign > 0 and first.ttfb > 0 and first.decode > 0
+    assert first.total >= sum(getattr(first, phase) for phase in PHASES)
+    assert cached.cached and cached.attempts == 0
+
+
+def test_unsampled_calls_are_not_profiled(mock):
+    profiles = []
+
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url, profiler=Profiler(profiles.append, sample=0.0)) as client:
+        client.user.get_user_info(1)
+
+    assert profiles == []
+
+
+def test_transfers_are_profiled(mock):
+    sync, asynchronous = [], []
+    mock.fail(AUTH_TIMEOUT, path='user/picturebed/3/download/')
+
+    with NSSClient(**options(mock, sync)) as client:
+        client.user.post_user_picturebed_download(3)
+        client.user.download_user_picturebed(3, io.BytesIO())
+        client.user.post_user_picturebed_upload('a.png', io.BytesIO(b'\x89PNG' + bytes(1000)))
+
+    async def main():
+        mock.fail(AUTH_TIMEOUT, path='user/picturebed/3/download/')
+        async with AsyncNSSClient(**options(mock, asynchronous)) as client:
+            await client.user.post_user_picturebed_download(3)
+            await client.user.download_user_picturebed(3, io.BytesIO())
+            await client.user.post_user_picturebed_upload('a.png', io.BytesIO(b'\x89PNG' + bytes(1000)))
+
+    asyncio.run(main())
+
+    for profiles in (sync, asynchronous):
+        assert [profile.path for profile in profiles] == ['user/picturebed/3/download/'] * 2 + ['user/picturebed/upload/']
+        assert profiles[0].attempts == 2
+        assert profiles[1].download > 0
+        assert profiles[2].code == 10000
@@ -0,0 +1,62 @@
+import time
+import threading
+
+import pytest
+
+from balderich import NSSClient
+from balderich.utils.code import AUTH_REQUEST_FAST, SUCCESS
+from balderich.utils.ratelimit import RateLimiter
+
+
+def test_throttling_decreases_the_rate_once_per_cooldown():
+    limiter = RateLimiter(rate=8.0, cooldown=60.0)
+
+    limiter.on_throttled()
+    limiter.on_throttled()
+    assert limiter.rate == 4.0
+    assert limiter.throttled == 2
+
+    limiter = RateLimiter(rate=8.0, min_rate=1.5, cooldown=0.0)
+    for _ in range(4):
+        limiter.on_throttled()
+    assert limiter.rate == 1.5
+
+
+def test_successes_increase_the_rate():
+    limiter = RateLimiter(rate=4.0, max_rate=4.5)
+
+    limiter.on_success()
+    assert limiter.rate == pytest.approx(4.25)
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.rate == 4.5
+
+
+def test_queue_depth_counts_waiting_requests():
+    limiter = RateLimiter(rate=10.0, burst=1.0)
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+
+    depths = []
+    while any(thread.is_alive() for thread in threads):
+        depths.append(limiter.queue_depth)
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+
+    assert max(depths) == 2
+    assert limiter.queue_depth == 0
+
+
+def test_throttled_request_is_queued_again(mock):
+    mock.fail(AUTH_REQUEST_FAST, times=2)
+    limiter = RateLimiter(rate=100.0, cooldown=60.0)
+
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url, retry=False, rate_limit=limiter) as client:
+        assert client.user.get_user_info(1)['uid'] == 1
+
+    assert mock.counts == {AUTH_REQUEST_FAST: 2, SUCCESS: 1}
+    assert limiter.throttled == 2
+    # halved once within the cooldown, then raised by the success
+    assert limiter.rate == pytest.approx(50.0 + 1 / 50.0)
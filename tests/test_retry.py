@@ -0,0 +1,79 @@
+import io
+
+import pytest
+
+from balderich import NSSClient
+from balderich.utils.code import AUTH_TIMEOUT, TEAM_METHOD_PERMISSION_DENIED
+from balderich.utils.exceptions import AuthTimeoutException, TeamMethodPermissionDeniedException, is_retryable
+from balderich.utils.retry import RetryPolicy
+
+
+def test_attempts_bound_the_retries():
+    policy = RetryPolicy(attempts=3, backoff=0.0)
+
+    assert policy.delay(0) == 0.0
+    assert policy.delay(1) == 0.0
+    assert policy.delay(2) is None
+    assert policy.retries == 2
+
+
+def test_budget_bounds_the_share_of_retries():
+    policy = RetryPolicy(attempts=10, backoff=0.0, budget_ratio=0.5, budget_reserve=2)
+
+    assert [policy.delay(0) for _ in range(3)] == [0.0, 0.0, None]
+    # every request earns half a retry
+    policy.on_request()
+    assert policy.delay(0) is None
+    policy.on_request()
+    assert policy.delay(0) == 0.0
+    assert policy.retries == 3
+
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(attempts=100, backoff=1.0, max_backoff=2.0, budget_reserve=100)
+
+    assert all(0 <= policy.delay(attempt) <= 2.0 for attempt in range(20))
+
+
+def test_retryable_codes_are_retried(mock, client):
+    assert is_retryable(AUTH_TIMEOUT) and not is_retryable(TEAM_METHOD_PERMISSION_DENIED)
+    mock.fail(AUTH_TIMEOUT, times=2, path='user/1/info/')
+
+    assert client.user.get_user_info(1)['uid'] == 1
+    assert client.retry.retries == 2
+
+
+def test_retries_give_up_after_the_last_attempt(mock, client):
+    mock.fail(AUTH_TIMEOUT, times=3, path='user/1/info/')
+
+    with pytest.raises(AuthTimeoutException):
+        client.user.get_user_info(1)
+    assert mock.counts == {AUTH_TIMEOUT: 3}
+
+
+def test_other_codes_are_not_retried(mock, client):
+    mock.fail(TEAM_METHOD_PERMISSION_DENIED, path='team/notice/')
+
+    with pytest.raises(TeamMethodPermissionDeniedException):
+        client.team.get_team_notice()
+    assert client.retry.retries == 0
+
+
+def test_non_idempotent_requests_are_not_retried(mock, client):
+    mock.fail(AUTH_TIMEOUT, path='user/picturebed/upload/')
+
+    with pytest.raises(AuthTimeoutException):
+        client.user.post_user_picturebed_upload('a.png', io.BytesIO(b'\x89PNG'))
+    assert client.retry.retries == 0
+
+
+def test_exhausted_budget_stops_retrying(mock):
+    policy = RetryPolicy(backoff=0.0, budget_ratio=0.0, budget_reserve=1)
+    mock.fail(AUTH_TIMEOUT, times=3)
+
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url, retry=policy) as client:
+        with pytest.raises(AuthTimeoutException):
+            client.user.get_user_info(1)
+
+    assert policy.retries == 1
+    assert mock.counts == {AUTH_TIMEOUT: 2}
@@ -0,0 +1,181 @@
+import contextlib
+import math
+
+import pytest
+
+from balderich import scoreboard
+from balderich.scoreboard import (
+    Blood, RankChange, Row, Scoreboard, ScoreboardWatcher, ScoreChange, Solve, _snapshot, diff, parse_ids, rank_pages
+)
+
+
+class TimeUp(Exception):
+    pass
+
+
+class Clock:
+    """
+    Stands in for the ``time`` module, ``sleep`` advances the clock.
+    """
+    def __init__(self, end=None):
+        self.now = 0.0
+        self.end = end
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        if self.end is not None and self.now > self.end:
+            raise TimeUp
+
+
+class Contest:
+    """
+    Rank list of one contest whose server refreshes every 60 seconds at ``phase``.
+
+    ``solves`` are ``(time, uid, pid)``, every problem is worth 100 points.
+    """
+    def __init__(self, clock, solves, uids=(1, 2, 3), size=2, phase=37.0):
+        self.clock = clock
+        self.solves = solves
+        self.uids = uids
+        self.size = size
+        self.phase = phase
+        self.pages = []
+        # the watcher only needs these from a client
+        self.contest = self
+
+    def no_cache(self):
+        return contextlib.nullcontext()
+
+    def _fetch_many(self, fetch, items, workers):
+        return [(item, fetch(item)) for item in items]
+
+    def get_contest_rank_list(self, cid, page):
+        self.pages.append(page)
+        refreshed = self.phase + math.floor((self.clock.now - self.phase) / 60) * 60
+        return board([solve[1:] for solve in self.solves if solve[0] <= refreshed], self.uids, page, self.size)
+
+
+def board(solves, uids=(1, 2, 3), page=1, size=10):
+    """
+    A rank list page as the server builds it from ``(uid, pid)`` solves in order.
+    """
+    solved = {uid: [] for uid in uids}
+    top3 = {}
+    for uid, pid in solves:
+        solved[uid].append(pid)
+        top3.setdefault(pid, []).append(uid)
+
+    order = sorted(uids, key=lambda uid: (-len(solved[uid]), uid))
+    rows = [
+        {
+            'uid': uid, 'username': f'user{uid}', 'score': 100 * len(solved[uid]),
+            'solved': ','.join(map(str, solved[uid])), 'solved_time': ','.join(str(pid * 60) for pid in solved[uid])
+        }
+        for uid in order
+    ]
+    return {
+        'problems': [[pid, len(top3[pid]), f'problem {pid}'] for pid in sorted(top3)],
+        'point': {str(pid): 100 for pid in top3},
+        'top3': {str(pid): [str(uid) for uid in top3[pid][:3]] for pid in top3},
+        'solves': rows[(page - 1) * size:page * size],
+        'total': len(uids)
+    }
+
+
+def test_diff_from_nothing_reports_everyone():
+    events = diff(None, _snapshot([board([(2, 1)])]))
+
+    assert Solve(2, 'user2', 1, 60) in events
+    assert ScoreChange(1, 'user1', None, 0) in events
+    assert [event for event in events if isinstance(event, RankChange)] == [
+        RankChange(2, 'user2', None, 1), RankChange(1, 'user1', None, 2), RankChange(3, 'user3', None, 3)
+    ]
+    assert Blood(1, 1, 2) in events
+
+
+def test_diff_reports_what_changed():
+    old = _snapshot([board([(2, 1)])])
+    new = _snapshot([board([(2, 1), (3, 1), (3, 2)])])
+
+    assert set(diff(old, new)) == {
+        Solve(3, 'user3', 1, 60), Solve(3, 'user3', 2, 120), ScoreChange(3, 'user3', 0, 200),
+        RankChange(3, 'user3', 3, 1), RankChange(2, 'user2', 1, 2), RankChange(1, 'user1', 2, 3),
+        Blood(1, 2, 3), Blood(2, 1, 3)
+    }
+    assert diff(new, new) == []
+
+
+def test_poll_requests_other_pages_only_on_change():
+    clock = Clock()
+    contest = Contest(clock, [(10, 3, 1)], uids=(1, 2, 3, 4, 5))
+    watcher = ScoreboardWatcher(contest, cid=1)
+
+    assert len([event for event in watcher.poll() if isinstance(event, RankChange)]) == 5
+    assert contest.pages == [1, 2, 3]
+    assert watcher.poll() == []
+    assert contest.pages == [1, 2, 3, 1]
+
+    clock.now = 40
+    assert Solve(3, 'user3', 1, 60) in watcher.poll()
+    assert contest.pages == [1, 2, 3, 1, 1, 2, 3]
+
+
+def test_watch_follows_refresh(monkeypatch):
+    clock = Clock(end=520)
+    monkeypatch.setattr(scoreboard, 'time', clock)
+    solves = [(10, 1, 1), (100, 2, 1), (250, 3, 2), (400, 1, 2)]
+    contest = Contest(clock, solves)
+
+    seen = {}
+    with pytest.raises(TimeUp):
+        for event in ScoreboardWatcher(contest, cid=1, probe=2.0).watch():
+            if isinstance(event, Solve):
+                seen[event.uid, event.pid] = clock.now
+
+    # published at 37, 157, 277 and 457, reported within one probe
+    refreshed = {(1, 1): 37, (2, 1): 157, (3, 2): 277, (1, 2): 457}
+    assert seen.keys() == refreshed.keys()
+    for solve, at in refreshed.items():
+        assert at <= seen[solve] <= at + 2.0
+    # probing every 2 seconds all along would be 260 requests
+    assert contest.pages.count(1) < 60
+
+
+def test_scoretablequeries():
+    # 11 participants so the solve bitsets span more than one byte
+    uids = tuple(range(1, 12))
+    solves = [(uid, 1) for uid in uids if uid % 2] + [(uid, 2) for uid in uids if uid % 3 == 0] + [(11, 3)]
+    pages = [board(solves, uids, page, 4) for page in (1, 2, 3)]
+    table = Scoreboard.from_pages(pages)
+
+    rows = [row for page in pages for row in page['solves']]
+    assert len(table) == 11 and 11 in table and 12 not in table
+    assert list(table.uids) == [row['uid'] for row in rows]
+    assert list(table.ranks) == list(range(1, 12))
+    assert table.pids == [1, 2, 3]
+
+    assert table.solvers(1) == [row['uid'] for row in rows if row['uid'] % 2]
+    assert table.solvers(4) == []
+    assert table.solve_counts() == {1: 6, 2: 3, 3: 1}
+    assert table.solved(9) == [1, 2] and table.solved(4) == []
+    assert table.solved_all([1, 2]) == [3, 9]
+    assert table.solved_all([1, 2, 3]) == []
+    assert table.row(11) == Row(11, 'user11', 3, 200, frozenset({1, 3}), {})
+
+
+def test_scoretablefetch(client, mock):
+    table = Scoreboard.fetch(client, cid=1)
+
+    rows = [row for page in rank_pages(client, 1) for row in page['solves']]
+    assert len(table) == mock.total
+    for row in rows:
+        assert table.solved(row['uid']) == sorted(parse_ids(row['solved']))
+        assert table.scores[table._rows[row['uid']]] == row['score']
+    for pid, count in table.solve_counts().items():
+        assert count == sum(pid in parse_ids(row['solved']) for row in rows)
@@ -0,0 +1,95 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from balderich import AsyncNSSClient, NSSClient
+from balderich.mock import MockServer
+from balderich.utils.code import USER_NOT_EXIST
+from balderich.utils.exceptions import UserNotExistException
+from balderich.utils.singleflight import SingleFlight
+
+
+def together(count, fn):
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append(fn())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results, errors
+
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'result'
+
+    results, errors = together(4, lambda: flight.do('key', slow))
+
+    assert results == ['result'] * 4 and errors == []
+    assert len(calls) == 1
+    assert flight.saved == 3
+    assert len(flight) == 0
+
+
+def test_concurrent_calls_share_one_exception():
+    flight = SingleFlight()
+
+    def slow():
+        time.sleep(0.2)
+        raise ValueError()
+
+    results, errors = together(3, lambda: flight.do('key', slow))
+
+    assert results == [] and len(errors) == 3
+    assert all(isinstance(error, ValueError) for error in errors)
+
+
+@pytest.mark.parametrize('single_flight, requests', [(True, 1), (False, 4)])
+def test_client_coalesces_identical_gets(single_flight, requests):
+    with MockServer(latency=0.2) as mock, \
+            NSSClient(key=mock.key, secret=mock.secret, url=mock.url, single_flight=single_flight) as client:
+        results, errors = together(4, lambda: client.user.get_user_info(1))
+
+        assert errors == [] and len(results) == 4
+        assert mock.counts == {10000: requests}
+
+
+def test_client_shares_api_errors(mock, client):
+    mock.fail(USER_NOT_EXIST, path='user/1/info/')
+    mock.latency = 0.2
+
+    results, errors = together(3, lambda: client.user.get_user_info(1))
+
+    assert results == [] and len(errors) == 3
+    assert all(isinstance(error, UserNotExistException) for error in errors)
+    assert client.single_flight.saved == 2
+
+
+def test_async_client_coalesces_identical_gets(mock):
+    mock.latency = 0.2
+
+    async def main():
+        async with AsyncNSSClient(key=mock.key, secret=mock.secret, url=mock.url) as client:
+            results = await asyncio.gather(*(client.user.get_user_info(1) for _ in range(4)))
+            return results, client.single_flight.saved
+
+    results, saved = asyncio.run(main())
+
+    assert len(results) == 4 and results.count(results[0]) == 4
+    assert saved == 3
+    assert mock.counts == {10000: 1}
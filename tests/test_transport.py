@@ -0,0 +1,119 @@
+import io
+import gc
+import threading
+
+import pytest
+import requests
+
+from balderich import NSSClient
+from balderich.transport import InProcessTransport, RequestsTransport, Transport
+from balderich.utils.code import AUTH_TIMEOUT, USER_IMAGE_NOT_EXIST
+from balderich.utils.exceptions import UserImageNotExistException
+from balderich.utils.retry import RetryPolicy
+
+
+def test_sessions_are_per_thread_and_share_the_pool(client):
+    sessions = []
+
+    def worker():
+        client.user.get_user_info(1)
+        sessions.append(client.session)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(session) for session in sessions}) == 4
+    assert len({id(session.get_adapter(client.url)) for session in sessions}) == 1
+
+
+def test_sessions_of_finished_threads_are_released(mock):
+    transport = RequestsTransport()
+
+    def worker():
+        transport.request('GET', mock.url + 'user/1/info/').close()
+
+    for _ in range(20):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    assert len(transport._sessions) == 0
+    transport.close()
+
+
+def test_transport_is_abstract():
+    with pytest.raises(TypeError):
+        Transport()
+
+
+@pytest.fixture(params=['requests', 'http2', 'inprocess'])
+def transport_client(request, mock):
+    if request.param == 'http2':
+        pytest.importorskip('httpx')
+        pytest.importorskip('h2')
+    transport = InProcessTransport(mock) if request.param == 'inprocess' else request.param
+
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url, retry=RetryPolicy(backoff=0.0), transport=transport) as client:
+        yield client
+
+
+def test_transports_answer_every_kind_of_call(transport_client, mock):
+    client = transport_client
+    mock.fail(AUTH_TIMEOUT, path='user/1/info/')
+
+    assert client.user.get_user_info(1)['uid'] == 1
+    assert client.retry.retries == 1
+    assert len(client.team.get_team_statistics_day([1, 2, 3])) > 0
+
+    content = client.user.post_user_picturebed_download(3).read()
+    assert len(content) == mock.picture_size
+    assert b''.join(client.user.iter_user_picturebed_download(3)) == content
+    dest = io.BytesIO(content[:100])
+    dest.seek(100)
+    assert client.user.download_user_picturebed(3, dest) == len(content)
+    assert dest.getvalue() == content
+
+    assert client.user.post_user_picturebed_upload('a.png', io.BytesIO(b'\x89PNG' + bytes(1000)))['size'] > 1000
+
+    mock.fail(USER_IMAGE_NOT_EXIST, path='user/picturebed/3/download/')
+    with pytest.raises(UserImageNotExistException):
+        client.user.post_user_picturebed_download(3)
+
+
+def test_session_requires_the_requests_transport(mock):
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url) as client:
+        assert isinstance(client.session, requests.Session)
+
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url, transport=InProcessTransport(mock)) as client:
+        with pytest.raises(TypeError, match='InProcessTransport'):
+            client.session
+
+
+class FlakyServer:
+    """
+    Answers the first request with a 503, then passes to the mock.
+    """
+    def __init__(self, mock):
+        self.mock = mock
+        self.failed = False
+
+    def delay(self):
+        return 0.0
+
+    def handle(self, *args):
+        if not self.failed:
+            self.failed = True
+            return 503, {'Content-Type': 'text/plain'}, b'Service Unavailable'
+        return self.mock.handle(*args)
+
+
+def test_server_errors_are_retried(mock):
+    transport = InProcessTransport(FlakyServer(mock))
+
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url, retry=RetryPolicy(backoff=0.0), transport=transport) as client:
+        assert client.user.get_user_info(1)['uid'] == 1
+        assert client.retry.retries == 1
@@ -0,0 +1,58 @@
+import re
+import inspect
+
+import pytest
+
+from balderich import NSSClient
+from balderich.models import contest, problem, team, user
+from balderich.models.typed import Record
+
+# every endpoint decoded into a record
+CALLS = {
+    'problem/list/{page}/{size}/': lambda client: client.problem.get_problem_list_by_page(1, 10),
+    'problem/{pid}/info/': lambda client: client.problem.get_problem_info(1),
+    'problem/sheet/{psid}/list/{page}/{size}/': lambda client: client.problem.get_problem_sheet_problem_list_by_page(1, 1, 10),
+    'user/{name}/info/': lambda client: client.user.get_user_info(1),
+    'contest/{type}/list/{page}/': lambda client: client.contest.get_contest_list(0, 1),
+    'contest/{cid}/info/': lambda client: client.contest.get_contest_info(1),
+    'contest/{cid}/rank/list/{page}/': lambda client: client.contest.get_contest_rank_list(1, 1),
+    'team/list/{page}/{size}/': lambda client: client.team.get_team_list_by_page(1, 10),
+    'team/{tid}/info/': lambda client: client.team.get_team_info(1),
+}
+
+
+@pytest.fixture
+def typed_client(mock):
+    with NSSClient(key=mock.key, secret=mock.secret, url=mock.url, typed=True, decoder='json') as client:
+        yield client
+
+
+@pytest.mark.parametrize('endpoint', CALLS)
+def test_records_hold_exactly_the_documented_fields(typed_client, endpoint):
+    call = CALLS[endpoint]
+    record = call(typed_client)
+    with typed_client.untyped():
+        raw = call(typed_client)
+
+    assert isinstance(record, Record)
+    # a missing field is dropped by the record, an extra one comes back as None
+    assert record.to_dict() == raw
+
+
+def test_every_record_endpoint_is_covered():
+    templates = set()
+    for module in (contest, problem, team, user):
+        for path in re.findall(r"self\._get\(f'([^']+)', model=", inspect.getsource(module)):
+            templates.add(re.sub(r'\{\w+\}', '{}', path))
+
+    assert templates == {re.sub(r'\{\w+\}', '{}', endpoint) for endpoint in CALLS}
+
+
+def test_nested_fields_are_decoded_lazily(typed_client):
+    page = typed_client.problem.get_problem_list_by_page(1, 10)
+
+    assert isinstance(page._problems, list)
+    problem = page.problems[0]
+    assert isinstance(problem._author, dict)
+    assert problem.author.uid == problem['author']['uid']
+    assert page.problems is page.problems